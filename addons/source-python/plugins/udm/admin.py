@@ -24,7 +24,7 @@ class _AdminMenu(PagedMenu):
     """Class used to provide a way to send this menu when a submenu is closed."""
 
     # Store players who are currently using the Admin menu
-    users = list()
+    users = set()
 
     def is_used_by(self, userid):
         """Return whether the player is using this menu."""
@@ -57,7 +57,7 @@ def on_close_admin_menu(menu, player_index):
     player = PlayerEntity(player_index)
 
     # Remove the player from the Admin menu users storage
-    admin_menu.users.remove(player.userid)
+    admin_menu.users.discard(player.userid)
 
     # Equip the player with their inventory & a High Explosive grenade
     player.equip_inventory()
@@ -81,5 +81,5 @@ def on_select_admin_submenu(menu, player_index, option):
 # =============================================================================
 @OnLevelInit
 def on_level_init(map_name):
-    """Clear the Admin menu users list."""
+    """Clear the Admin menu users set."""
     admin_menu.users.clear()
@@ -5,9 +5,15 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python Imports
+#   Typing
+from typing import NamedTuple
+
 # Source.Python Imports
 #   Config
 from config.manager import ConfigManager
+#   Listeners
+from listeners import OnConVarChanged
 
 # Script Imports
 #   Info
@@ -34,6 +40,12 @@ with ConfigManager(info.name, f'{info.name}_') as config:
         'The respawn delay (in seconds).'
     )
 
+    cvar_max_respawns_per_tick = config.cvar(
+        'max_respawns_per_tick',
+        4,
+        'The maximum amount of players to respawn per server tick, delaying the others (0 = no limit).'
+    )
+
     config.text('----------------------------------')
     config.text('   * Spawn Protection')
     config.text('----------------------------------')
@@ -95,6 +107,16 @@ with ConfigManager(info.name, f'{info.name}_') as config:
     cvar_equip_hegrenade.Options.append('2 = Equip on spawn and on each HE grenade kill')
     cvar_equip_hegrenade.Options.append('3 = Equip on spawn and after each detonation')
 
+    config.text('----------------------------------')
+    config.text('   * Dropped Weapons')
+    config.text('----------------------------------')
+
+    cvar_max_dropped_weapons = config.cvar(
+        'max_dropped_weapons',
+        32,
+        'The maximum amount of dropped weapons lying around at once, removing the oldest first (0 = no limit).'
+    )
+
     config.text('----------------------------------')
     config.text('   * Team Changes Management')
     config.text('----------------------------------')
@@ -126,3 +148,72 @@ with ConfigManager(info.name, f'{info.name}_') as config:
         'guns',
         'The say command used to open the weapons menu.'
     )
+
+
+# =============================================================================
+# >> CONFIGURATION SNAPSHOT
+# =============================================================================
+class ConfigSnapshot(NamedTuple):
+    """Class used to store the values of the configuration cvars as plain Python attributes."""
+
+    respawn_delay: float
+    max_respawns_per_tick: int
+    spawn_protection_delay: float
+    enable_infinite_ammo: bool
+    enable_noblock: bool
+    refill_clip_on_headshot: bool
+    restore_health_on_knife_kill: bool
+    equip_hegrenade: int
+    max_dropped_weapons: int
+    team_changes_per_round: int
+    team_changes_reset_delay: float
+
+    @classmethod
+    def from_cvars(cls):
+        """Return a new snapshot of the current cvar values."""
+        return cls(
+            respawn_delay=cvar_respawn_delay.get_float(),
+            max_respawns_per_tick=cvar_max_respawns_per_tick.get_int(),
+            spawn_protection_delay=cvar_spawn_protection_delay.get_float(),
+            enable_infinite_ammo=cvar_enable_infinite_ammo.get_int() > 0,
+            enable_noblock=cvar_enable_noblock.get_int() > 0,
+            refill_clip_on_headshot=cvar_refill_clip_on_headshot.get_int() > 0,
+            restore_health_on_knife_kill=cvar_restore_health_on_knife_kill.get_int() > 0,
+            equip_hegrenade=cvar_equip_hegrenade.get_int(),
+            max_dropped_weapons=cvar_max_dropped_weapons.get_int(),
+            team_changes_per_round=cvar_team_changes_per_round.get_int(),
+            team_changes_reset_delay=cvar_team_changes_reset_delay.get_float()
+        )
+
+
+class _Settings(object):
+    """Class used to provide the current configuration snapshot, which is replaced whenever a cvar changes."""
+
+    def __init__(self):
+        """Object initialization."""
+        # Store the current snapshot
+        self.snapshot = ConfigSnapshot.from_cvars()
+
+        # Store the callbacks to call with the new snapshot whenever it has been replaced
+        self.callbacks = list()
+
+    def refresh(self):
+        """Replace the current snapshot with the current cvar values and notify all callbacks."""
+        self.snapshot = ConfigSnapshot.from_cvars()
+
+        for callback in self.callbacks:
+            callback(self.snapshot)
+
+
+# Store a global instance of `_Settings`
+settings = _Settings()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnConVarChanged
+def on_convar_changed(convar, old_value):
+    """Refresh the configuration snapshot if one of the plugin's cvars has changed."""
+    if convar.name.startswith(f'{info.name}_'):
+        settings.refresh()
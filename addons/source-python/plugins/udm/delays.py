@@ -5,93 +5,220 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python Imports
+#   Heapq
+import heapq
+#   Itertools
+from itertools import count
+#   Time
+import time
+
 # Source.Python Imports
+#   Commands
+from commands.typed import TypedServerCommand
 #   Core
 from core import AutoUnload
+from core import echo_console
+#   Hooks
+from hooks.exceptions import except_hooks
 #   Listeners
-from listeners.tick import Delay
+from listeners import OnTick
 
 # Script Imports
 #   Info
 from udm.info import info
+#   Profiler
+from udm.profiler import profiler
+#   Statistics
+from udm.statistics import Histogram
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Fire lag histogram bucket bounds (in microseconds)
+FIRE_LAG_BOUNDS = (1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000)
+
+# Callback duration histogram bucket bounds (in microseconds)
+CALLBACK_DURATION_BOUNDS = (10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000)
+
+
+# =============================================================================
+# >> SCHEDULED CALL
+# =============================================================================
+class _ScheduledCall(object):
+    """Class used to store a callback which is due at a certain time."""
+
+    __slots__ = ('key', 'deadline', 'callback', 'args', 'call_on_cancel', 'cancelled')
+
+    def __init__(self, key, deadline, callback, args, call_on_cancel):
+        """Object initialization."""
+        self.key = key
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.call_on_cancel = call_on_cancel
+
+        # Cancelled calls stay in the heap until they are due, but won't be called
+        self.cancelled = False
+
+
+# =============================================================================
+# >> DELAY STATISTICS
+# =============================================================================
+class _DelayFamilyStatistics(object):
+    """Class used to count the delays of one key family (e.g. all 'respawn' delays)."""
+
+    __slots__ = ('scheduled', 'fired', 'cancelled', 'durations')
+
+    def __init__(self):
+        """Object initialization."""
+        self.scheduled = 0
+        self.fired = 0
+        self.cancelled = 0
+
+        # Store the callback durations (in microseconds)
+        self.durations = Histogram(CALLBACK_DURATION_BOUNDS)
+
+
+class _DelayStatistics(dict):
+    """Class used to store delay statistics by key family."""
+
+    def __init__(self):
+        """Object initialization."""
+        # Call dict's constructor
+        super().__init__()
+
+        # Store how late delays are called relative to their deadline (in microseconds)
+        self.fire_lag = Histogram(FIRE_LAG_BOUNDS)
+
+    def __missing__(self, family):
+        """Add statistics for a new key family."""
+        statistics = self[family] = _DelayFamilyStatistics()
+        return statistics
+
+    @staticmethod
+    def family(key):
+        """Return the key family of `key`."""
+        return key[0] if isinstance(key, tuple) else key
+
+    def reset(self):
+        """Reset all statistics."""
+        self.clear()
+        self.fire_lag.reset()
 
 
 # =============================================================================
 # >> DELAY MANAGER
 # =============================================================================
 class _DelayManager(dict, AutoUnload):
-    """Class used to manage delays."""
+    """Class used to manage delays in a single heap which is processed by one tick listener."""
 
     # Remember whether delays are enabled
     delays_enabled = True
 
-    def __init__(self, prefix):
+    def __init__(self):
         """Object initialization."""
         # Call dict's constructor
         super().__init__()
 
-        # Store the key prefix
-        self._prefix = prefix
+        # Store a heap of (deadline, sequence, `_ScheduledCall`) entries
+        self._heap = list()
 
-        # Store a mapping of delay callbacks which should be called on cancel
-        self._call_on_cancel = dict()
+        # Store a sequence counter, so entries with equal deadlines keep their scheduling order
+        self._sequence = count()
 
-    def __call__(self, key, delay, callback, args=(), call_on_cancel=False):
-        """Add the delay object and reference it by `key`."""
-        # Format the delay key
-        key = self._format_key(key)
+        # Store the delay statistics
+        self.statistics = _DelayStatistics()
 
+    def __call__(self, key, delay, callback, args=(), call_on_cancel=False):
+        """Call `callback` after `delay` seconds and reference the delay by the (tuple) `key`."""
         # Cancel the delay for the key, if it is running
         self.cancel(key)
 
-        # Store whether the callback should be called on cancel
-        self._call_on_cancel[key] = call_on_cancel
-
         # Add the delay if delays are enabled
         if self.delays_enabled:
-            self[key] = Delay(delay, callback, args)
+            deadline = time.monotonic() + delay
+            scheduled = self[key] = _ScheduledCall(key, deadline, callback, args, call_on_cancel)
+            heapq.heappush(self._heap, (deadline, next(self._sequence), scheduled))
+
+            self.statistics[self.statistics.family(key)].scheduled += 1
+
+            # Drop cancelled entries if they make up most of the heap
+            if len(self._heap) > 2 * len(self) + 64:
+                self._compact()
 
     def cancel(self, key):
         """Cancel the delay if it is running."""
-        # Format the delay key
-        key = self._format_key(key)
-
-        if key in self:
+        scheduled = self.pop(key, None)
 
-            # Get the delay object referenced `key`
-            delay = self[key]
+        if scheduled is not None:
+            scheduled.cancelled = True
 
-            # Cancel it if it is running
-            if delay.running:
-                if self._call_on_cancel[key]:
-                    delay()
-                else:
-                    delay.cancel()
+            self.statistics[self.statistics.family(key)].cancelled += 1
 
-            # Remove `key` from this dict
-            del self[key]
-            del self._call_on_cancel[key]
+            # Call the callback, if it should be called on cancel
+            if scheduled.call_on_cancel:
+                scheduled.callback(*scheduled.args)
 
     def clear(self):
         """Cancel all pending delays."""
-        for key in self.copy():
+        for key in list(self):
             self.cancel(key)
 
+        # Drop all remaining entries
+        super().clear()
+        self._heap.clear()
+
         # Disable delays
         self.delays_enabled = False
 
-    @property
-    def prefix(self):
-        """Return the key prefix."""
-        return self._prefix
+    def tick(self):
+        """Call all callbacks which are due."""
+        heap = self._heap
+
+        # Skip if nothing is due
+        if not heap or heap[0][0] > time.monotonic():
+            return
+
+        # Get all entries which are due, so callbacks scheduling new delays are processed on the next tick
+        now = time.monotonic()
+        due = list()
+
+        while heap and heap[0][0] <= now:
+            due.append(heapq.heappop(heap)[2])
+
+        for scheduled in due:
+
+            # Skip delays which have been cancelled in the meantime
+            if scheduled.cancelled:
+                continue
+
+            del self[scheduled.key]
+
+            # Count the delay and how late it is called
+            family_statistics = self.statistics[self.statistics.family(scheduled.key)]
+            family_statistics.fired += 1
+
+            self.statistics.fire_lag.add(int((now - scheduled.deadline) * 1_000_000))
+
+            start = time.perf_counter_ns()
+
+            try:
+                scheduled.callback(*scheduled.args)
+            except Exception:
+                except_hooks.print_exception()
+
+            family_statistics.durations.add((time.perf_counter_ns() - start) // 1_000)
 
-    def _format_key(self, key):
-        """Prepend `key` with the key prefix."""
-        if not key.startswith(self.prefix):
-            return f'{self.prefix}_{key}'
+    def pending(self, family):
+        """Return the amount of pending delays of the key family."""
+        return sum(1 for key in self if self.statistics.family(key) == family)
 
-        # Return the key if it is already prepended with the key prefix
-        return key
+    def _compact(self):
+        """Remove cancelled entries from the heap."""
+        self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+        heapq.heapify(self._heap)
 
     def _unload_instance(self):
         """Cancel all pending delays on unload."""
@@ -99,4 +226,49 @@ class _DelayManager(dict, AutoUnload):
 
 
 # Store a global instance of `_DelayManager`
-delay_manager = _DelayManager(info.name)
+delay_manager = _DelayManager()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnTick
+@profiler
+def on_tick():
+    """Call all delays which are due."""
+    delay_manager.tick()
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@TypedServerCommand([f'{info.name}_delays', 'dump'])
+def on_delays_dump(command_info):
+    """Print pending counts, fire lag and callback durations of all delays."""
+    statistics = delay_manager.statistics
+
+    echo_console(f'[{info.verbose_name}] Delays: {len(delay_manager)} pending')
+
+    for family in sorted(statistics, key=str):
+        family_statistics = statistics[family]
+        durations = family_statistics.durations
+
+        echo_console(
+            f'  {family}: {delay_manager.pending(family)} pending, {family_statistics.scheduled} scheduled, '
+            f'{family_statistics.fired} fired, {family_statistics.cancelled} cancelled, '
+            f'callback mean {durations.mean:.0f}us p99 {durations.percentile(0.99)}us max {durations.maximum}us'
+        )
+
+    echo_console('  Fire lag:')
+
+    for bound, bucket_count in statistics.fire_lag.buckets:
+        label = f'<= {bound // 1_000}ms' if bound is not None else 'more'
+        echo_console(f'    {label:>10}: {bucket_count}')
+
+
+@TypedServerCommand([f'{info.name}_delays', 'reset'])
+def on_delays_reset(command_info):
+    """Reset all delay statistics."""
+    delay_manager.statistics.reset()
+
+    echo_console(f'[{info.verbose_name}] Delay statistics have been reset.')
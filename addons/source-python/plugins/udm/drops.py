@@ -0,0 +1,111 @@
+# ../udm/drops.py
+
+"""Provides a registry which removes dropped weapons in batches and caps their amount."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Collections
+from collections import deque
+#   Itertools
+from itertools import count
+#   Time
+import time
+
+# Script Imports
+#   Config
+from udm.config import settings
+#   Delays
+from udm.delays import delay_manager
+#   Weapons
+from udm.weapons import weapon_manager
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Time (in seconds) a dropped weapon may lie around before it gets removed
+DROPPED_WEAPON_LIFETIME = 1
+
+# Interval (in seconds) in which expired dropped weapons get removed
+SWEEP_INTERVAL = 0.25
+
+# Delay key of the sweep
+SWEEP_KEY = ('sweep_dropped_weapons', )
+
+
+# =============================================================================
+# >> DROPPED WEAPON REGISTRY
+# =============================================================================
+class _DroppedWeaponRegistry(dict):
+    """Class used to store a drop sequence number for each dropped weapon by index.
+
+    The drops are also kept in order of their time in a ring buffer of (drop time, sequence number, index) entries.
+    Entries of weapons which have been picked up, deleted or dropped again are skipped when they reach its front.
+    """
+
+    def __init__(self):
+        """Object initialization."""
+        # Call dict's constructor
+        super().__init__()
+
+        # Store the drops in order of their time
+        self._drops = deque()
+
+        # Store a sequence counter, so a weapon dropped again invalidates its earlier entry
+        self._sequence = count()
+
+    def add(self, index):
+        """Register the dropped weapon and schedule the sweep if necessary."""
+        sequence = self[index] = next(self._sequence)
+        self._drops.append((time.monotonic(), sequence, index))
+
+        # Remove the oldest dropped weapons if there are too many lying around
+        max_dropped_weapons = settings.snapshot.max_dropped_weapons
+
+        if max_dropped_weapons > 0:
+            while len(self) > max_dropped_weapons:
+                self._remove_oldest()
+
+        # Schedule the sweep if it isn't pending
+        if SWEEP_KEY not in delay_manager:
+            delay_manager(SWEEP_KEY, SWEEP_INTERVAL, self.sweep)
+
+    def discard(self, index):
+        """Forget the weapon if it has been registered."""
+        self.pop(index, None)
+
+    def clear(self):
+        """Forget all dropped weapons."""
+        super().clear()
+        self._drops.clear()
+
+    def sweep(self):
+        """Remove all dropped weapons which have been lying around for longer than their lifetime."""
+        deadline = time.monotonic() - DROPPED_WEAPON_LIFETIME
+        drops = self._drops
+
+        while drops and drops[0][0] <= deadline:
+            self._remove_oldest()
+
+        # Schedule the next sweep while there are dropped weapons left
+        if self:
+            delay_manager(SWEEP_KEY, SWEEP_INTERVAL, self.sweep)
+
+    def _remove_oldest(self):
+        """Remove the oldest dropped weapon if it is still registered."""
+        drop_time, sequence, index = self._drops.popleft()
+
+        # Skip weapons which have been deleted or dropped again since
+        if self.get(index) != sequence:
+            return
+
+        del self[index]
+
+        # Remove the weapon, unless it has been picked up
+        weapon_manager.remove_weapon(index)
+
+
+# Store a global instance of `_DroppedWeaponRegistry`
+dropped_weapons = _DroppedWeaponRegistry()
@@ -0,0 +1,113 @@
+# ../udm/events.py
+
+"""Provides game event listeners which are only registered while their feature is enabled."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python Imports
+#   Commands
+from commands.typed import TypedServerCommand
+#   Core
+from core import AutoUnload
+from core import echo_console
+#   Events
+from events.manager import event_registry
+
+# Script Imports
+#   Config
+from udm.config import settings
+#   Info
+from udm.info import info
+
+
+# =============================================================================
+# >> CONDITIONAL EVENT
+# =============================================================================
+class ConditionalEvent(object):
+    """Class used to register a game event listener only while its condition is met."""
+
+    __slots__ = ('event_name', 'callback', 'condition', 'registered')
+
+    def __init__(self, event_name, callback, condition):
+        """Object initialization."""
+        self.event_name = event_name
+        self.callback = callback
+        self.condition = condition
+
+        # Remember whether the callback is currently registered
+        self.registered = False
+
+    def update(self, snapshot):
+        """Register or unregister the callback, depending on whether `snapshot` meets the condition."""
+        enabled = bool(self.condition(snapshot))
+
+        # Skip if nothing has changed
+        if enabled == self.registered:
+            return
+
+        if enabled:
+            event_registry.register_for_event(self.event_name, self.callback)
+        else:
+            event_registry.unregister_for_event(self.event_name, self.callback)
+
+        self.registered = enabled
+
+    def unregister(self):
+        """Unregister the callback if it is registered."""
+        if self.registered:
+            event_registry.unregister_for_event(self.event_name, self.callback)
+            self.registered = False
+
+
+# =============================================================================
+# >> CONDITIONAL EVENT MANAGER
+# =============================================================================
+class _ConditionalEventManager(list, AutoUnload):
+    """Class used to keep conditional game event listeners in sync with the configuration."""
+
+    def __call__(self, event_name, condition):
+        """Return a decorator which registers the callback for `event_name` while `condition(snapshot)` is true."""
+        def decorator(callback):
+            """Add the callback as a conditional event listener."""
+            conditional_event = ConditionalEvent(event_name, callback, condition)
+            conditional_event.update(settings.snapshot)
+
+            self.append(conditional_event)
+            return callback
+
+        return decorator
+
+    def update(self, snapshot):
+        """Register or unregister all listeners for the new configuration snapshot."""
+        for conditional_event in self:
+            conditional_event.update(snapshot)
+
+    def _unload_instance(self):
+        """Unregister all listeners on unload."""
+        for conditional_event in self:
+            conditional_event.unregister()
+
+        # Stop following configuration changes
+        if self.update in settings.callbacks:
+            settings.callbacks.remove(self.update)
+
+
+# Store a global instance of `_ConditionalEventManager`
+conditional_events = _ConditionalEventManager()
+
+# Follow configuration changes
+settings.callbacks.append(conditional_events.update)
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@TypedServerCommand(f'{info.name}_hooks')
+def on_hooks(command_info):
+    """Print which conditional game event listeners are currently registered."""
+    echo_console(f'[{info.verbose_name}] Conditional event listeners:')
+
+    for conditional_event in conditional_events:
+        state = 'active' if conditional_event.registered else 'inactive'
+        echo_console(f'  {conditional_event.event_name}: {conditional_event.callback.__name__} ({state})')
@@ -0,0 +1,412 @@
+# ../udm/inventories.py
+
+"""Provides player inventories and their persistent storage."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Collections
+from collections import defaultdict
+from collections import OrderedDict
+#   Contextlib
+from contextlib import closing
+#   JSON
+import json
+#   Queue
+from queue import Empty
+from queue import SimpleQueue
+#   SQLite
+import sqlite3
+#   Threading
+from threading import Lock
+
+# Source.Python Imports
+#   Core
+from core import AutoUnload
+from core import GAME_NAME
+#   Hooks
+from hooks.exceptions import except_hooks
+#   Listeners
+from listeners.tick import GameThread
+#   Paths
+from paths import PLUGIN_DATA_PATH
+
+# Script Imports
+#   Info
+from udm.info import info
+#   Loadouts
+from udm.loadouts import loadout_statistics
+#   Weapons
+from udm.weapons import weapon_manager
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Maximum amount of inventories to keep in memory
+INVENTORY_CACHE_SIZE = 2048
+
+
+# =============================================================================
+# >> INVENTORIES
+# =============================================================================
+class InventoryItem(object):
+    """Class used to provide a view on the weapon & silencer option stored at one tag slot of an inventory."""
+
+    __slots__ = ('_inventory', '_slot')
+
+    def __init__(self, inventory, slot):
+        """Object initialization."""
+        self._inventory = inventory
+        self._slot = slot
+
+    @property
+    def basename(self):
+        """Return the basename."""
+        return self.data.basename
+
+    @property
+    def data(self):
+        """Return the weapon's data."""
+        return self._inventory.get_weapon_data(self._slot)
+
+    def set_silencer_option(self, value):
+        """Set the silencer option for this inventory item."""
+        self._inventory.set_silencer_option(self._slot, value)
+
+    def get_silencer_option(self):
+        """Return the silencer option for this inventory item."""
+        return self._inventory.get_silencer_option(self._slot)
+
+    # Set the "silencer_option" property for `InventoryItem`
+    silencer_option = property(get_silencer_option, set_silencer_option)
+
+
+class Inventory(object):
+    """Class used to provide a weapon inventory for players, stored as a fixed-width record:
+
+        * the interned weapon id for each tag slot, 0 meaning no weapon
+        * a bitmask of the silencer options by tag slot
+    """
+
+    __slots__ = ('_weapon_ids', '_silencers')
+
+    def __init__(self):
+        """Object initialization."""
+        self._weapon_ids = bytearray(len(weapon_manager.tags))
+        self._silencers = 0
+
+    def __bool__(self):
+        """Return whether the inventory contains any weapon."""
+        return any(self._weapon_ids)
+
+    def __len__(self):
+        """Return the amount of weapons in the inventory."""
+        return len(self._weapon_ids) - self._weapon_ids.count(0)
+
+    def __contains__(self, tag):
+        """Return whether the inventory contains a weapon for `tag`."""
+        slot = weapon_manager.tag_slots.get(tag)
+        return slot is not None and self._weapon_ids[slot] != 0
+
+    def __getitem__(self, tag):
+        """Return the inventory item for `tag`."""
+        if tag not in self:
+            raise KeyError(tag)
+
+        return InventoryItem(self, weapon_manager.tag_slots[tag])
+
+    def __delitem__(self, tag):
+        """Remove the weapon for `tag`."""
+        if tag not in self:
+            raise KeyError(tag)
+
+        slot = weapon_manager.tag_slots[tag]
+
+        self._weapon_ids[slot] = 0
+        self._silencers &= ~(1 << slot)
+
+    def keys(self):
+        """Yield the tags of all weapons in the inventory in equip order."""
+        for tag in weapon_manager.equip_order:
+            if self._weapon_ids[weapon_manager.tag_slots[tag]]:
+                yield tag
+
+    def values(self):
+        """Yield the inventory items of all weapons in the inventory in equip order."""
+        for tag in self.keys():
+            yield InventoryItem(self, weapon_manager.tag_slots[tag])
+
+    def items(self):
+        """Yield the (tag, inventory item) pairs of all weapons in the inventory in equip order."""
+        for tag in self.keys():
+            yield tag, InventoryItem(self, weapon_manager.tag_slots[tag])
+
+    def get_weapon_data(self, slot):
+        """Return the weapon's data stored at `slot`."""
+        return weapon_manager.by_id(self._weapon_ids[slot])
+
+    def set_silencer_option(self, slot, value):
+        """Set the silencer option stored at `slot`."""
+        if value:
+            self._silencers |= 1 << slot
+        else:
+            self._silencers &= ~(1 << slot)
+
+    def get_silencer_option(self, slot):
+        """Return the silencer option stored at `slot`."""
+        return bool(self._silencers & (1 << slot))
+
+    def add_inventory_item(self, basename, weapon_data):
+        """Add an inventory item for `basename` and equip the player with it."""
+        slot = weapon_manager.tag_slots[weapon_data.tag]
+
+        # Set the weapon id
+        self._weapon_ids[slot] = weapon_data.id
+
+        # Set the silencer option to True if the game is CS:GO, else False
+        self.set_silencer_option(slot, weapon_data.has_silencer and GAME_NAME == 'csgo')
+
+    def remove_inventory_item(self, player, tag):
+        """Remove an inventory item for weapon tag `tag`."""
+        # Get the currently equipped weapon entity for the weapon tag
+        weapon = player.get_weapon(is_filters=tag)
+
+        if weapon is not None:
+            weapon.remove()
+            loadout_statistics.removed += 1
+
+        # Remove the weapon tag from this inventory
+        if tag in self:
+            del self[tag]
+
+
+class Inventories(defaultdict):
+    """Class used to provide multiple inventories and the inventory selection of a player."""
+
+    __slots__ = ('selection', )
+
+    def __init__(self):
+        """Make `Inventory` the default value type."""
+        super().__init__(Inventory)
+
+        # Store the inventory selection
+        self.selection = 0
+
+    @property
+    def is_empty(self):
+        """Return whether no weapon has been chosen for any inventory and the first inventory is selected."""
+        return not self.selection and not any(self.values())
+
+    def to_dict(self):
+        """Return the inventories and the inventory selection as a JSON serializable dictionary."""
+        return {
+            'selection': self.selection,
+            'inventories': {
+                str(inventory_index): {
+                    tag: [inventory_item.basename, inventory_item.silencer_option]
+                    for tag, inventory_item in inventory.items()
+                } for inventory_index, inventory in self.items() if inventory
+            }
+        }
+
+    def update_from_dict(self, data):
+        """Restore the inventories and the inventory selection from a dictionary returned by `to_dict`."""
+        self.selection = data['selection']
+
+        for inventory_index, items in data['inventories'].items():
+            inventory = self[int(inventory_index)]
+
+            for basename, silencer_option in items.values():
+
+                # Skip weapons which have been removed from the weapon data file
+                if basename not in weapon_manager:
+                    continue
+
+                weapon_data = weapon_manager[basename]
+
+                inventory.add_inventory_item(basename, weapon_data)
+                inventory[weapon_data.tag].silencer_option = silencer_option
+
+
+# =============================================================================
+# >> INVENTORY STORE
+# =============================================================================
+class _InventoryStore(OrderedDict, AutoUnload):
+    """Class used to keep recently used inventories in memory and persist them in an SQLite database.
+
+    All database access happens on a background thread: loads are requested on first access and applied on a later
+    tick, writes are queued and committed in batches.
+    """
+
+    # Store the database file
+    database_file = PLUGIN_DATA_PATH.joinpath(info.name, 'inventories.db')
+
+    def __init__(self):
+        """Object initialization."""
+        # Call OrderedDict's constructor
+        super().__init__()
+
+        # Store the load & save requests for the database thread, a None request stops it
+        self._requests = SimpleQueue()
+
+        # Store the lock guarding the loaded inventories
+        self._lock = Lock()
+
+        # Store the (uniqueid, data) pairs loaded from the database, to be applied on the game thread
+        self._loaded = list()
+
+        # Store the database thread while it is running
+        self._thread = None
+
+        # Remember whether the database can be used, which it can't once opening it has failed
+        self.available = True
+
+    def get_inventories(self, uniqueid):
+        """Return the inventories for `uniqueid`, requesting them from the database if they aren't in memory."""
+        inventories = self.get(uniqueid)
+
+        if inventories is not None:
+            self.move_to_end(uniqueid)
+            return inventories
+
+        # Use empty inventories until the stored ones have been loaded
+        inventories = self[uniqueid] = Inventories()
+
+        # Forget the least recently used inventories, connected players keep referencing theirs
+        while len(self) > INVENTORY_CACHE_SIZE:
+            self.popitem(last=False)
+
+        if self._is_persistent(uniqueid):
+            self._request(('load', uniqueid, None))
+
+        return inventories
+
+    def save(self, uniqueid, inventories):
+        """Queue writing the inventories for `uniqueid` to the database."""
+        if self._is_persistent(uniqueid):
+            self._request(('save', uniqueid, json.dumps(inventories.to_dict())))
+
+    def apply_loaded(self):
+        """Restore all inventories which have been loaded from the database and return their uniqueids."""
+        # Skip acquiring the lock if nothing has been loaded
+        if not self._loaded:
+            return ()
+
+        with self._lock:
+            loaded, self._loaded = self._loaded, list()
+
+        restored = set()
+
+        for uniqueid, data in loaded:
+            inventories = self.get(uniqueid)
+
+            # Keep the inventories if they have been forgotten or the player has chosen weapons in the meantime
+            if inventories is None or not inventories.is_empty:
+                continue
+
+            try:
+                inventories.update_from_dict(json.loads(data))
+            except (KeyError, TypeError, ValueError):
+                except_hooks.print_exception()
+            else:
+                restored.add(uniqueid)
+
+        return restored
+
+    @staticmethod
+    def _is_persistent(uniqueid):
+        """Return whether the inventories for `uniqueid` should be stored in the database."""
+        return not uniqueid.startswith('BOT')
+
+    def _request(self, request):
+        """Hand the request to the database thread, starting it if it isn't running."""
+        # Drop the request if the database can't be opened, the failure has been reported once
+        if not self.available:
+            return
+
+        self._requests.put(request)
+
+        if self._thread is None:
+            self._thread = GameThread(target=self._run)
+            self._thread.start()
+
+    def _run(self):
+        """Process load & save requests until the None request arrives."""
+        connection = None
+
+        try:
+            connection = sqlite3.connect(self.database_file)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS inventories (uniqueid TEXT PRIMARY KEY, data TEXT NOT NULL)'
+            )
+        except sqlite3.Error:
+            except_hooks.print_exception()
+
+            if connection is not None:
+                connection.close()
+
+            # Stop queueing requests nobody would process, and drop the ones queued in the meantime
+            self.available = False
+
+            while True:
+                try:
+                    self._requests.get_nowait()
+                except Empty:
+                    return
+
+        with closing(connection):
+            while True:
+                # Wait for a request and take all others which have been queued in the meantime
+                requests = [self._requests.get()]
+
+                while True:
+                    try:
+                        requests.append(self._requests.get_nowait())
+                    except Empty:
+                        break
+
+                try:
+                    # Commit all writes in one transaction, before loading anything
+                    with connection:
+                        connection.executemany(
+                            'INSERT OR REPLACE INTO inventories (uniqueid, data) VALUES (?, ?)',
+                            [request[1:] for request in requests if request is not None and request[0] == 'save']
+                        )
+
+                    loaded = list()
+
+                    for request in requests:
+                        if request is None or request[0] != 'load':
+                            continue
+
+                        row = connection.execute(
+                            'SELECT data FROM inventories WHERE uniqueid = ?', (request[1],)
+                        ).fetchone()
+
+                        if row is not None:
+                            loaded.append((request[1], row[0]))
+
+                except sqlite3.Error:
+                    except_hooks.print_exception()
+
+                else:
+                    with self._lock:
+                        self._loaded.extend(loaded)
+
+                # Stop once all requests queued before the None request have been processed
+                if None in requests:
+                    return
+
+    def _unload_instance(self):
+        """Wait for all queued writes on unload."""
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+# Store a global instance of `_InventoryStore`
+inventory_store = _InventoryStore()
+
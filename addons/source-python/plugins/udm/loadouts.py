@@ -0,0 +1,140 @@
+# ../udm/loadouts.py
+
+"""Provides a planner which equips an inventory with the fewest weapon entity changes."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python Imports
+#   Commands
+from commands.typed import TypedServerCommand
+#   Core
+from core import echo_console
+
+# Script Imports
+#   Info
+from udm.info import info
+#   Weapons
+from udm.weapons import weapon_manager
+
+
+# =============================================================================
+# >> LOADOUT STATISTICS
+# =============================================================================
+class _LoadoutStatistics(object):
+    """Class used to count the weapon entities the plugin creates and removes, and those kept by loadout plans."""
+
+    __slots__ = ('plans', 'created', 'removed', 'kept')
+
+    def __init__(self):
+        """Object initialization."""
+        self.reset()
+
+    def reset(self):
+        """Reset all counts."""
+        self.plans = 0
+        self.created = 0
+        self.removed = 0
+        self.kept = 0
+
+
+# Store a global instance of `_LoadoutStatistics`
+loadout_statistics = _LoadoutStatistics()
+
+
+# =============================================================================
+# >> LOADOUT PLAN
+# =============================================================================
+class LoadoutPlan(object):
+    """Class used to store the changes for equipping an inventory.
+
+    Planning only reads the player's weapons, the weapons are removed, fixed and given once the plan is applied.
+    """
+
+    __slots__ = ('removals', 'silencer_fixes', 'gives')
+
+    def __init__(self, player, inventory):
+        """Compare the player's weapons with the inventory in one pass over the player's weapons."""
+        # Store the weapon entities to remove
+        self.removals = list()
+
+        # Store the kept weapons whose silencer option differs from the inventory as (weapon, silencer option) pairs
+        self.silencer_fixes = list()
+
+        # Store the weapon names to give in equip order
+        self.gives = list()
+
+        # Get the player's weapons by tag, removing those of tags which are not in the inventory
+        equipped = dict()
+
+        for weapon in player.weapons(is_filters=weapon_manager.tags, not_filters=('melee', 'grenade')):
+            tag = weapon_manager.get_tag(weapon)
+
+            if tag in inventory and tag not in equipped:
+                equipped[tag] = weapon
+            else:
+                self.removals.append(weapon)
+
+        # Keep weapons which match the inventory, replace the others
+        for tag, inventory_item in inventory.items():
+            weapon_data = inventory_item.data
+            weapon = equipped.get(tag)
+
+            if weapon is not None:
+                if weapon_manager.by_name(weapon.weapon_name) is weapon_data:
+
+                    # Plan to fix the silencer in place rather than replacing the weapon
+                    if (
+                        weapon_data.has_silencer and
+                        inventory_item.silencer_option != weapon.get_property_bool('m_bSilencerOn')
+                    ):
+                        self.silencer_fixes.append((weapon, inventory_item.silencer_option))
+
+                    loadout_statistics.kept += 1
+                    continue
+
+                self.removals.append(weapon)
+
+            self.gives.append(weapon_data.name)
+
+    def apply(self, player):
+        """Remove the planned weapons, fix the planned silencers and give the planned weapons."""
+        loadout_statistics.plans += 1
+
+        for weapon in self.removals:
+            weapon.remove()
+
+        loadout_statistics.removed += len(self.removals)
+
+        for weapon, silencer_option in self.silencer_fixes:
+            weapon_manager.set_silencer(weapon, silencer_option)
+
+        for weapon_name in self.gives:
+            player.equip_weapon(weapon_name)
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@TypedServerCommand([f'{info.name}_loadouts', 'dump'])
+def on_loadouts_dump(command_info):
+    """Print the weapon entity churn in total and per equipped inventory."""
+    plans = max(loadout_statistics.plans, 1)
+
+    echo_console(
+        f'[{info.verbose_name}] Loadouts: {loadout_statistics.plans} equipped, '
+        f'{loadout_statistics.created} created, {loadout_statistics.removed} removed, '
+        f'{loadout_statistics.kept} kept'
+    )
+    echo_console(
+        f'  Per inventory: {loadout_statistics.created / plans:.2f} created, '
+        f'{loadout_statistics.removed / plans:.2f} removed, {loadout_statistics.kept / plans:.2f} kept'
+    )
+
+
+@TypedServerCommand([f'{info.name}_loadouts', 'reset'])
+def on_loadouts_reset(command_info):
+    """Reset all loadout statistics."""
+    loadout_statistics.reset()
+
+    echo_console(f'[{info.verbose_name}] Loadout statistics have been reset.')
@@ -0,0 +1,83 @@
+# ../udm/placements.py
+
+"""Provides a spawn placement queue which is resolved once per tick on the game thread."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Contextlib
+import contextlib
+
+# Source.Python Imports
+#   Listeners
+from listeners import OnTick
+
+# Script Imports
+#   Players
+from udm.players import PlayerEntity
+#   Profiler
+from udm.profiler import profiler
+
+
+# =============================================================================
+# >> SPAWN PLACEMENT QUEUE
+# =============================================================================
+class _SpawnPlacementQueue(dict):
+    """Class used to collect spawned players and move them to their spawn locations together."""
+
+    def add(self, player):
+        """Queue moving the player to a random spawn location on the next tick."""
+        self[player.userid] = player.index
+
+    def discard(self, userid):
+        """Remove the player from the queue if they are queued."""
+        self.pop(userid, None)
+
+    def resolve(self):
+        """Choose spawn locations for all queued players and move them there."""
+        # Skip if there are no pending placements
+        if not self:
+            return
+
+        # Get and reset the pending placements
+        indexes = list(self.values())
+        self.clear()
+
+        # Store the spawn locations chosen this tick, so players are never placed onto the same spot
+        occupied_origins = list()
+
+        # Store the players and the spawn locations they will be moved to
+        placements = list()
+
+        for index in indexes:
+            with contextlib.suppress(ValueError):
+                player = PlayerEntity(index)
+
+                # Skip players who have died in the meantime
+                if player.dead:
+                    continue
+
+                # Choose a spawn location for the player
+                spawn_location = player.get_spawn_location(occupied_origins)
+
+                occupied_origins.append((spawn_location.x, spawn_location.y, spawn_location.z))
+                placements.append((player, spawn_location))
+
+        # Apply all origin and view angle changes in one pass
+        for player, spawn_location in placements:
+            spawn_location.move_player(player)
+
+
+# Store a global instance of `_SpawnPlacementQueue`
+spawn_placement_queue = _SpawnPlacementQueue()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnTick
+@profiler
+def on_tick():
+    """Resolve all spawn placements queued since the last tick."""
+    spawn_placement_queue.resolve()
@@ -12,6 +12,8 @@ from collections import defaultdict
 import contextlib
 #   Datetime
 import datetime
+#   Itertools
+from itertools import chain
 #   Random
 import random
 
@@ -19,10 +21,10 @@ import random
 #   Colors
 from colors import Color
 from colors import WHITE
-#   Core
-from core import GAME_NAME
-#   Filters
-from filters.players import PlayerIter
+#   Engines
+from engines.server import global_vars
+#   Listeners
+from listeners import OnTick
 #   Memory
 from memory import make_object
 #   Messages
@@ -31,105 +33,82 @@ from messages.colors.saytext2 import ORANGE as MESSAGE_COLOR_ORANGE
 from messages.colors.saytext2 import WHITE as MESSAGE_COLOR_WHITE
 #   Players
 from players.entity import Player
+from players.helpers import userid_from_index
 #   Weapons
 from weapons.entity import Weapon
 
 # Script Imports
 #   Config
-from udm.config import cvar_team_changes_per_round
-from udm.config import cvar_team_changes_reset_delay
-from udm.config import cvar_respawn_delay
+from udm.config import settings
 #   Delays
 from udm.delays import delay_manager
 #   Info
 from udm.info import info
+#   Inventories
+from udm.inventories import inventory_store
+#   Loadouts
+from udm.loadouts import loadout_statistics
+from udm.loadouts import LoadoutPlan
+#   Profiler
+from udm.profiler import profiler
+#   Respawns
+from udm.respawns import respawn_queue
+#   Snapshots
+from udm.snapshots import player_snapshot
 #   Spawn Points
-from udm.spawn_locations import SAFE_SPAWN_DISTANCE
 from udm.spawn_locations import spawn_location_manager
 from udm.spawn_locations import SpawnLocation
+from udm.spawn_locations import SpawnLocationCursor
 #   Weapons
+from udm.weapons import shared_classname_weapons
 from udm.weapons import weapon_manager
 
 
 # =============================================================================
 # >> CLASSES
 # =============================================================================
-class InventoryItem(object):
-    """Class used to provide an inventory item."""
-
-    def __init__(self):
-        """Object initialization."""
-        # Default the weapon's basename to None
-        self._basename = None
-
-        # Store the silencer option for this inventory item
-        self.silencer_option = False
-
-    def set_basename(self, value):
-        """Set the basename and silencer option if the weapon can be silenced."""
-        # Set the basename
-        self._basename = value
-
-        # Set the silencer option to True if the game is CS:GO, else False
-        self.silencer_option = self.data.has_silencer and GAME_NAME == 'csgo'
-
-    def get_basename(self):
-        """Return the basename."""
-        return self._basename
-
-    # Set the "basename" property for `_InventoryItem`
-    basename = property(get_basename, set_basename)
-
-    @property
-    def data(self):
-        """Return the weapon's data."""
-        return weapon_manager[self.basename]
+class PlayerState(object):
+    """Class used to store the state of a connected player."""
 
+    __slots__ = (
+        'userid', 'uniqueid', 'inventories', 'random_mode', 'team_swaps', 'random_weapons', 'spawn_location_cursor',
+        'allowed_weapons', 'buttons', 'silencer_weapon_index'
+    )
 
-class Inventory(defaultdict):
-    """Class used to provide a weapon inventory for players."""
-
-    def __init__(self):
-        """Make `_InventoryItem` the default value type."""
-        super().__init__(InventoryItem)
-
-    def keys(self):
-        """Override keys to reverse its order."""
-        yield from sorted(self, reverse=True)
-
-    def add_inventory_item(self, basename, weapon_data):
-        """Add an inventory item for `basename` and equip the player with it."""
-        # Set the inventory item's basename
-        self[weapon_data.tag].basename = basename
+    def __init__(self, userid, uniqueid, inventories):
+        """Object initialization."""
+        # Store the player's userid & uniqueid
+        self.userid = userid
+        self.uniqueid = uniqueid
 
-    def remove_inventory_item(self, player, tag):
-        """Remove an inventory item for weapon tag `tag`."""
-        # Get the currently equipped weapon entity for the weapon tag
-        weapon = player.get_weapon(is_filters=tag)
+        # Store the player's inventories, which outlive the connection
+        self.inventories = inventories
 
-        if weapon is not None:
-            weapon.remove()
+        # Store whether the player is in random mode, defaults to True for every new connection
+        self.random_mode = True
 
-        # Remove the weapon tag from this inventory
-        if tag in self.keys():
-            del self[tag]
+        # Store whether giving a weapon name requires switching teams, by (weapon name, team) for the player's loadout
+        self.team_swaps = dict()
 
+        # Store the player's per-map data
+        self.clear()
 
-class Inventories(defaultdict):
-    """Class used to provide multiple inventories and weapon selections for players."""
+    def clear(self):
+        """Reset the player's per-map data."""
+        # Store the player's shuffled random weapons for each tag
+        self.random_weapons = {tag: list() for tag in weapon_manager.tags}
 
-    # Store weapon selections
-    selections = defaultdict(int)
+        # Store the player's spawn location cursor
+        self.spawn_location_cursor = None
 
-    # Store random weapon selections, defaults to True for every new player
-    selections_random = defaultdict(lambda: True)
+        # Store the userid & weapons the player is allowed to pick up, built on demand
+        self.allowed_weapons = None
 
-    def clear(self):
-        """Perform a full clean up of all the inventories."""
-        for inventory in self.values():
-            inventory.clear()
+        # Store the buttons the player has pressed on their previous command
+        self.buttons = 0
 
-        super().clear()
+        # Store the index of the weapon whose silencer the player is toggling, 0 if none
+        self.silencer_weapon_index = 0
 
 
 # =============================================================================
@@ -147,44 +126,83 @@ class PlayerEntity(Player):
         * Refill weapon clip
     """
 
-    # Store personal player inventories
-    inventories_store = Inventories(lambda: defaultdict(Inventory))
+    # Store personal player inventories by uniqueid, as they outlive a connection
+    inventories_store = inventory_store
 
-    # Store team changes count for each player
+    # Store team changes count for each player by uniqueid, as they outlive a connection
     team_changes_store = defaultdict(int)
 
-    # Store personal player spawn points
-    spawn_locations_store = defaultdict(list)
+    # Store the state of each connected player by player index
+    states = [None] * (global_vars.max_clients + 1)
 
-    # Store personal player random weapons
-    random_weapons_store = defaultdict(lambda: {tag: list() for tag in weapon_manager.tags})
+    @classmethod
+    def clear_data(cls, keep_inventories=False):
+        cls.team_changes_store.clear()
+
+        # Persist the inventories of all connected players
+        for state in cls.states:
+            if state is not None:
+                cls.inventories_store.save(state.uniqueid, state.inventories)
+
+        # Keep the states of connected players, but reset their per-map data
+        if keep_inventories:
+            for state in cls.states:
+                if state is not None:
+                    state.clear()
+
+        # Or forget everything
+        else:
+            cls.states[:] = [None] * len(cls.states)
+            cls.inventories_store.clear()
 
     @classmethod
-    def alive(cls):
-        """Yield a `PlayerEntity` (subclass) instance for each alive player."""
-        for player in PlayerIter('alive'):
-            yield cls(player.index)
+    def resize_states(cls, max_clients):
+        """Make room for the states of `max_clients` players."""
+        if len(cls.states) < max_clients + 1:
+            cls.states.extend([None] * (max_clients + 1 - len(cls.states)))
 
     @classmethod
-    def by_team(cls, team_index):
-        """Yield a `PlayerEntity` (subclass) instance for each alive player of team `team_index`."""
-        for player in PlayerIter(('alive', 't' if team_index == 2 else 'ct')):
-            yield cls(player.index)
+    def remove_state(cls, index):
+        """Persist the inventories and remove the state of the disconnecting player."""
+        state = cls.states[index]
+
+        if state is not None:
+            cls.inventories_store.save(state.uniqueid, state.inventories)
+            cls.states[index] = None
 
     @classmethod
-    def clear_data(cls, keep_inventories=False):
-        cls.team_changes_store.clear()
-        cls.spawn_locations_store.clear()
-        cls.random_weapons_store.clear()
+    def get_state(cls, index):
+        """Return the state of the player at `index`."""
+        state = cls.states[index]
 
-        if not keep_inventories:
-            cls.inventories_store.clear()
+        # Let the property create the state if there is none or it belongs to a previous player at this index
+        if state is None or state.userid != userid_from_index(index):
+            state = cls(index).state
+
+        return state
 
     @classmethod
-    def respawn(cls, index):
-        """Respawn a player if they are still connected."""
-        with contextlib.suppress(ValueError):
-            cls(index).spawn(True)
+    def get_allowed_weapons(cls, index):
+        """Return the player's userid and a mapping of weapon names to the inventory items they are allowed to pick up.
+
+        The mapping is None if the player is in random mode, which allows any valid weapon.
+        """
+        state = cls.get_state(index)
+
+        # Build the mapping if the player's inventory has changed since it was last used
+        if state.allowed_weapons is None:
+            state.allowed_weapons = (
+                state.userid,
+                None if state.random_mode else {
+                    item.data.name: item for item in state.inventories[state.inventories.selection].values()
+                }
+            )
+
+        return state.allowed_weapons
+
+    def invalidate_allowed_weapons(self):
+        """Rebuild the weapons the player is allowed to pick up on the next weapon bump."""
+        self.state.allowed_weapons = None
 
     @classmethod
     def disable_damage_protection(cls, index):
@@ -201,10 +219,10 @@ class PlayerEntity(Player):
             player.color = WHITE
 
     @classmethod
-    def reset_team_changes(cls, userid):
+    def reset_team_changes(cls, uniqueid):
         """Reset the player's team change count."""
-        if userid in cls.team_changes_store:
-            del cls.team_changes_store[userid]
+        if uniqueid in cls.team_changes_store:
+            del cls.team_changes_store[uniqueid]
 
     def tell(self, message):
         """Send the player a prefixed chat message."""
@@ -218,24 +236,47 @@ class PlayerEntity(Player):
         #  see https://github.com/GunGame-Dev-Team/GunGame-SP/commit/bc3e7ab3630a5e3680ff35d726e810370b86a5ea
         #  and https://forums.sourcepython.com/viewtopic.php?f=31&t=1597
 
+        # Give weapons which never share their classname with another weapon right away
+        if name not in shared_classname_weapons:
+            loadout_statistics.created += 1
+            return make_object(Weapon, self.give_named_item(name))
+
+        # Get whether the player's loadout has required switching teams for this weapon before
+        team_swaps = self.state.team_swaps
+        key = (name, self.team)
+        team_swap = team_swaps.get(key, False)
+
         # Give the player the weapon entity
-        weapon = make_object(Weapon, self.give_named_item(name))
+        weapon = self._give_named_weapon(name, team_swap)
 
-        # Return it if it doesn't share its classname with another weapon
-        if weapon.classname == weapon.weapon_name:
+        # Return it if it is the requested weapon
+        if weapon.weapon_name == name:
+            team_swaps[key] = team_swap
             return weapon
 
-        # Remove it, if it does
+        # Remove it, if it isn't
         weapon.remove()
+        loadout_statistics.removed += 1
+
+        # Give the weapon entity again the other way and remember it for the next time
+        team_swaps[key] = not team_swap
+        return self._give_named_weapon(name, not team_swap)
+
+    def _give_named_weapon(self, name, team_swap):
+        """Give the player the weapon entity, switching their team while doing so if `team_swap` is True."""
+        loadout_statistics.created += 1
 
-        # Switch the player's team and give the weapon entity again
+        if not team_swap:
+            return make_object(Weapon, self.give_named_item(name))
+
+        # Switch the player's team and give the weapon entity
         self.team_index = 5 - self.team
         weapon = make_object(Weapon, self.give_named_item(name))
 
         # Reset the player's team
         self.team_index = 5 - self.team
 
-        # Return the correct weapon entity
+        # Return the weapon entity
         return weapon
 
     def equip_weapon(self, weapon_name):
@@ -251,40 +292,16 @@ class PlayerEntity(Player):
 
     def equip_inventory(self):
         """Equip the player's currently selected inventory."""
-        if self.inventory:
-            for tag in self.inventory.keys():
-                self.equip_inventory_item(tag)
+        inventory = self.inventory
+
+        # Remove and give only the weapons which differ from the inventory
+        if inventory:
+            LoadoutPlan(self, inventory).apply(self)
 
         # Give random weapons, if the inventory is empty
         else:
             self.equip_random_weapons()
 
-    def equip_inventory_item(self, tag):
-        """Equip the inventory item for `tag`."""
-        # Remove any weapon which is not listed in the player's inventory
-        tags_to_remove = [tag for tag in weapon_manager.tags if tag not in self.inventory]
-
-        if tags_to_remove:
-            self.strip(is_filters=tags_to_remove)
-
-        # Get the equipped weapon at `tag`
-        weapon = self.get_weapon(is_filters=tag)
-
-        # Get the inventory item
-        inventory_item = self.inventory[tag]
-
-        # Equip the weapon if the player isn't equipped with it
-        if weapon is None:
-            self.equip_weapon(inventory_item.data.name)
-
-        # Else, replace it with the correct weapon
-        else:
-            weapon_data = weapon_manager.by_name(weapon.weapon_name)
-
-            if weapon_data.name != inventory_item.data.name or weapon_data.has_silencer:
-                weapon.remove()
-                self.equip_weapon(inventory_item.data.name)
-
     def equip_random_weapon(self, tag):
         """Equip the player with a random weapon."""
         self.equip_weapon(self.get_random_weapon(tag))
@@ -313,6 +330,7 @@ class PlayerEntity(Player):
 
                     # Remove the player's active weapon
                     self.active_weapon.remove()
+                    loadout_statistics.removed += 1
 
                     # Equip the player with a random weapon
                     self.equip_random_weapon(weapon_data.tag)
@@ -320,6 +338,7 @@ class PlayerEntity(Player):
                 # Else, equip random weapons of the player's inventory is empty
                 else:
                     self.inventory.remove_inventory_item(self, weapon_data.tag)
+                    self.invalidate_allowed_weapons()
 
                     if not self.inventory:
                         self.equip_random_weapons()
@@ -337,29 +356,22 @@ class PlayerEntity(Player):
 
             # Add the weapon to the player's inventory
             self.inventory.add_inventory_item(weapon_basename, weapon_data)
+            self.invalidate_allowed_weapons()
 
-            # Equip the player with the weapon if the player is alive and on a team
+            # Equip the player with the inventory if the player is alive and on a team
             if not self.dead and self.team_index > 1:
-                self.equip_inventory_item(weapon_data.tag)
-
-    def inventory_item_by_weapon_name(self, weapon_name):
-        """Return the player's inventory item for the given weapon name."""
-        for inventory_item in self.inventory.values():
-            if inventory_item.data.name == weapon_name:
-                return inventory_item
-
-        # Return None if no inventory item has been found
-        return None
+                self.equip_inventory()
 
     def strip(self, is_filters=None, not_filters=('melee', 'grenade')):
         """Remove the player's weapons in `is_filters` & keep those in `not_filters`."""
         for weapon in self.weapons(is_filters=is_filters, not_filters=not_filters):
             weapon.remove()
+            loadout_statistics.removed += 1
 
     def enable_damage_protection(self, time_delay=None):
         """Enable damage protection and disable it after `time_delay` if `time_delay` is not None."""
         # Cancel the damage protection delay for the player
-        delay_manager.cancel(f'protect_{self.userid}')
+        delay_manager.cancel(('protect', self.userid))
 
         # Enable god mode
         self.godmode = True
@@ -370,7 +382,7 @@ class PlayerEntity(Player):
         # Disable protection after `time_delay`
         if time_delay is not None:
             delay_manager(
-                f'protect_{self.userid}', time_delay, PlayerEntity.disable_damage_protection, (self.index, ),
+                ('protect', self.userid), time_delay, PlayerEntity.disable_damage_protection, (self.index, ),
                 call_on_cancel=True
             )
 
@@ -385,7 +397,7 @@ class PlayerEntity(Player):
     def refill_clip(self, weapon_data):
         """Restore the player's active weapon's clip."""
         delay_manager(
-            f'refill_clip_{self.active_weapon.index}', 0.1,
+            ('refill_clip', self.active_weapon.index), 0.1,
             self.active_weapon.set_clip, (weapon_data.clip,)
         )
 
@@ -397,7 +409,7 @@ class PlayerEntity(Player):
     def random_weapons(self):
         """Return personal random weapons for the player."""
         # Get the player's personal random weapon map
-        random_weapons = self.random_weapons_store[self.userid]
+        random_weapons = self.state.random_weapons
 
         # Iterate through it
         for tag, weapon_list in random_weapons.items():
@@ -410,50 +422,39 @@ class PlayerEntity(Player):
         # Return it
         return random_weapons
 
-    def get_spawn_location(self):
-        """Return a unique spawn location for the player."""
-        # Get a list of current player origins
-        player_origins = [player.origin for player in PlayerEntity.alive() if player.userid != self.userid]
+    def get_spawn_location(self, occupied_origins=()):
+        """Return a unique spawn location for the player, also keeping distance to the (x, y, z) `occupied_origins`."""
+        # Only look for a spawn point if there are other players to keep distance to
+        if occupied_origins or len(player_snapshot) > (self.userid in player_snapshot):
 
-        # Loop through all the player's spawn points
-        for spawn_location in self.spawn_locations.copy():
-
-            # Calculate the distances between the spawn point and all player origins
-            distances = [origin.get_distance(spawn_location) for origin in player_origins]
-
-            # Continue if there is enough space around the spawn point
-            if distances and min(distances) >= SAFE_SPAWN_DISTANCE:
+            # Get the spawn points which are too close to any of the other players' origins
+            unsafe_indexes = spawn_location_manager.get_unsafe_indexes(
+                chain(player_snapshot.origins(exclude_userid=self.userid), occupied_origins)
+            )
 
-                # Remove the spawn point from the player's spawn points list
-                self.spawn_locations.remove(spawn_location)
+            # Take the next spawn point with enough space around it from the player's spawn points
+            index = self.spawn_location_cursor.take(unsafe_indexes)
 
-                # Return the spawn point found
-                return spawn_location
+            # Return the spawn point found
+            if index is not None:
+                return spawn_location_manager[index]
 
         # Return the player's current location as a spawn point if no spawn point has been found
         return SpawnLocation.from_player_location(self)
 
-    def move_to_random_spawn_location(self):
-        """Moves the player to a random spawn location."""
-        # Choose a random spawn point
-        spawn_location = self.get_spawn_location()
-
-        # Move the player to the spawn point found
-        spawn_location.move_player(self)
-
     @property
-    def spawn_locations(self):
-        """Return personal spawn locations for the player."""
-        # Get the player's personal spawn locations list
-        spawn_locations = self.spawn_locations_store[self.userid]
+    def spawn_location_cursor(self):
+        """Return the personal spawn location cursor for the player."""
+        # Get the player's personal spawn location cursor
+        state = self.state
+        cursor = state.spawn_location_cursor
 
-        # Fill in spawn points in shuffled form if it is empty
-        if not spawn_locations:
-            spawn_locations.extend(spawn_location_manager)
-            random.shuffle(spawn_locations)
+        # Create a new one if there is none or the spawn locations have been added or removed in the meantime
+        if cursor is None or len(cursor) != len(spawn_location_manager):
+            cursor = state.spawn_location_cursor = SpawnLocationCursor(len(spawn_location_manager))
 
         # Return it
-        return spawn_locations
+        return cursor
 
     def team_changed(self, team_index):
         self.team = team_index
@@ -463,12 +464,12 @@ class PlayerEntity(Player):
 
         # Reset the player's team change count after the team change reset delay if the maximum team change count
         # has been reached
-        if self.team_changes == cvar_team_changes_per_round.get_int() + 1:
-            penalty_seconds = abs(cvar_team_changes_reset_delay.get_float()) * 60.0
+        if self.team_changes == settings.snapshot.team_changes_per_round + 1:
+            penalty_seconds = abs(settings.snapshot.team_changes_reset_delay) * 60.0
 
             delay_manager(
-                f'reset_team_changes_{self.userid}', penalty_seconds,
-                PlayerEntity.reset_team_changes, (self.userid,)
+                ('reset_team_changes', self.userid), penalty_seconds,
+                PlayerEntity.reset_team_changes, (self.uniqueid,)
             )
 
             penalty_start = datetime.datetime.now()
@@ -496,9 +497,10 @@ class PlayerEntity(Player):
                 f'{MESSAGE_COLOR_WHITE} to join any other team from now on.'
             )
 
-        # Respawn the player after the respawn delay
+        # Queue respawning the player after the respawn delay
         delay_manager(
-            f'respawn_{self.userid}', abs(cvar_respawn_delay.get_float()), PlayerEntity.respawn, (self.index,)
+            ('respawn', self.userid), abs(settings.snapshot.respawn_delay), respawn_queue.add,
+            (self.userid, self.index)
         )
 
     def set_team_changes(self, value):
@@ -514,35 +516,60 @@ class PlayerEntity(Player):
 
     def set_inventory_selection(self, inventory_index):
         """Set the player's inventory selection to `inventory_index`."""
-        self.inventories_store.selections[self.uniqueid] = inventory_index
+        self.inventories.selection = inventory_index
+        self.invalidate_allowed_weapons()
 
     def get_inventory_selection(self):
         """Return the player's current inventory selection."""
-        return self.inventories_store.selections[self.uniqueid]
+        return self.inventories.selection
 
     # Set the `inventory_selection` property for PlayerEntity
     inventory_selection = property(get_inventory_selection, set_inventory_selection)
 
     def set_random_mode(self, value):
         """Set random mode for the player."""
-        self.inventories_store.selections_random[self.userid] = value
+        state = self.state
+        state.random_mode = value
+        state.allowed_weapons = None
 
     def get_random_mode(self):
         """Return whether the player is currently in random mode."""
-        return self.inventories_store.selections_random[self.userid]
+        return self.state.random_mode
 
     # Set the `random_mode` property for PlayerEntity
     random_mode = property(get_random_mode, set_random_mode)
 
+    @property
+    def state(self):
+        """Return the state of the player, creating it on first access after connecting."""
+        state = self.states[self.index]
+        userid = self.userid
+
+        if state is None or state.userid != userid:
+
+            # Persist the inventories of a previous player at this index whose disconnect has been missed
+            if state is not None:
+                self.inventories_store.save(state.uniqueid, state.inventories)
+
+            uniqueid = self.uniqueid
+
+            # Get the player's inventories, which are loaded from the database in the background if necessary
+            state = self.states[self.index] = PlayerState(
+                userid, uniqueid, self.inventories_store.get_inventories(uniqueid)
+            )
+
+        return state
+
     @property
     def inventories(self):
         """Return the player's inventories."""
-        return self.inventories_store[self.uniqueid]
+        return self.state.inventories
 
     @property
     def inventory(self):
         """Return the player's current inventory."""
-        return self.inventories[self.inventory_selection]
+        inventories = self.state.inventories
+        return inventories[inventories.selection]
 
     @property
     def carries_inventory(self):
@@ -566,3 +593,22 @@ class PlayerEntity(Player):
 
         # Return True if the player carries all the weapons in their selected inventory
         return True
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnTick
+@profiler
+def on_tick():
+    """Restore inventories which have been loaded from the database."""
+    restored = inventory_store.apply_loaded()
+
+    # Skip if nothing has been restored
+    if not restored:
+        return
+
+    # Let the players pick up the weapons of their restored inventories
+    for state in PlayerEntity.states:
+        if state is not None and state.uniqueid in restored:
+            state.allowed_weapons = None
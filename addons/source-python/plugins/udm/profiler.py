@@ -0,0 +1,174 @@
+# ../udm/profiler.py
+
+"""Provides an opt-in profiler for event handlers, hooks and listeners."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Functools
+from functools import wraps
+#   Time
+from time import perf_counter_ns
+
+# Source.Python Imports
+#   Commands
+from commands.typed import TypedServerCommand
+#   Core
+from core import echo_console
+#   Engines
+from engines.server import global_vars
+#   Listeners
+from listeners import OnLevelEnd
+from listeners import OnLevelInit
+
+# Script Imports
+#   Info
+from udm.info import info
+#   Statistics
+from udm.statistics import Histogram
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Handler duration histogram bucket bounds (in nanoseconds)
+HANDLER_DURATION_BOUNDS = (
+    1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000, 5_000_000
+)
+
+# Amount of handlers to print per ranking
+TOP_HANDLERS = 10
+
+
+# =============================================================================
+# >> PROFILER
+# =============================================================================
+class _Profiler(dict):
+    """Class used to store a duration histogram for each profiled handler by module and handler name."""
+
+    def __init__(self):
+        """Object initialization."""
+        # Call dict's constructor
+        super().__init__()
+
+        # Remember whether handler calls are timed
+        self.enabled = False
+
+        # Store the tick count profiling has been started or the current map has been loaded at
+        self.start_tick_count = 0
+
+        # Store the amount of ticks profiled on previous maps, as the tick count restarts on map change
+        self.elapsed_ticks = 0
+
+    def __call__(self, callback):
+        """Return a wrapper for `callback` which times its calls while the profiler is enabled."""
+        name = f'{callback.__module__.rpartition(".")[2]}.{callback.__name__}'
+        durations = self[name] = Histogram(HANDLER_DURATION_BOUNDS)
+
+        @wraps(callback)
+        def wrapper(*args, **kwargs):
+            """Call the handler and add its duration to its histogram, if the profiler is enabled."""
+            if not self.enabled:
+                return callback(*args, **kwargs)
+
+            start = perf_counter_ns()
+
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                durations.add(perf_counter_ns() - start)
+
+        return wrapper
+
+    def start(self):
+        """Reset all histograms and start timing handler calls."""
+        for durations in self.values():
+            durations.reset()
+
+        self.start_tick_count = global_vars.tick_count
+        self.elapsed_ticks = 0
+        self.enabled = True
+
+    def stop(self):
+        """Stop timing handler calls."""
+        if self.enabled:
+            self.elapsed_ticks += global_vars.tick_count - self.start_tick_count
+            self.enabled = False
+
+    @property
+    def ticks(self):
+        """Return the amount of ticks profiled."""
+        ticks = self.elapsed_ticks
+
+        if self.enabled:
+            ticks += global_vars.tick_count - self.start_tick_count
+
+        return max(ticks, 1)
+
+
+# Store a global instance of `_Profiler`
+profiler = _Profiler()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnLevelEnd
+def on_level_end():
+    """Add the ticks profiled on the ending map."""
+    if profiler.enabled:
+        profiler.elapsed_ticks += global_vars.tick_count - profiler.start_tick_count
+
+
+@OnLevelInit
+def on_level_init(map_name):
+    """Count the ticks of the new map from its first tick on."""
+    profiler.start_tick_count = global_vars.tick_count
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@TypedServerCommand([f'{info.name}_profile', 'start'])
+def on_profile_start(command_info):
+    """Start profiling all handlers."""
+    profiler.start()
+
+    echo_console(f'[{info.verbose_name}] Profiling has been started.')
+
+
+@TypedServerCommand([f'{info.name}_profile', 'stop'])
+def on_profile_stop(command_info):
+    """Stop profiling all handlers."""
+    profiler.stop()
+
+    echo_console(f'[{info.verbose_name}] Profiling has been stopped.')
+
+
+@TypedServerCommand([f'{info.name}_profile', 'dump'])
+def on_profile_dump(command_info):
+    """Print the handlers with the highest total and p99 durations."""
+    ticks = profiler.ticks
+    total = sum(durations.total for durations in profiler.values())
+
+    echo_console(
+        f'[{info.verbose_name}] Profile over {ticks} ticks: {total / 1_000 / ticks:.2f}us per tick'
+        f'{"" if profiler.enabled else " (stopped)"}'
+    )
+
+    # Get the handlers which have been called
+    called = [(name, durations) for name, durations in profiler.items() if durations.count]
+
+    for title, sort_key in (
+        ('total', lambda item: item[1].total),
+        ('p99', lambda item: item[1].percentile(0.99))
+    ):
+        echo_console(f'  Top handlers by {title}:')
+
+        for name, durations in sorted(called, key=sort_key, reverse=True)[:TOP_HANDLERS]:
+            echo_console(
+                f'    {name}: {durations.count} calls, total {durations.total / 1_000:.0f}us, '
+                f'mean {durations.mean / 1_000:.2f}us, p99 <= {durations.percentile(0.99) / 1_000:.0f}us, '
+                f'max {durations.maximum / 1_000:.0f}us'
+            )
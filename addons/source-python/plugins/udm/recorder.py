@@ -0,0 +1,279 @@
+# ../udm/recorder.py
+
+"""Provides a recorder for the game events, client commands and buttons the plugin handles."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Contextlib
+import contextlib
+#   JSON
+import json
+#   Queue
+from queue import SimpleQueue
+#   Struct
+import struct
+#   Time
+import time
+#   Typing
+from typing import NamedTuple
+
+# Source.Python Imports
+#   Commands
+from commands.typed import TypedServerCommand
+#   Core
+from core import AutoUnload
+from core import echo_console
+#   Engines
+from engines.server import global_vars
+#   Events
+from events.manager import event_registry
+#   Hooks
+from hooks.exceptions import except_hooks
+#   Listeners
+from listeners.tick import GameThread
+#   Paths
+from paths import PLUGIN_DATA_PATH
+#   Players
+from players.helpers import index_from_userid
+
+# Script Imports
+#   Info
+from udm.info import info
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Trace file header: magic, format version, seconds per tick
+TRACE_HEADER = struct.Struct('<4sHf')
+
+# Trace file magic
+TRACE_MAGIC = b'UDMR'
+
+# Trace file format version
+TRACE_VERSION = 1
+
+# Trace record header: kind, tick count, player index (of the event's userid for events, else 0), payload length
+TRACE_RECORD = struct.Struct('<BiBH')
+
+# Button states payload
+TRACE_BUTTONS = struct.Struct('<I')
+
+# Trace record kinds
+RECORD_EVENT = 1
+RECORD_CLIENT_COMMAND = 2
+RECORD_BUTTONS = 3
+
+# Game events to record
+RECORDED_EVENTS = (
+    'round_start', 'round_freeze_end', 'round_end',
+    'player_spawn', 'player_death', 'player_disconnect',
+    'hegrenade_detonate', 'weapon_fire', 'weapon_reload'
+)
+
+# Amount of bytes to buffer before handing them to the writer thread
+FLUSH_SIZE = 64 * 1024
+
+
+# =============================================================================
+# >> TRACE RECORD
+# =============================================================================
+class TraceRecord(NamedTuple):
+    """Class used to store one decoded trace record."""
+
+    kind: int
+    tick_count: int
+    index: int
+    data: object
+
+
+def read_trace(trace_file):
+    """Yield a `TraceRecord` for each record in the trace file."""
+    with open(trace_file, 'rb') as f:
+        magic, version, interval_per_tick = TRACE_HEADER.unpack(f.read(TRACE_HEADER.size))
+
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            raise ValueError(f'{trace_file} is not a version {TRACE_VERSION} trace file.')
+
+        while True:
+            header = f.read(TRACE_RECORD.size)
+
+            # Stop at the end of the file, ignoring a truncated last record
+            if len(header) < TRACE_RECORD.size:
+                return
+
+            kind, tick_count, index, length = TRACE_RECORD.unpack(header)
+            payload = f.read(length)
+
+            if len(payload) < length:
+                return
+
+            # Decode the payload
+            if kind == RECORD_EVENT:
+                event_name, variables = payload.split(b'\0', 1)
+                data = (event_name.decode(), json.loads(variables))
+
+            elif kind == RECORD_CLIENT_COMMAND:
+                data = payload.decode()
+
+            else:
+                data = TRACE_BUTTONS.unpack(payload)[0]
+
+            yield TraceRecord(kind, tick_count, index, data)
+
+
+# =============================================================================
+# >> RECORDER
+# =============================================================================
+class _Recorder(AutoUnload):
+    """Class used to buffer trace records on the game thread and write them on a background thread."""
+
+    # Store the trace files path
+    path = PLUGIN_DATA_PATH.joinpath(info.name, 'traces')
+
+    def __init__(self):
+        """Object initialization."""
+        # Remember whether records are being taken
+        self.recording = False
+
+        # Store the records which haven't been handed to the writer thread yet
+        self._buffer = bytearray()
+
+        # Store the chunks to be written, a None chunk closes the file
+        self._chunks = None
+
+        # Store the writer thread while it is running
+        self._thread = None
+
+        # Store the trace file currently being written
+        self.trace_file = None
+
+    def start(self):
+        """Start recording to a new trace file."""
+        if self.recording:
+            return
+
+        # Wait for the previous trace file to be closed
+        self._join()
+
+        self.path.makedirs_p()
+        self.trace_file = self.path.joinpath(
+            f'{global_vars.map_name}_{time.strftime("%Y%m%d_%H%M%S")}.trace'
+        )
+
+        self._buffer += TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, global_vars.interval_per_tick)
+
+        # Start the writer thread
+        self._chunks = SimpleQueue()
+        self._thread = GameThread(target=self._run, args=(self.trace_file, self._chunks))
+        self._thread.start()
+
+        # Record the game events
+        for event_name in RECORDED_EVENTS:
+            event_registry.register_for_event(event_name, self.record_event)
+
+        self.recording = True
+
+    def stop(self):
+        """Stop recording and close the trace file once all records have been written."""
+        if not self.recording:
+            return
+
+        self.recording = False
+
+        for event_name in RECORDED_EVENTS:
+            event_registry.unregister_for_event(event_name, self.record_event)
+
+        # Hand the remaining records to the writer thread and let it close the file
+        self._flush()
+        self._chunks.put(None)
+
+    def record_event(self, game_event):
+        """Record the game event and its variables, along with the index of the player it is about."""
+        # Get the player's index, so replays can tell which player the commands & buttons of an index belong to
+        index = 0
+        userid = game_event['userid']
+
+        if userid:
+            with contextlib.suppress(ValueError):
+                index = index_from_userid(userid)
+
+        self._record(
+            RECORD_EVENT, index,
+            game_event.name.encode() + b'\0' + json.dumps(game_event.variables.as_dict()).encode()
+        )
+
+    def record_client_command(self, index, command):
+        """Record the client command entered by the player."""
+        self._record(RECORD_CLIENT_COMMAND, index, command.command_string.encode())
+
+    def record_buttons(self, index, buttons):
+        """Record the player's changed buttons."""
+        self._record(RECORD_BUTTONS, index, TRACE_BUTTONS.pack(buttons & 0xFFFFFFFF))
+
+    def _record(self, kind, index, payload):
+        """Add a record to the buffer."""
+        buffer = self._buffer
+        buffer += TRACE_RECORD.pack(kind, global_vars.tick_count, index, len(payload))
+        buffer += payload
+
+        if len(buffer) >= FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        """Hand the buffered records to the writer thread."""
+        if self._buffer:
+            self._chunks.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    @staticmethod
+    def _run(trace_file, chunks):
+        """Write chunks to the trace file until the None chunk arrives."""
+        try:
+            with open(trace_file, 'wb') as f:
+                while True:
+                    chunk = chunks.get()
+
+                    if chunk is None:
+                        return
+
+                    f.write(chunk)
+
+        except OSError:
+            except_hooks.print_exception()
+
+    def _join(self):
+        """Wait for the writer thread to finish."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _unload_instance(self):
+        """Stop recording and wait for the trace file to be written on unload."""
+        self.stop()
+        self._join()
+
+
+# Store a global instance of `_Recorder`
+recorder = _Recorder()
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@TypedServerCommand([f'{info.name}_record', 'start'])
+def on_record_start(command_info):
+    """Start recording a trace file."""
+    recorder.start()
+
+    echo_console(f'[{info.verbose_name}] Recording to {recorder.trace_file}')
+
+
+@TypedServerCommand([f'{info.name}_record', 'stop'])
+def on_record_stop(command_info):
+    """Stop recording the trace file."""
+    recorder.stop()
+
+    echo_console(f'[{info.verbose_name}] Recording has been stopped.')
@@ -0,0 +1,134 @@
+# ../udm/respawns.py
+
+"""Provides a respawn queue which limits the amount of players respawned per tick."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Collections
+from collections import OrderedDict
+#   Contextlib
+import contextlib
+
+# Source.Python Imports
+#   Commands
+from commands.typed import TypedServerCommand
+#   Core
+from core import echo_console
+#   Engines
+from engines.server import global_vars
+#   Listeners
+from listeners import OnTick
+#   Players
+from players.entity import Player
+
+# Script Imports
+#   Config
+from udm.config import settings
+#   Info
+from udm.info import info
+#   Profiler
+from udm.profiler import profiler
+#   Statistics
+from udm.statistics import Histogram
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Respawns per tick histogram bucket bounds
+SPIKE_BOUNDS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+
+# Ticks waited in the queue histogram bucket bounds
+WAIT_BOUNDS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+
+# =============================================================================
+# >> RESPAWN QUEUE
+# =============================================================================
+class _RespawnQueue(OrderedDict):
+    """Class used to store the index & queueing tick of players due to respawn by userid, in order of their due time."""
+
+    def __init__(self):
+        """Object initialization."""
+        # Call OrderedDict's constructor
+        super().__init__()
+
+        # Store the amount of players respawned on each tick with respawns
+        self.spikes = Histogram(SPIKE_BOUNDS)
+
+        # Store the amount of ticks players have waited in the queue
+        self.waits = Histogram(WAIT_BOUNDS)
+
+    def add(self, userid, index):
+        """Queue respawning the player, keeping their position if they are queued already."""
+        if userid not in self:
+            self[userid] = (index, global_vars.tick_count)
+
+    def discard(self, userid):
+        """Remove the player from the queue if they are queued."""
+        self.pop(userid, None)
+
+    def tick(self):
+        """Respawn the players who have been queued first, up to the configured maximum per tick."""
+        # Skip if nobody is due to respawn
+        if not self:
+            return
+
+        max_respawns = settings.snapshot.max_respawns_per_tick
+        amount = len(self) if max_respawns <= 0 else min(len(self), max_respawns)
+        tick_count = global_vars.tick_count
+
+        for _ in range(amount):
+            userid, (index, queued_tick_count) = self.popitem(last=False)
+            self.waits.add(tick_count - queued_tick_count)
+
+            with contextlib.suppress(ValueError):
+                Player(index).spawn(True)
+
+        self.spikes.add(amount)
+
+    def reset_statistics(self):
+        """Reset the respawn statistics."""
+        self.spikes.reset()
+        self.waits.reset()
+
+
+# Store a global instance of `_RespawnQueue`
+respawn_queue = _RespawnQueue()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnTick
+@profiler
+def on_tick():
+    """Respawn the players due to respawn on this tick."""
+    respawn_queue.tick()
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@TypedServerCommand([f'{info.name}_respawns', 'dump'])
+def on_respawns_dump(command_info):
+    """Print how many players have been respawned per tick and how long they have waited in the queue."""
+    spikes = respawn_queue.spikes
+    waits = respawn_queue.waits
+
+    echo_console(
+        f'[{info.verbose_name}] Respawns: {waits.count} respawned on {spikes.count} ticks, {len(respawn_queue)} queued'
+    )
+
+    echo_console(f'  Per tick: mean {spikes.mean:.2f}, p99 <= {spikes.percentile(0.99)}, max {spikes.maximum}')
+    echo_console(f'  Ticks waited: mean {waits.mean:.2f}, p99 <= {waits.percentile(0.99)}, max {waits.maximum}')
+
+
+@TypedServerCommand([f'{info.name}_respawns', 'reset'])
+def on_respawns_reset(command_info):
+    """Reset all respawn statistics."""
+    respawn_queue.reset_statistics()
+
+    echo_console(f'[{info.verbose_name}] Respawn statistics have been reset.')
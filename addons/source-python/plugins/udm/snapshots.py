@@ -0,0 +1,108 @@
+# ../udm/snapshots.py
+
+"""Provides tick-scoped snapshots of alive players."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Array
+from array import array
+
+# Source.Python Imports
+#   Engines
+from engines.server import global_vars
+#   Filters
+from filters.players import PlayerIter
+#   Listeners
+from listeners import OnLevelInit
+
+
+# =============================================================================
+# >> PLAYER SNAPSHOT
+# =============================================================================
+class PlayerSnapshot(object):
+    """Class used to collect the index, userid, team and origin of each alive player once per tick."""
+
+    def __init__(self):
+        """Object initialization."""
+        # Store the tick count the snapshot has been taken at
+        self._tick_count = None
+
+        # Store the player data in compact arrays
+        self._indexes = array('i')
+        self._userids = array('i')
+        self._teams = array('b')
+
+        # Store the origins as flat (x, y, z) triples
+        self._origins = array('f')
+
+    def __len__(self):
+        """Return the amount of alive players."""
+        self.refresh()
+        return len(self._userids)
+
+    def __contains__(self, userid):
+        """Return whether the player for `userid` is alive."""
+        self.refresh()
+        return userid in self._userids
+
+    def refresh(self):
+        """Collect the data of all alive players, if the snapshot has been taken on an earlier tick."""
+        tick_count = global_vars.tick_count
+
+        if self._tick_count == tick_count:
+            return
+
+        self._tick_count = tick_count
+
+        # Remove the data of the previous tick
+        del self._indexes[:]
+        del self._userids[:]
+        del self._teams[:]
+        del self._origins[:]
+
+        # Collect the data in one pass
+        for player in PlayerIter('alive'):
+            origin = player.origin
+
+            self._indexes.append(player.index)
+            self._userids.append(player.userid)
+            self._teams.append(player.team)
+            self._origins.extend((origin.x, origin.y, origin.z))
+
+    def invalidate(self):
+        """Force the snapshot to be taken again on the next access."""
+        self._tick_count = None
+
+    def origins(self, exclude_userid=None, exclude_team=None):
+        """Yield the (x, y, z) origin of each alive player besides `exclude_userid` and members of `exclude_team`."""
+        self.refresh()
+
+        origins = self._origins
+
+        for position, userid in enumerate(self._userids):
+            if userid == exclude_userid or self._teams[position] == exclude_team:
+                continue
+
+            offset = position * 3
+            yield origins[offset], origins[offset + 1], origins[offset + 2]
+
+    @property
+    def indexes(self):
+        """Return the indexes of all alive players."""
+        self.refresh()
+        return self._indexes
+
+
+# Store a global instance of `PlayerSnapshot`
+player_snapshot = PlayerSnapshot()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnLevelInit
+def on_level_init(map_name):
+    """Invalidate the snapshot, as the tick count restarts on map change."""
+    player_snapshot.invalidate()
@@ -5,6 +5,12 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python Imports
+#   Contextlib
+import contextlib
+#   Functools
+from functools import partial
+
 # Source.Python Imports
 #   Menus
 from menus import PagedMenu
@@ -19,7 +25,6 @@ from udm.admin import admin_menu
 #   Players
 from udm.players import PlayerEntity
 #   Spawn Locations
-from udm.spawn_locations import SAFE_SPAWN_DISTANCE
 from udm.spawn_locations import spawn_location_manager
 from udm.spawn_locations import SpawnLocation
 
@@ -36,11 +41,11 @@ SPAWN_LOCATION_TOLERANCE_UNITS = 20.0
 # =============================================================================
 def add_spawn_location_at_player_location(player):
     """Add a the player's current location as a spawn location."""
-    # Get a list of the distance of all spawn locations to the player's current location
-    distances = [spawn_location.get_distance(player.origin) for spawn_location in spawn_location_manager]
+    # Get the player's current location
+    origin = player.origin
 
     # Add the player's current location, if it is far enough away from all other spawn locations
-    if not distances or min(distances) >= SAFE_SPAWN_DISTANCE:
+    if not spawn_location_manager.get_unsafe_indexes([(origin.x, origin.y, origin.z)]):
         spawn_location = SpawnLocation.from_player_location(player)
         spawn_location_manager.append(spawn_location)
 
@@ -94,15 +99,18 @@ def send_spawn_location_list_to_player(player):
 
 def save_spawn_locations(player):
     """Save current spawn locations to file."""
-    spawn_location_manager.save()
-
-    # Tell the player about it
-    player.tell('Spawn Locations have been saved.')
+    spawn_location_manager.save(partial(tell_spawn_locations_saved, player.index))
 
     # Send the spawn location manager menu back to the player
     spawn_location_manager_menu.send(player.index)
 
 
+def tell_spawn_locations_saved(player_index):
+    """Tell the player that the spawn locations have been written to file, if they are still connected."""
+    with contextlib.suppress(ValueError):
+        PlayerEntity(player_index).tell('Spawn Locations have been saved.')
+
+
 # Create the Spawn Location Manager menu
 spawn_location_manager_menu = PagedMenu(
     [
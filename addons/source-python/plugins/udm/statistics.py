@@ -0,0 +1,80 @@
+# ../udm/statistics.py
+
+"""Provides low overhead counters for runtime statistics."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Array
+from array import array
+#   Bisect
+from bisect import bisect_left
+
+
+# =============================================================================
+# >> HISTOGRAM
+# =============================================================================
+class Histogram(object):
+    """Class used to count values in fixed, preallocated buckets."""
+
+    __slots__ = ('_bounds', '_counts', 'count', 'total', 'maximum')
+
+    def __init__(self, bounds):
+        """Object initialization."""
+        # Store the inclusive upper bounds of the buckets, the last bucket counts everything above them
+        self._bounds = tuple(bounds)
+
+        # Store the bucket counts
+        self._counts = array('Q', bytes(8 * (len(self._bounds) + 1)))
+
+        # Store the amount, sum and maximum of all values added
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+
+    def add(self, value):
+        """Count `value` in its bucket."""
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+        if value > self.maximum:
+            self.maximum = value
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding the value at `fraction` (e.g. 0.99), or the maximum."""
+        if not self.count:
+            return 0
+
+        rank = fraction * self.count
+        seen = 0
+
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+
+            if seen >= rank:
+                return self._bounds[index] if index < len(self._bounds) else self.maximum
+
+        return self.maximum
+
+    def reset(self):
+        """Reset all counts."""
+        for index in range(len(self._counts)):
+            self._counts[index] = 0
+
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+
+    @property
+    def mean(self):
+        """Return the mean of all values added."""
+        return self.total / self.count if self.count else 0
+
+    @property
+    def buckets(self):
+        """Yield the (upper bound, count) pair of each non-empty bucket, the last bound being None."""
+        for index, bucket_count in enumerate(self._counts):
+            if bucket_count:
+                yield self._bounds[index] if index < len(self._bounds) else None, bucket_count
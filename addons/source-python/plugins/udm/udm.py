@@ -14,10 +14,12 @@ import random
 from commands.client import ClientCommandFilter
 from commands.typed import TypedSayCommand
 #   Core
-from core import GAME_NAME
 from core import OutputReturn
+#   Engines
+from engines.server import global_vars
 #   Entities
 from entities.entity import Entity
+from entities.helpers import index_from_pointer
 from entities.hooks import EntityCondition
 from entities.hooks import EntityPreHook
 #   Events
@@ -32,7 +34,6 @@ from listeners import OnLevelEnd
 from listeners import OnPlayerRunCommand
 from listeners import OnServerActivate
 from listeners import OnServerOutput
-from listeners.tick import GameThread
 #   Memory
 from memory import make_object
 #   Messages
@@ -46,33 +47,41 @@ from weapons.entity import Weapon
 #   Admin
 from udm.admin import admin_menu
 #   Config
-from udm.config import cvar_enable_infinite_ammo
-from udm.config import cvar_enable_noblock
-from udm.config import cvar_equip_hegrenade
-from udm.config import cvar_refill_clip_on_headshot
-from udm.config import cvar_respawn_delay
-from udm.config import cvar_restore_health_on_knife_kill
 from udm.config import cvar_saycommand_admin
 from udm.config import cvar_saycommand_guns
-from udm.config import cvar_spawn_protection_delay
-from udm.config import cvar_team_changes_per_round
+from udm.config import settings
 #   Cvars
 from udm.cvars import default_convars
 from udm.cvars import mp_restartgame
 #   Delays
 from udm.delays import delay_manager
+#   Drops
+from udm.drops import dropped_weapons
 #   Entities
 from udm.entities import EntityInputDispatcher
 from udm.entities import EntityRemover
+#   Events
+from udm.events import conditional_events
 #   Info
 from udm.info import info
 #   Menus
 from udm.weapons.menus import primary_menu
+#   Placements
+from udm.placements import spawn_placement_queue
 #   Players
 from udm.players import PlayerEntity
+#   Profiler
+from udm.profiler import profiler
+#   Recorder
+from udm.recorder import recorder
+#   Respawns
+from udm.respawns import respawn_queue
+#   Snapshots
+from udm.snapshots import player_snapshot
 #   Spawn Locations
 from udm.spawn_locations import menus
 #   Weapons
+from udm.weapons import silencer_classnames
 from udm.weapons import weapon_manager
 
 
@@ -86,6 +95,13 @@ forbidden_entities = list(
 )
 
 
+# =============================================================================
+# >> IGNORED WEAPONS
+# =============================================================================
+# Store a set of weapon classnames players are always allowed to pick up
+ignored_weapon_classnames = frozenset(('weapon_knife', 'weapon_hegrenade'))
+
+
 # =============================================================================
 # >> MAP FUNCTIONS
 # =============================================================================
@@ -100,24 +116,23 @@ map_functions = [
 # =============================================================================
 def prepare_player(player):
     """Prepare the player for battle."""
-    # Perform setting the player's spawn location on another thread
-    move_player_thread = GameThread(target=player.move_to_random_spawn_location)
-    move_player_thread.start()
+    # Move the player to a random spawn location on the next tick
+    spawn_placement_queue.add(player)
 
     # Give armor
     player.give_named_item('item_assaultsuit')
 
     # Give a High Explosive grenade if configured that way
-    if cvar_equip_hegrenade.get_int() > 0:
+    if settings.snapshot.equip_hegrenade > 0:
         player.give_weapon('weapon_hegrenade')
 
     # Enable or disable non-blocking mode, depending on the configuration
-    player.noblock = cvar_enable_noblock.get_int() > 0
+    player.noblock = settings.snapshot.enable_noblock
 
     # Enable damage protection
     player.enable_damage_protection(
         None if admin_menu.is_used_by(player.userid)
-        else cvar_spawn_protection_delay.get_float()
+        else settings.snapshot.spawn_protection_delay
     )
 
     # Equip the current inventory if not currently using the admin menu
@@ -125,28 +140,59 @@ def prepare_player(player):
         player.equip_inventory()
 
 
+def store_silencer_option(player, state):
+    """Store the silencer state of the weapon the player has toggled the silencer of, once the toggle is done."""
+    weapon = player.active_weapon
+
+    # Forget about the toggle if the player has switched weapons in the meantime
+    if weapon is None or weapon.index != state.silencer_weapon_index:
+        state.silencer_weapon_index = 0
+        return
+
+    # Wait for the silencer animation to finish, presses during the animation are ignored by the game
+    if weapon.get_property_float('m_flDoneSwitchingSilencer') > global_vars.current_time:
+        return
+
+    state.silencer_weapon_index = 0
+
+    # Get the player's inventory item for the weapon
+    allowed_weapons = PlayerEntity.get_allowed_weapons(player.index)[1]
+
+    if allowed_weapons is None:
+        return
+
+    inventory_item = allowed_weapons.get(weapon.weapon_name)
+
+    # Set the silencer option for the player's inventory item to the weapon's actual silencer state
+    if inventory_item is not None:
+        inventory_item.silencer_option = weapon.get_property_bool('m_bSilencerOn')
+
+
 # =============================================================================
 # >> PRE EVENTS
 # =============================================================================
 @PreEvent('round_start')
+@profiler
 def on_pre_round_start(game_event):
     """Enable delays right before any players spawn."""
     delay_manager.delays_enabled = True
 
 
 @PreEvent('round_freeze_end')
+@profiler
 def on_pre_round_freeze_end(game_event):
     """Enable damage protection for all players."""
-    delay_time = abs(cvar_spawn_protection_delay.get_float())
+    delay_time = abs(settings.snapshot.spawn_protection_delay)
 
-    for player in PlayerEntity.alive():
-        player.enable_damage_protection(delay_time)
+    for index in player_snapshot.indexes:
+        PlayerEntity(index).enable_damage_protection(delay_time)
 
 
 # =============================================================================
 # >> EVENTS
 # =============================================================================
 @Event('player_spawn')
+@profiler
 def on_player_spawn(game_event):
     """Prepare the player for battle if they are alive and on a team."""
     player = PlayerEntity.from_userid(game_event['userid'])
@@ -156,90 +202,117 @@ def on_player_spawn(game_event):
 
 
 @Event('player_death')
+@profiler
 def on_player_death(game_event):
-    """Handle attacker rewards & respawn the victim."""
-    # Get the attacker's userid
-    userid_attacker = game_event['attacker']
-
-    # Handle attacker rewards, if the attacker's userid is valid
-    if userid_attacker:
-        attacker = PlayerEntity.from_userid(userid_attacker)
-
-        # Handle headshot reward
-        if cvar_refill_clip_on_headshot.get_int() > 0 and game_event['headshot']:
-
-            # Get the weapon's data
-            weapon_data = weapon_manager.by_name(attacker.active_weapon.weapon_name)
-
-            # Refill the weapon's clip
-            attacker.refill_clip(weapon_data)
-
-            # Restore the weapon's ammo
-            attacker.active_weapon.ammo = weapon_data.maxammo
-
-        # Give a High Explosive grenade, if it was a HE grenade kill
-        if cvar_equip_hegrenade.get_int() == 2 and game_event['weapon'] == 'hegrenade':
-            attacker.give_weapon('weapon_hegrenade')
-
-        # Restore the attacker's health if it was a knife kill
-        if cvar_restore_health_on_knife_kill.get_int() > 0 and game_event['weapon'].startswith('knife'):
-            attacker.health = 100
-
+    """Respawn the victim."""
     # Get a PlayerEntity instance for the victim
     victim = PlayerEntity.from_userid(game_event['userid'])
 
-    # Respawn the victim after the configured respawn delay
+    # Queue respawning the victim after the configured respawn delay
     delay_manager(
-        f'respawn_{victim.userid}', abs(cvar_respawn_delay.get_float()), PlayerEntity.respawn, (victim.index, )
+        ('respawn', victim.userid), abs(settings.snapshot.respawn_delay), respawn_queue.add,
+        (victim.userid, victim.index)
     )
 
 
 @Event('player_disconnect')
+@profiler
 def on_player_disconnect(game_event):
     """Cancel all pending delays for the disconnecting player."""
     player = PlayerEntity.from_userid(game_event['userid'])
 
-    delay_manager.cancel(f'respawn_{player.userid}')
-    delay_manager.cancel(f'protect_{player.userid}')
+    delay_manager.cancel(('respawn', player.userid))
+    delay_manager.cancel(('protect', player.userid))
 
-    player.clear_data(keep_inventories=True)
+    respawn_queue.discard(player.userid)
+    spawn_placement_queue.discard(player.userid)
+
+    PlayerEntity.remove_state(player.index)
 
 
 @Event('round_end')
+@profiler
 def on_round_end(game_event):
-    """Cancel all pending delays and team change counts."""
+    """Cancel all pending delays, respawns and team change counts."""
     delay_manager.clear()
+    respawn_queue.clear()
     PlayerEntity.team_changes_store.clear()
 
 
-@Event('hegrenade_detonate')
+# =============================================================================
+# >> CONDITIONAL EVENTS
+# =============================================================================
+@conditional_events(
+    'player_death',
+    lambda snapshot: (
+        snapshot.refill_clip_on_headshot or snapshot.equip_hegrenade == 2 or snapshot.restore_health_on_knife_kill
+    )
+)
+@profiler
+def on_player_death_rewards(game_event):
+    """Handle attacker rewards."""
+    # Get the attacker's userid
+    userid_attacker = game_event['attacker']
+
+    # Skip if the attacker's userid isn't valid
+    if not userid_attacker:
+        return
+
+    attacker = PlayerEntity.from_userid(userid_attacker)
+
+    # Handle headshot reward
+    if settings.snapshot.refill_clip_on_headshot and game_event['headshot']:
+
+        # Get the weapon's data
+        weapon = attacker.active_weapon
+        weapon_data = weapon_manager.by_name(weapon.weapon_name) if weapon is not None else None
+
+        # Skip weapons which aren't listed in the weapon data file, like knives & grenades
+        if weapon_data is not None:
+
+            # Refill the weapon's clip
+            attacker.refill_clip(weapon_data)
+
+            # Restore the weapon's ammo
+            weapon.ammo = weapon_data.maxammo
+
+    # Give a High Explosive grenade, if it was a HE grenade kill
+    if settings.snapshot.equip_hegrenade == 2 and game_event['weapon'] == 'hegrenade':
+        attacker.give_weapon('weapon_hegrenade')
+
+    # Restore the attacker's health if it was a knife kill
+    if settings.snapshot.restore_health_on_knife_kill and game_event['weapon'].startswith('knife'):
+        attacker.health = 100
+
+
+@conditional_events('hegrenade_detonate', lambda snapshot: snapshot.equip_hegrenade == 3)
+@profiler
 def on_hegrenade_detonate(game_event):
-    """Equip the player with another High Explosive grenade if configured that way."""
-    if cvar_equip_hegrenade.get_int() == 3:
-        player = PlayerEntity.from_userid(game_event['userid'])
-        player.give_weapon('weapon_hegrenade')
+    """Equip the player with another High Explosive grenade."""
+    player = PlayerEntity.from_userid(game_event['userid'])
+    player.give_weapon('weapon_hegrenade')
 
 
-@Event('weapon_reload')
+@conditional_events('weapon_reload', lambda snapshot: snapshot.enable_infinite_ammo)
+@profiler
 def on_weapon_reload(game_event):
     """Refill the player's ammo."""
-    if cvar_enable_infinite_ammo.get_int() > 0:
-        player = PlayerEntity.from_userid(game_event['userid'])
-        player.refill_ammo()
+    player = PlayerEntity.from_userid(game_event['userid'])
+    player.refill_ammo()
 
 
-@Event('weapon_fire')
+@conditional_events('weapon_fire', lambda snapshot: snapshot.enable_infinite_ammo)
+@profiler
 def on_weapon_fire_on_empty(game_event):
     """Refill the player's ammo, if the player's active weapon's clip is about to be empty."""
-    if cvar_enable_infinite_ammo.get_int() > 0:
-        player = PlayerEntity.from_userid(game_event['userid'])
+    player = PlayerEntity.from_userid(game_event['userid'])
 
-        # Refill only valid weapons
-        if weapon_manager.by_name(player.active_weapon.weapon_name) is not None:
+    # Refill only valid weapons
+    if weapon_manager.by_name(player.active_weapon.weapon_name) is not None:
 
-            # Refill only if this is the last round
-            if player.active_weapon.clip == 1:
-                player.refill_ammo(1)
+        # Refill only if this is the last round
+        if player.active_weapon.clip == 1:
+            player.refill_ammo(1)
 
 
 # =============================================================================
@@ -247,53 +320,52 @@ def on_weapon_fire_on_empty(game_event):
 # =============================================================================
 @EntityPreHook(EntityCondition.is_human_player, 'bump_weapon')
 @EntityPreHook(EntityCondition.is_bot_player, 'bump_weapon')
+@profiler
 def on_pre_bump_weapon(stack_data):
     """Block bumping into the weapon if it's not in the player's inventory."""
-    # Get a PlayerEntity instance for the player
-    player = make_object(PlayerEntity, stack_data[0])
+    # Get the player's userid and the weapons they are allowed to pick up
+    userid, allowed_weapons = PlayerEntity.get_allowed_weapons(index_from_pointer(stack_data[0]))
 
     # Block the weapon bump if the player is using the admin menu
-    if admin_menu.is_used_by(player.userid):
+    if admin_menu.is_used_by(userid):
         return False
 
     # Get a Weapon instance for the weapon
     weapon = make_object(Weapon, stack_data[1])
 
     # Ignore the knife...
-    if weapon.classname not in ('weapon_knife', 'weapon_hegrenade'):
-
-        # Get the weapon's data
-        weapon_data = weapon_manager.by_name(weapon.weapon_name)
+    if weapon.classname in ignored_weapon_classnames:
+        return
 
-        # Block invalid weapons
-        if weapon_data is None:
-            return False
+    # Get the weapon's data
+    weapon_name = weapon.weapon_name
+    weapon_data = weapon_manager.by_name(weapon_name)
 
-        # Block weapons the player didn't select for their inventory
-        if not player.random_mode:
-            if weapon_data.tag not in player.inventory:
-                return False
+    # Block invalid weapons
+    if weapon_data is None:
+        return False
 
-            inventory_item = player.inventory[weapon_data.tag]
+    # Silence randomly in random mode
+    if allowed_weapons is None:
+        if weapon_data.has_silencer:
+            weapon_manager.set_silencer(weapon, random.randint(0, 1))
 
-            if inventory_item.data.name not in (weapon.weapon_name, weapon.classname):
-                return False
+        return
 
-        # Handle silencing
-        if weapon_data.has_silencer:
+    # Block weapons the player didn't select for their inventory
+    inventory_item = allowed_weapons.get(weapon_name) or allowed_weapons.get(weapon.classname)
 
-            # Silence randomly
-            if player.random_mode:
-                weapon_manager.set_silencer(weapon, random.randint(0, 1))
+    if inventory_item is None:
+        return False
 
-            # Or configured
-            else:
-                inventory_item = player.inventory[weapon_data.tag]
-                weapon_manager.set_silencer(weapon, inventory_item.silencer_option)
+    # Handle silencing as configured
+    if weapon_data.has_silencer:
+        weapon_manager.set_silencer(weapon, inventory_item.silencer_option)
 
 
 @EntityPreHook(EntityCondition.is_human_player, 'drop_weapon')
 @EntityPreHook(EntityCondition.is_bot_player, 'drop_weapon')
+@profiler
 def on_pre_drop_weapon(stack_data):
     """Remove the dropped weapon after one second."""
     # Get the weapon dropped
@@ -302,27 +374,24 @@ def on_pre_drop_weapon(stack_data):
     # Continue only for valid weapons
     if weapon_ptr:
 
-        # Get a Weapon instance for the dropped weapon
-        weapon = make_object(Weapon, weapon_ptr)
-
-        # Remove it after one second
-        delay_manager(
-            f'drop_{weapon.index}', 1, weapon_manager.remove_weapon, (weapon.index, )
-        )
+        # Register it for removal after one second
+        dropped_weapons.add(index_from_pointer(weapon_ptr))
 
 
 # =============================================================================
 # >> LISTENERS
 # =============================================================================
 @OnEntityDeleted
+@profiler
 def on_entity_deleted(base_entity):
-    """Cancel the refill & drop delays for the deleted entity."""
+    """Cancel the refill delay & forget the drop of the deleted entity."""
     if base_entity.classname.startswith(weapon_manager.prefix):
-        delay_manager.cancel(f'drop_{base_entity.index}')
-        delay_manager.cancel(f'refill_clip_{base_entity.index}')
+        dropped_weapons.discard(base_entity.index)
+        delay_manager.cancel(('refill_clip', base_entity.index))
 
 
 @OnEntitySpawned
+@profiler
 def on_entity_spawned(base_entity):
     """Remove forbidden entities when they have spawned."""
     if base_entity.classname in forbidden_entities:
@@ -335,6 +404,7 @@ def on_entity_spawned(base_entity):
 
 
 @OnLevelEnd
+@profiler
 def on_level_end():
     """Clear personal player dictionaries."""
     PlayerEntity.clear_data(keep_inventories=True)
@@ -342,10 +412,36 @@ def on_level_end():
     # Cancel all delays
     delay_manager.clear()
 
+    # Drop pending respawns & spawn placements
+    respawn_queue.clear()
+    spawn_placement_queue.clear()
+
+    # Forget all dropped weapons
+    dropped_weapons.clear()
+
 
 @OnPlayerRunCommand
+@profiler
 def on_player_run_command(player, user_cmd):
     """Store the silencer option when the player attaches or detaches the silencer."""
+    # Get the player's buttons and remember them for the next command
+    state = PlayerEntity.get_state(player.index)
+
+    buttons = user_cmd.buttons
+    previous_buttons, state.buttons = state.buttons, buttons
+
+    # Record changed buttons if a trace is being recorded
+    if recorder.recording and buttons != previous_buttons:
+        recorder.record_buttons(player.index, buttons)
+
+    # Store the silencer option once a toggle started on an earlier command has been processed
+    if state.silencer_weapon_index:
+        store_silencer_option(player, state)
+
+    # Only respect the moment secondary attack gets pressed
+    if not buttons & ~previous_buttons & PlayerButtons.ATTACK2:
+        return
+
     # Ignore dead players
     if player.dead:
         return
@@ -354,10 +450,6 @@ def on_player_run_command(player, user_cmd):
     if player.is_bot():
         return
 
-    # Only respect secondary attack
-    if not user_cmd.buttons & PlayerButtons.ATTACK2:
-        return
-
     # Get the player's active weapon
     weapon = player.active_weapon
 
@@ -366,29 +458,23 @@ def on_player_run_command(player, user_cmd):
         return
 
     # Only respect weapons with silencers
-    if weapon.classname not in (
-        'weapon_m4a1',
-        'weapon_hkp2000' if GAME_NAME == 'csgo' else 'weapon_usp'
-    ):
+    if weapon.classname not in silencer_classnames:
         return
 
-    # Set the silencer option for the player's inventory item
-    inventory_item = PlayerEntity(player.index).inventory_item_by_weapon_name(weapon.weapon_name)
-
-    if inventory_item is not None:
-        inventory_item.silencer_option = weapon.get_property_bool('m_bSilencerOn')
-
-        if GAME_NAME == 'csgo':
-            inventory_item.silencer_option = not inventory_item.silencer_option
+    # Remember the weapon: this command hasn't been processed yet, so its silencer state is read on a later command
+    state.silencer_weapon_index = weapon.index
 
 
 @OnServerActivate
+@profiler
 def on_server_activate(edicts, edict_count, max_clients):
-    """Manipulate integer convars."""
+    """Manipulate integer convars and make room for the states of all players."""
     default_convars.manipulate_values()
+    PlayerEntity.resize_states(max_clients)
 
 
 @OnServerOutput
+@profiler
 def on_server_output(severity, msg):
     """Block server warnings this plugin causes."""
     if 'bot spawned outside of a buy zone' in msg:
@@ -404,8 +490,13 @@ def on_server_output(severity, msg):
 # >> CLIENT COMMAND FILTER
 # =============================================================================
 @ClientCommandFilter
+@profiler
 def client_command_filter(command, index):
     """Handle buy anywhere & spawning in the middle of the round."""
+    # Record the client command if a trace is being recorded
+    if recorder.recording:
+        recorder.record_client_command(index, command)
+
     # Get a PlayerEntity instance for the player
     player = PlayerEntity(index)
 
@@ -438,7 +529,7 @@ def client_command_filter(command, index):
         return True
 
     # Allow the team change, if the player hasn't yet exceeded the maximum team change count
-    if player.team_changes < cvar_team_changes_per_round.get_int() + 1:
+    if player.team_changes < settings.snapshot.team_changes_per_round + 1:
         player.team_changed(team_index)
 
         # Allow the client command
@@ -514,7 +605,7 @@ def on_saycommand_admin(command_info):
     player.strip(not_filters=None)
 
     # Send the Admin menu to the player
-    admin_menu.users.append(player.userid)
+    admin_menu.users.add(player.userid)
     admin_menu.send(command_info.index)
 
     # Block the text from appearing in the chat window
@@ -536,7 +627,7 @@ def load():
     EntityInputDispatcher.perform_action(map_functions, 'Disable')
 
     # Remove forbidden entities after 2 seconds
-    delay_manager(f'remove_forbidden_entities', 2, EntityRemover.perform_action, (forbidden_entities,))
+    delay_manager(('remove_forbidden_entities', ), 2, EntityRemover.perform_action, (forbidden_entities,))
 
     # Restart the game after 3 seconds
     mp_restartgame.set_int(3)
@@ -36,6 +36,25 @@ silencer_entities = (
     'm4a1_silencer' if GAME_NAME == 'csgo' else 'm4a1'
 )
 
+# Store a set of classnames of weapon entities which can be silenced
+silencer_classnames = frozenset((
+    'weapon_hkp2000' if GAME_NAME == 'csgo' else 'weapon_usp',
+    'weapon_m4a1'
+))
+
+
+# =============================================================================
+# >> SHARED CLASSNAME WEAPONS
+# =============================================================================
+# Store a set of weapon names give_named_item() may turn into another weapon, depending on the player's loadout
+shared_classname_weapons = frozenset((
+    'weapon_hkp2000', 'weapon_usp_silencer',
+    'weapon_m4a1', 'weapon_m4a1_silencer',
+    'weapon_p250', 'weapon_fiveseven', 'weapon_tec9', 'weapon_cz75a',
+    'weapon_deagle', 'weapon_revolver',
+    'weapon_mp7', 'weapon_mp5sd'
+) if GAME_NAME == 'csgo' else ())
+
 
 # =============================================================================
 # >> WEAPON DATA
@@ -43,8 +62,13 @@ silencer_entities = (
 class _WeaponData(object):
     """Class used to store weapon data."""
 
-    def __init__(self, basename, weapon_class, display_name, tag):
+    __slots__ = ('_basename', '_clip', '_display_name', '_has_silencer', '_id', '_name', '_maxammo', '_tag')
+
+    def __init__(self, weapon_id, basename, weapon_class, display_name, tag):
         """Object initialization."""
+        # Store the weapon's interned id
+        self._id = weapon_id
+
         # Store the weapon's basename
         self._basename = basename
 
@@ -86,6 +110,11 @@ class _WeaponData(object):
         """Return the weapon's display name."""
         return self._display_name
 
+    @property
+    def id(self):
+        """Return the weapon's interned id, which is never 0."""
+        return self._id
+
     @property
     def maxammo(self):
         """Return the weapon's maxammo property."""
@@ -127,12 +156,37 @@ class WeaponManager(dict):
                 # Get the weapon class from Source.Python's `weapon_manager`
                 weapon_class = sp_weapon_manager[basename.replace('_silenced', '')]
 
-                # Store the `_WeaponData` object at `basename`
-                self[basename] = _WeaponData(basename, weapon_class, display_name, tag)
+                # Store the `_WeaponData` object at `basename`, interning its id from 1 on
+                self[basename] = _WeaponData(len(self) + 1, basename, weapon_class, display_name, tag)
 
         # Store the tags provided by the weapon data file
         self._tags = list(self.ini.keys())
 
+        # Store the slot of each tag in fixed-width inventory records
+        self._tag_slots = {tag: slot for slot, tag in enumerate(self._tags)}
+
+        # Store the order in which the tags get equipped
+        self._equip_order = tuple(sorted(self._tags, reverse=True))
+
+        # Store the `_WeaponData` objects by id, with id 0 meaning no weapon
+        self._by_id = (None, ) + tuple(self.values())
+
+        # Store a lookup of basenames and weapon names, with and without the weapon prefix
+        self._by_name = dict()
+
+        for basename, weapon_data in self.items():
+            self._by_name[basename] = weapon_data
+            self._by_name[f'{self.prefix}{basename}'] = weapon_data
+
+        # Add the full weapon names of Source.Python's weapon classes, unless they are configured basenames
+        for weapon_data in self.values():
+            self._by_name.setdefault(weapon_data.name, weapon_data)
+
+        # Store a tuple of weapon data for each tag
+        self._by_tag = {
+            tag: tuple(weapon_data for weapon_data in self.values() if weapon_data.tag == tag) for tag in self._tags
+        }
+
     @staticmethod
     def set_silencer(weapon, silencer_option):
         """Attach or detach the silencer on the weapon."""
@@ -151,21 +205,34 @@ class WeaponManager(dict):
             if weapon.owner is None:
                 weapon.remove()
 
-    def by_tag(self, tag):
-        """Return all _Weapon instances categorized by `tag`."""
-        for weapon in self.values():
-            if weapon.tag == tag:
-                yield weapon
+    def by_id(self, weapon_id):
+        """Return the `_WeaponData` object for the interned weapon id, or None for id 0."""
+        return self._by_id[weapon_id]
 
-    def by_name(self, name):
-        """Return the `_WeaponData` object for the weapon no matter the weapon prefix."""
-        basename = name.replace(sp_weapon_manager.prefix, '')
+    def get_tag(self, weapon):
+        """Return the weapon data file tag of the weapon entity, or None if it has none."""
+        weapon_data = self.by_name(weapon.weapon_name)
 
-        if basename in self.keys():
-            return self[basename]
+        if weapon_data is not None:
+            return weapon_data.tag
+
+        # Fall back to Source.Python's tags for weapons which are not listed in the weapon data file
+        weapon_tags = sp_weapon_manager[weapon.classname].tags
+
+        for tag in self._tags:
+            if tag in weapon_tags:
+                return tag
 
         return None
 
+    def by_tag(self, tag):
+        """Return a tuple of all `_WeaponData` objects categorized by `tag`."""
+        return self._by_tag.get(tag, ())
+
+    def by_name(self, name):
+        """Return the `_WeaponData` object for the weapon no matter the weapon prefix."""
+        return self._by_name.get(name)
+
     @property
     def prefix(self):
         """Return the weapon prefix."""
@@ -176,6 +243,16 @@ class WeaponManager(dict):
         """Return the tags provided by the weapon data file."""
         return self._tags
 
+    @property
+    def tag_slots(self):
+        """Return a dictionary of tags and their slots in inventory records."""
+        return self._tag_slots
+
+    @property
+    def equip_order(self):
+        """Return a tuple of tags in the order they get equipped."""
+        return self._equip_order
+
 
 # Store a global instance of `WeaponManager`
 weapon_manager = WeaponManager()
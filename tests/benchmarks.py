@@ -0,0 +1,540 @@
+# ../tests/benchmarks.py
+
+"""Benchmarks the plugin's hot paths and data structures on the Source.Python stand-ins.
+
+Usage: python tests/benchmarks.py [--only NAME ...] [--repeat 5] [--json FILE] [--compare FILE] [--threshold 0.1]
+
+Each benchmark reports the fastest time one operation takes over several runs, in nanoseconds. Results written with
+--json on one commit can be passed to --compare on another, which flags the results that got slower by more than the
+threshold and exits with status 1 if there are any.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Argparse
+import argparse
+#   Collections
+from collections import Counter
+#   Contextlib
+import contextlib
+#   JSON
+import json
+#   Platform
+import platform
+#   Random
+import random
+#   Subprocess
+import subprocess
+#   Sys
+import sys
+#   Threading
+import threading
+#   Time
+from time import perf_counter_ns
+#   Timeit
+import timeit
+
+# Site-Package Imports
+#   NumPy
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Test Imports
+#   Conftest
+import conftest
+
+# Stand-In Imports
+#   Engine
+import _engine
+#   Engines
+from engines.server import global_vars
+#   Listeners
+from listeners import on_player_run_command_listener_manager
+#   Mathlib
+from mathlib import QAngle
+from mathlib import Vector
+#   Players
+from players import UserCmd
+from players.constants import PlayerButtons
+from players.entity import Player
+#   Plugins
+from plugins.manager import plugin_manager
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Player counts spawn selection is measured at
+SPAWN_PLAYER_COUNTS = (16, 32, 64, 128)
+
+# Spawn location counts spawn selection is measured at
+SPAWN_LOCATION_COUNTS = (50, 150, 500)
+
+# Half the width of the square the random spawn locations are spread over, about the size of de_dust2
+SPAWN_EXTENT = 2_500.0
+
+# Amount of players connected for the run command and spawn benchmarks
+SERVER_PLAYERS = 64
+
+# Amount of delays scheduled for each key family in the delay churn benchmark
+DELAY_CHURN_KEYS = 64
+
+# Relative slowdown above which a result is flagged as a regression by default
+REGRESSION_THRESHOLD = 0.1
+
+# Audit event name prefixes counted as I/O
+IO_EVENT_PREFIXES = ('open', 'os.', 'shutil.', 'socket.', 'sqlite3.')
+
+# Store the registered benchmarks by name
+BENCHMARKS = dict()
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+def benchmark(function):
+    """Register `function` as a benchmark, which yields (case, nanoseconds per operation, details) tuples."""
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+def measure(function, repeat, operations=1):
+    """Return the fastest time (in nanoseconds) one of the `operations` performed by a call of `function` takes."""
+    timer = timeit.Timer(function)
+    number = timer.autorange()[0]
+
+    return min(timer.repeat(repeat, number)) / number / operations * 1_000_000_000
+
+
+@contextlib.contextmanager
+def loaded_plugin(players=0):
+    """Load the plugin on an empty server, start a round with `players` spawned players and yield the plugin."""
+    random.seed(0)
+
+    _engine.reset()
+    plugin = plugin_manager.load('udm')
+    _engine.activate_server(max(players, 64))
+    _engine.use_virtual_time(sys.modules['udm.delays'], sys.modules['udm.drops'])
+
+    try:
+        _engine.fire_event('round_start')
+        _engine.fire_event('round_freeze_end')
+
+        for number in range(players):
+            _engine.spawn_player(_engine.connect_player(is_bot=number % 2 == 0, team=2 + number % 2))
+
+        # Let the players get equipped
+        for _ in range(64):
+            _engine.tick()
+
+        yield plugin
+
+    finally:
+        plugin_manager.unload('udm')
+        _engine.reset()
+
+
+class _GameThreadIo(object):
+    """Class used to count the file, socket & database accesses made on the game thread while counting."""
+
+    def __init__(self):
+        """Object initialization."""
+        # Store the audit events counted by name
+        self.events = dict()
+
+        # Remember whether accesses are being counted
+        self.counting = False
+
+        # Remember whether the audit hook has been added, as audit hooks can't be removed
+        self._hooked = False
+
+    def __enter__(self):
+        """Start counting the accesses made on the game thread."""
+        if not self._hooked:
+            sys.addaudithook(self._audit)
+            self._hooked = True
+
+        self.events.clear()
+        self.counting = True
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop counting."""
+        self.counting = False
+
+    @property
+    def count(self):
+        """Return the amount of accesses counted."""
+        return sum(self.events.values())
+
+    def _audit(self, event, args):
+        """Count the audit event if it is an access made on the game thread."""
+        if (
+            self.counting and event.startswith(IO_EVENT_PREFIXES) and
+            threading.current_thread() is threading.main_thread()
+        ):
+            self.events[event] = self.events.get(event, 0) + 1
+
+
+# Store a global instance of `_GameThreadIo`
+game_thread_io = _GameThreadIo()
+
+
+def python_unsafe_indexes(manager, origins):
+    """Return the unsafe spawn location indexes by comparing every spawn location with every origin.
+
+    This is how spawn locations were checked before the lookup indexes existed.
+    """
+    spawn_distance = sys.modules['udm.spawn_locations'].SAFE_SPAWN_DISTANCE
+    vectors = [Vector(x, y, z) for x, y, z in origins]
+
+    return {
+        index for index, spawn_location in enumerate(list(manager))
+        if any(spawn_location.get_distance(vector) < spawn_distance for vector in vectors)
+    }
+
+
+# =============================================================================
+# >> BENCHMARKS
+# =============================================================================
+@benchmark
+def spawn_selection(repeat):
+    """Measure finding a safe spawn location with the pure-Python loop, the grid and NumPy."""
+    with loaded_plugin():
+        spawn_locations = sys.modules['udm.spawn_locations']
+        rng = random.Random(0)
+
+        methods = {
+            'python': python_unsafe_indexes,
+            'grid': spawn_locations.SpawnLocationManager._get_unsafe_indexes_grid
+        }
+
+        if spawn_locations.numpy is not None:
+            methods['numpy'] = spawn_locations.SpawnLocationManager._get_unsafe_indexes_vectorized
+
+        for spawns in SPAWN_LOCATION_COUNTS:
+            manager = spawn_locations.SpawnLocationManager()
+            manager.extend(
+                spawn_locations.SpawnLocation(
+                    rng.uniform(-SPAWN_EXTENT, SPAWN_EXTENT), rng.uniform(-SPAWN_EXTENT, SPAWN_EXTENT),
+                    rng.uniform(-100, 100), QAngle()
+                ) for _ in range(spawns)
+            )
+
+            for players in SPAWN_PLAYER_COUNTS:
+
+                # Place the other players near spawn locations, as they have spawned there
+                origins = [
+                    (
+                        spawn_location.x + rng.uniform(-200, 200), spawn_location.y + rng.uniform(-200, 200),
+                        spawn_location.z
+                    ) for spawn_location in rng.choices(manager, k=players - 1)
+                ]
+
+                cursor = spawn_locations.SpawnLocationCursor(len(manager))
+
+                for method_name, method in methods.items():
+                    ns = measure(lambda: cursor.take(method(manager, origins)), repeat)
+                    yield f'{method_name}/{spawns}_spawns/{players}_players', ns, {}
+
+
+@benchmark
+def spawn_location_files(repeat):
+    """Measure loading every shipped spawn location file from JSON and from its binary cache, and saving it."""
+    with loaded_plugin():
+        spawn_locations = sys.modules['udm.spawn_locations']
+        manager = spawn_locations.SpawnLocationManager()
+        map_name = global_vars.map_name
+
+        def load_json():
+            """Load the spawn locations the way they were loaded before the binary cache existed."""
+            with manager.json_file.open() as f:
+                contents = json.load(f)
+
+            manager.clear()
+            manager.extend(
+                spawn_locations.SpawnLocation(*data['vector'], QAngle(*data['angle'])) for data in contents
+            )
+
+        def load_cache():
+            """Load the spawn locations from the binary cache."""
+            manager.clear()
+            manager.load()
+
+        def save():
+            """Save the spawn locations and wait for the writer thread to write them."""
+            manager.save()
+            spawn_locations.spawn_location_writer._unload_instance()
+
+        json_files = sorted(manager.path.files('*.json'))
+        totals = {'load_json': 0, 'load_cache': 0, 'save': 0}
+        records = 0
+
+        try:
+            for json_file in json_files:
+                global_vars.map_name = json_file.stem
+
+                # Compile the cache up front
+                manager.compile(json_file, manager.cache_file)
+
+                totals['load_json'] += measure(load_json, repeat)
+                totals['load_cache'] += measure(load_cache, repeat)
+                records += len(manager)
+
+                # Save last, as saving outdates the cache
+                totals['save'] += measure(save, repeat)
+
+        finally:
+            global_vars.map_name = map_name
+
+        for name, total in totals.items():
+            yield f'{name}/all_maps', total, {'maps': len(json_files), 'spawn_locations': records}
+
+
+@benchmark
+def weapon_lookups(repeat):
+    """Measure looking up weapons by basename, prefixed basename and full weapon name, and by tag."""
+    with loaded_plugin():
+        weapon_manager = sys.modules['udm.weapons'].weapon_manager
+
+        weapons = weapon_manager.values()
+
+        names = {
+            'basename': [weapon_data.basename for weapon_data in weapons],
+            'prefixed': [f'{weapon_manager.prefix}{weapon_data.basename}' for weapon_data in weapons],
+            'full_name': [weapon_data.name for weapon_data in weapons]
+        }
+
+        for case, case_names in names.items():
+            ns = measure(lambda: [weapon_manager.by_name(name) for name in case_names], repeat, len(case_names))
+            yield f'by_name/{case}', ns, {'lookups_per_second': round(1_000_000_000 / ns)}
+
+        tags = weapon_manager.tags
+        ns = measure(lambda: [weapon_manager.by_tag(tag) for tag in tags], repeat, len(tags))
+        yield 'by_tag', ns, {'lookups_per_second': round(1_000_000_000 / ns)}
+
+
+@benchmark
+def run_command(repeat):
+    """Measure the cost of one tick of run commands from 64 players, holding buttons and pressing secondary attack."""
+    with loaded_plugin(SERVER_PLAYERS):
+        players = [Player(index) for index in range(1, SERVER_PLAYERS + 1)]
+        user_cmd = UserCmd()
+        notify = on_player_run_command_listener_manager.notify
+
+        def run_tick(buttons):
+            """Notify the listeners of a command with `buttons` for every player."""
+            user_cmd.buttons = buttons
+
+            for player in players:
+                notify(player, user_cmd)
+
+        held = PlayerButtons.FORWARD | PlayerButtons.ATTACK
+        yield 'held_buttons', measure(lambda: run_tick(held), repeat), {'players': SERVER_PLAYERS}
+
+        # Press and release secondary attack on alternating ticks
+        def toggle_attack2():
+            """Run a tick with secondary attack pressed and one with it released."""
+            run_tick(held | PlayerButtons.ATTACK2)
+            run_tick(held)
+
+        yield 'attack2_presses', measure(toggle_attack2, repeat, 2), {'players': SERVER_PLAYERS}
+
+
+@benchmark
+def spawn_io(repeat):
+    """Measure spawning 64 newly connected players and count the I/O done on the game thread meanwhile."""
+    with loaded_plugin():
+        durations = list()
+        events = Counter()
+
+        for _ in range(repeat):
+            indexes = [
+                _engine.connect_player(is_bot=number % 2 == 0, team=2 + number % 2) for number in range(SERVER_PLAYERS)
+            ]
+
+            with game_thread_io:
+                start = perf_counter_ns()
+
+                for index in indexes:
+                    _engine.spawn_player(index)
+
+                durations.append((perf_counter_ns() - start) / len(indexes))
+
+            events.update(game_thread_io.events)
+
+            # Make room for the next players
+            for index in indexes:
+                _engine.disconnect_player(index)
+
+        yield 'first_spawn', min(durations), {'game_thread_io': dict(events)}
+
+
+@benchmark
+def inventory_keys(repeat):
+    """Measure listing the tags of full, partly filled and empty inventories."""
+    with loaded_plugin():
+        inventories = sys.modules['udm.inventories']
+        weapon_manager = sys.modules['udm.weapons'].weapon_manager
+
+        full = inventories.Inventory()
+        partial = inventories.Inventory()
+
+        for tag in weapon_manager.tags:
+            weapon_data = weapon_manager.by_tag(tag)[0]
+            full.add_inventory_item(weapon_data.basename, weapon_data)
+
+        weapon_data = weapon_manager.by_tag(weapon_manager.tags[0])[0]
+        partial.add_inventory_item(weapon_data.basename, weapon_data)
+
+        for case, inventory in (('full', full), ('partial', partial), ('empty', inventories.Inventory())):
+            yield case, measure(lambda: list(inventory.keys()), repeat), {'weapons': len(inventory)}
+
+
+@benchmark
+def random_weapons(repeat):
+    """Measure refilling a player's random weapons for every tag, and getting them while they are filled."""
+    with loaded_plugin(2):
+        player = sys.modules['udm.players'].PlayerEntity(1)
+        weapon_lists = player.state.random_weapons.values()
+
+        def refill():
+            """Empty the player's random weapon lists and let them be refilled."""
+            for weapon_list in weapon_lists:
+                weapon_list.clear()
+
+            return player.random_weapons
+
+        yield 'refill', measure(refill, repeat), {'tags': len(weapon_lists)}
+        yield 'filled', measure(lambda: player.random_weapons, repeat), {'tags': len(weapon_lists)}
+
+
+@benchmark
+def delay_churn(repeat):
+    """Measure scheduling, rescheduling and cancelling delays, and ticks while delays are pending."""
+    with loaded_plugin():
+        delay_manager = sys.modules['udm.delays']._DelayManager()
+        keys = [('respawn', userid) for userid in range(DELAY_CHURN_KEYS)]
+
+        def schedule():
+            """Schedule a delay for every key, replacing pending ones."""
+            for key in keys:
+                delay_manager(key, 2, int)
+
+        def churn():
+            """Schedule, reschedule and cancel a delay for every key."""
+            schedule()
+            schedule()
+
+            for key in keys:
+                delay_manager.cancel(key)
+
+        yield 'schedule_reschedule_cancel', measure(churn, repeat, 3 * len(keys)), {'keys': len(keys)}
+
+        schedule()
+        yield 'tick_pending', measure(delay_manager.tick, repeat), {'pending': len(delay_manager)}
+
+        delay_manager.clear()
+
+
+# =============================================================================
+# >> MAIN
+# =============================================================================
+def run(names, repeat):
+    """Run the benchmarks and return a dictionary of their results by name."""
+    results = dict()
+
+    for name in names:
+        for case, ns, details in BENCHMARKS[name](repeat):
+            results[f'{name}/{case}'] = dict(ns=ns, **details)
+
+            print(f'{name}/{case}: {ns:,.0f}ns{"" if not details else f" {details}"}')
+
+    return results
+
+
+def get_environment():
+    """Return the commit and the Python & NumPy versions the benchmarks run on."""
+    commit = None
+
+    with contextlib.suppress(OSError, subprocess.CalledProcessError):
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=conftest.TESTS_PATH, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': numpy.__version__ if numpy is not None else None
+    }
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print the results which changed by more than `threshold` against the baseline and return the regressions."""
+    regressions = list()
+    unchanged = 0
+
+    for name, result in results.items():
+        previous = baseline.get(name)
+
+        # Skip results which are new
+        if previous is None:
+            continue
+
+        ratio = result['ns'] / previous['ns']
+
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            label = 'REGRESSION'
+
+        elif ratio < 1 / (1 + threshold):
+            label = 'improvement'
+
+        else:
+            unchanged += 1
+            continue
+
+        print(f'{label}: {name}: {previous["ns"]:,.0f}ns -> {result["ns"]:,.0f}ns ({ratio - 1:+.0%})')
+
+    print(f'{unchanged} results within {threshold:.0%} of the baseline, {len(regressions)} regressions')
+    return regressions
+
+
+def main(argv=None):
+    """Run the selected benchmarks, store their results and compare them with a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement, the fastest run counts')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='compare the results with those in this file, written by --json')
+    parser.add_argument(
+        '--threshold', type=float, default=REGRESSION_THRESHOLD, help='relative slowdown flagged as a regression'
+    )
+    arguments = parser.parse_args(argv)
+
+    # Read the baseline first, so a baseline which can't be read doesn't waste a run
+    baseline = None
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as f:
+            baseline = json.load(f)
+
+    results = run(arguments.only, arguments.repeat)
+
+    if arguments.json is not None:
+        with open(arguments.json, 'w') as f:
+            json.dump(dict(get_environment(), repeat=arguments.repeat, results=results), f, indent=4)
+
+    if baseline is None:
+        return 0
+
+    print(f'Compared with {arguments.compare} (commit {baseline["commit"]}):')
+    return 1 if compare(results, baseline['results'], arguments.threshold) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# ../tests/conftest.py
+
+"""Makes the Source.Python stand-ins and the plugin importable and provides the shared fixtures."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Os
+import os
+#   Sys
+import sys
+
+
+# =============================================================================
+# >> PATHS
+# =============================================================================
+# Store the tests path
+TESTS_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# Store the plugins path
+PLUGINS_PATH = os.path.join(os.path.dirname(TESTS_PATH), 'addons', 'source-python', 'plugins')
+
+# Put the stand-ins and the plugins on the import path
+sys.path[:0] = [os.path.join(TESTS_PATH, 'stubs'), PLUGINS_PATH]
+
+# Site-Package Imports
+#   Pytest
+import pytest
+
+# Stand-In Imports
+#   Engine
+import _engine
+#   Hooks
+from hooks.exceptions import except_hooks
+#   Plugins
+from plugins.manager import plugin_manager
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture(scope='session')
+def plugin():
+    """Load the plugin once, with delays and dropped weapons following the simulated clock."""
+    module = plugin_manager.load('udm')
+    _engine.use_virtual_time(sys.modules['udm.delays'], sys.modules['udm.drops'])
+
+    yield module
+
+    plugin_manager.unload('udm')
+
+
+@pytest.fixture(autouse=True)
+def printed_exceptions():
+    """Fail tests during which callbacks have raised exceptions, which Source.Python only prints."""
+    except_hooks.exceptions.clear()
+
+    yield except_hooks.exceptions
+
+    assert not except_hooks.exceptions
+
+
+@pytest.fixture
+def engine(plugin):
+    """Start a round on an empty server and end the map afterwards, which resets the plugin's per-map state."""
+    _engine.reset()
+    _engine.activate_server(64)
+    _engine.fire_event('round_start')
+
+    yield _engine
+
+    for index in [data.index for data in world.players()]:
+        _engine.disconnect_player(index)
+
+    _engine.change_level(_engine.global_vars.map_name)
+    _engine.reset()
+
+    # Forget the inventories stored during the test, as the next one reuses the players' uniqueids
+    inventory_store = sys.modules['udm.inventories'].inventory_store
+    inventory_store._unload_instance()
+    inventory_store.clear()
+    inventory_store.database_file.remove_p()
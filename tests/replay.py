@@ -0,0 +1,261 @@
+# ../tests/replay.py
+
+"""Replays a trace recorded with udm_record through the plugin on the Source.Python stand-ins.
+
+Usage: python tests/replay.py TRACE_FILE [--map MAP_NAME] [--max-clients 64] [--seed 0] [--json FILE]
+
+Records are applied on the tick they have been recorded on. On every tick each connected player sends a run command
+with the buttons last recorded for them, as players do on a game server. Players are connected on the first event
+about them, commands & buttons from players who haven't appeared in an event yet are skipped. Spawns, deaths and
+disconnects the plugin has already caused during the replay are not applied again, and weapons are fired & reloaded
+through the stand-in engine, so the events match the replayed players' weapons.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Argparse
+import argparse
+#   JSON
+import json
+#   Os
+import os
+#   Random
+import random
+#   Sys
+import sys
+#   Time
+from time import perf_counter_ns
+
+# Test Imports
+#   Simulator
+from simulator import percentile
+
+# Stand-In Imports
+#   Engine
+import _engine
+#   Engines
+from engines.server import global_vars
+#   Hooks
+from hooks.exceptions import except_hooks
+#   Plugins
+from plugins.manager import plugin_manager
+#   World
+from _world import world
+
+# Script Imports
+#   Recorder
+from udm.recorder import read_trace
+from udm.recorder import RECORD_CLIENT_COMMAND
+from udm.recorder import RECORD_EVENT
+
+
+# =============================================================================
+# >> REPLAY
+# =============================================================================
+class Replay(object):
+    """Class used to apply trace records to the stand-in engine and time the calls into the plugin."""
+
+    def __init__(self):
+        """Object initialization."""
+        # Store the buttons last recorded for each connected player by index
+        self.buttons = dict()
+
+        # Store the time spent in calls into the plugin since the last tick, and on each tick
+        self.tick_cost = 0
+        self.tick_costs = list()
+
+        # Store the amount of records applied & skipped
+        self.records = 0
+        self.skipped = 0
+
+        # Remember whether the tick count has been set to the one of the first record
+        self._started = False
+
+    def call(self, function, *args, **kwargs):
+        """Call the engine function and add its duration to the cost of the current tick."""
+        start = perf_counter_ns()
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.tick_cost += perf_counter_ns() - start
+
+    def step(self):
+        """Send every alive player's run command and run the tick."""
+        for index, buttons in self.buttons.items():
+            if not world.entities[index].dead:
+                self.call(_engine.run_command, index, buttons)
+
+        self.call(_engine.tick)
+
+        self.tick_costs.append(self.tick_cost)
+        self.tick_cost = 0
+
+    def advance(self, tick_count):
+        """Run ticks until the tick count reaches `tick_count`."""
+        # Start at the first record's tick count, and restart at a lower one, as the tick count restarts on map change
+        if not self._started or tick_count < global_vars.tick_count:
+            global_vars.tick_count = tick_count
+            self._started = True
+
+        while global_vars.tick_count < tick_count:
+            self.step()
+
+    def apply(self, record):
+        """Apply the trace record."""
+        self.records += 1
+
+        if record.kind == RECORD_EVENT:
+            self.apply_event(record.index, *record.data)
+
+        # Skip commands & buttons of players who haven't been connected
+        elif record.index not in self.buttons:
+            self.skipped += 1
+
+        elif record.kind == RECORD_CLIENT_COMMAND:
+            self.call(_engine.client_command, record.index, record.data)
+
+        else:
+            self.buttons[record.index] = record.data
+
+    def apply_event(self, index, event_name, variables):
+        """Apply the game event, connecting the player it is about if necessary."""
+        userid = variables.get('userid', 0)
+
+        # Fire events which are not about a player
+        if not userid:
+            self.call(_engine.fire_event, event_name, **variables)
+            return
+
+        if index and world.userids.get(userid) != index:
+            self.connect(index, userid, variables.get('teamnum', 2 + userid % 2))
+
+        index = world.userids.get(userid)
+
+        # Skip events about players who have never been connected
+        if index is None:
+            self.skipped += 1
+            return
+
+        data = world.entities[index]
+
+        if event_name == 'player_spawn':
+            if data.dead:
+                self.call(_engine.spawn_player, index)
+
+        elif event_name == 'player_death':
+            if not data.dead:
+                self.call(
+                    _engine.kill_player, index, world.userids.get(variables.get('attacker')),
+                    bool(variables.get('headshot'))
+                )
+
+        # Let the player's active weapon fire or reload, as the replay's weapons may differ from the recorded ones
+        elif event_name == 'weapon_fire':
+            if not data.dead:
+                self.call(_engine.fire_weapon, index)
+
+        elif event_name == 'weapon_reload':
+            if not data.dead:
+                self.call(_engine.reload_weapon, index)
+
+        elif event_name == 'player_disconnect':
+            self.call(_engine.disconnect_player, index)
+            del self.buttons[index]
+
+        else:
+            self.call(_engine.fire_event, event_name, **variables)
+
+    def connect(self, index, userid, team):
+        """Connect the player to the slot, replacing a player left behind in it."""
+        if index in self.buttons:
+            self.call(_engine.disconnect_player, index)
+
+        self.call(_engine.connect_player, index=index, userid=userid, team=team)
+        self.buttons[index] = 0
+
+
+def replay(trace_file):
+    """Replay the trace file through the loaded plugin and return the measurements."""
+    replay = Replay()
+    exceptions = len(except_hooks.exceptions)
+    start = perf_counter_ns()
+
+    for record in read_trace(trace_file):
+        replay.advance(record.tick_count)
+        replay.apply(record)
+
+    # Run the tick following the last records
+    replay.step()
+
+    duration = perf_counter_ns() - start
+    costs = replay.tick_costs
+
+    return {
+        'records': replay.records,
+        'skipped': replay.skipped,
+        'exceptions': len(except_hooks.exceptions) - exceptions,
+        'ticks': len(costs),
+        'duration_ms': duration / 1_000_000,
+        'tick_cost_us': {
+            'mean': sum(costs) / len(costs) / 1_000,
+            'p50': percentile(costs, 0.5) / 1_000,
+            'p99': percentile(costs, 0.99) / 1_000,
+            'max': max(costs) / 1_000
+        }
+    }
+
+
+# =============================================================================
+# >> MAIN
+# =============================================================================
+def main(argv=None):
+    """Load the plugin, replay the trace file and print or store the measurements."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('trace_file')
+    parser.add_argument('--map', help='map the trace has been recorded on, taken from the trace file name by default')
+    parser.add_argument('--max-clients', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='write the measurements to this file')
+    arguments = parser.parse_args(argv)
+
+    # Trace files are named after the map and the time recording has been started
+    map_name = arguments.map or os.path.basename(arguments.trace_file).rsplit('_', 2)[0]
+
+    # Seed the plugin's random choices, so replays are reproducible
+    random.seed(arguments.seed)
+
+    _engine.reset()
+    global_vars.map_name = map_name
+
+    plugin_manager.load('udm')
+    _engine.activate_server(arguments.max_clients)
+
+    # Let delays and dropped weapons follow the replayed ticks
+    _engine.use_virtual_time(sys.modules['udm.delays'], sys.modules['udm.drops'])
+
+    try:
+        result = replay(arguments.trace_file)
+    finally:
+        plugin_manager.unload('udm')
+
+    cost = result['tick_cost_us']
+
+    print(
+        f'{result["records"]} records ({result["skipped"]} skipped) over {result["ticks"]} ticks on {map_name} '
+        f'in {result["duration_ms"]:.0f}ms, {result["exceptions"]} exceptions'
+    )
+    print(
+        f'  Per tick: mean {cost["mean"]:.1f}us, p50 {cost["p50"]:.1f}us, p99 {cost["p99"]:.1f}us, '
+        f'max {cost["max"]:.1f}us'
+    )
+
+    if arguments.json is not None:
+        with open(arguments.json, 'w') as f:
+            json.dump(result, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+# ../tests/simulator.py
+
+"""Drives synthetic players through spawn, fire, reload, death & respawn cycles on the Source.Python stand-ins.
+
+Usage: python tests/simulator.py [--players 16 32 64 128] [--seconds 60] [--seed 0] [--json FILE]
+
+The simulated clock advances one tick per loop, so a minute of game time takes as long as the plugin needs.
+For each player count the per-tick cost of all calls into the plugin, the memory it allocates and the delays it
+schedules are reported.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Argparse
+import argparse
+#   JSON
+import json
+#   Random
+import random
+#   Sys
+import sys
+#   Time
+from time import perf_counter_ns
+#   Tracemalloc
+import tracemalloc
+
+# Test Imports
+#   Conftest
+import conftest
+
+# Stand-In Imports
+#   Engine
+import _engine
+#   Engines
+from engines.server import global_vars
+#   Hooks
+from hooks.exceptions import except_hooks
+#   Players
+from players.constants import PlayerButtons
+from players.entity import Player
+#   Plugins
+from plugins.manager import plugin_manager
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Player counts to simulate by default
+DEFAULT_PLAYER_COUNTS = (16, 32, 64, 128)
+
+# Simulated seconds before measuring, so all players have spawned and picked their weapons
+WARMUP_SECONDS = 5
+
+# Chance of each alive player to die on a tick, about once every 8 seconds at 64 ticks per second
+DEATH_CHANCE = 1 / (64 * 8)
+
+# Chance of each alive player to shoot on a tick
+FIRE_CHANCE = 1 / 8
+
+# Chance of each alive human player to press secondary attack on a tick
+ATTACK2_CHANCE = 1 / 256
+
+# Chance of each alive player to buy a weapon on a tick
+BUY_CHANCE = 1 / (64 * 30)
+
+# Chance of each alive player to drop their weapon on a tick
+DROP_CHANCE = 1 / (64 * 20)
+
+# Units a player moves per tick at most along each axis
+MOVE_DISTANCE = 4.0
+
+# Fraction of bots among the players
+BOT_FRACTION = 0.5
+
+
+# =============================================================================
+# >> SIMULATION
+# =============================================================================
+class Simulation(object):
+    """Class used to load the plugin, connect the players and advance the simulated game tick by tick."""
+
+    def __init__(self, players, seed=0, map_name='de_dust2'):
+        """Load the plugin and connect and spawn `players` synthetic players."""
+        self.random = random.Random(seed)
+
+        # Seed the plugin's random choices as well
+        random.seed(seed)
+
+        _engine.reset()
+        global_vars.map_name = map_name
+
+        self.plugin = plugin_manager.load('udm')
+        _engine.activate_server(max(players, 64))
+
+        # Let delays and dropped weapons follow the simulated clock
+        _engine.use_virtual_time(sys.modules['udm.delays'], sys.modules['udm.drops'])
+
+        # Store the weapon basenames players may buy
+        weapon_manager = sys.modules['udm.weapons'].weapon_manager
+        self.basenames = sorted(weapon_manager)
+
+        # Store the time spent in calls into the plugin on the current tick
+        self.tick_cost = 0
+
+        # Store the amount of players killed
+        self.deaths = 0
+
+        # Connect the players to both teams
+        self.indexes = list()
+
+        for number in range(players):
+            index = _engine.connect_player(is_bot=number < players * BOT_FRACTION, team=2 + number % 2)
+            self.indexes.append(index)
+
+        self.call(_engine.fire_event, 'round_start')
+        self.call(_engine.fire_event, 'round_freeze_end')
+
+        for index in self.indexes:
+            self.call(_engine.spawn_player, index)
+
+    def call(self, function, *args):
+        """Call the engine function and add its duration to the cost of the current tick."""
+        start = perf_counter_ns()
+
+        try:
+            return function(*args)
+        finally:
+            self.tick_cost += perf_counter_ns() - start
+
+    def step(self):
+        """Simulate the players' commands for one tick and run the tick, returning the time spent in the plugin."""
+        self.tick_cost = 0
+        chance = self.random.random
+
+        alive = [index for index in self.indexes if not world.entities[index].dead]
+
+        for index in alive:
+            data = world.entities[index]
+
+            # Move around
+            origin = data.origin
+            origin.x += self.random.uniform(-MOVE_DISTANCE, MOVE_DISTANCE)
+            origin.y += self.random.uniform(-MOVE_DISTANCE, MOVE_DISTANCE)
+
+            # Shoot, reload on an empty clip and attach or detach silencers
+            buttons = PlayerButtons.FORWARD
+
+            if chance() < FIRE_CHANCE:
+                buttons |= PlayerButtons.ATTACK
+
+            if not data.is_bot and chance() < ATTACK2_CHANCE:
+                buttons |= PlayerButtons.ATTACK2
+
+            self.call(_engine.run_command, index, buttons)
+
+            if buttons & PlayerButtons.ATTACK:
+                self.call(_engine.fire_weapon, index)
+
+                weapon = Player(index).active_weapon
+
+                if weapon is not None and weapon.clip == 0:
+                    self.call(_engine.reload_weapon, index)
+
+            # Buy and drop weapons now and then
+            if chance() < BUY_CHANCE:
+                self.call(_engine.client_command, index, f'buy {self.random.choice(self.basenames)}')
+
+            if chance() < DROP_CHANCE:
+                self.call(_engine.client_command, index, 'drop')
+                self.call(_engine.drop_weapon, index)
+
+        # Let players die by the hands of an enemy
+        for index in alive:
+            data = world.entities[index]
+
+            if data.dead or chance() >= DEATH_CHANCE:
+                continue
+
+            enemies = [
+                enemy for enemy in alive
+                if world.entities[enemy].team != data.team and not world.entities[enemy].dead
+            ]
+
+            self.call(
+                _engine.kill_player, index, self.random.choice(enemies) if enemies else None, chance() < 0.3
+            )
+            self.deaths += 1
+
+        self.call(_engine.tick)
+        return self.tick_cost
+
+    def run(self, ticks):
+        """Simulate `ticks` ticks and return the time spent in the plugin on each of them."""
+        return [self.step() for _ in range(ticks)]
+
+    def unload(self):
+        """Unload the plugin, which waits for its background threads."""
+        plugin_manager.unload('udm')
+
+
+# =============================================================================
+# >> REPORT
+# =============================================================================
+def percentile(values, fraction):
+    """Return the value at `fraction` of the sorted values."""
+    values = sorted(values)
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+def simulate(players, seconds, seed=0):
+    """Simulate `seconds` of game time with `players` players and return the measurements."""
+    tick_rate = round(1 / global_vars.interval_per_tick)
+    ticks = seconds * tick_rate
+
+    # Measure the per-tick cost without tracing allocations, as tracing slows down every allocation
+    simulation = Simulation(players, seed)
+
+    try:
+        simulation.run(WARMUP_SECONDS * tick_rate)
+        simulation.deaths = 0
+
+        statistics = simulation.plugin.delay_manager.statistics
+        statistics.reset()
+
+        except_hooks.exceptions.clear()
+
+        costs = simulation.run(ticks)
+
+        delays = {
+            str(family): {
+                'scheduled': family_statistics.scheduled,
+                'fired': family_statistics.fired,
+                'cancelled': family_statistics.cancelled
+            } for family, family_statistics in sorted(statistics.items(), key=lambda item: str(item[0]))
+        }
+
+        pending = len(simulation.plugin.delay_manager)
+        deaths = simulation.deaths
+        exceptions = len(except_hooks.exceptions)
+
+    finally:
+        simulation.unload()
+
+    # Trace the allocations of the same workload
+    simulation = Simulation(players, seed)
+
+    try:
+        simulation.run(WARMUP_SECONDS * tick_rate)
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+
+        simulation.run(ticks)
+
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    finally:
+        simulation.unload()
+
+    # Only count the plugin's allocations
+    plugin_filter = [tracemalloc.Filter(True, f'{conftest.PLUGINS_PATH}/*')]
+    differences = after.filter_traces(plugin_filter).compare_to(before.filter_traces(plugin_filter), 'lineno')
+
+    return {
+        'players': players,
+        'ticks': ticks,
+        'deaths': deaths,
+        'exceptions': exceptions,
+        'tick_cost_us': {
+            'mean': sum(costs) / len(costs) / 1_000,
+            'p50': percentile(costs, 0.5) / 1_000,
+            'p99': percentile(costs, 0.99) / 1_000,
+            'max': max(costs) / 1_000
+        },
+        'allocations': {
+            'blocks': sum(difference.count_diff for difference in differences if difference.count_diff > 0),
+            'retained_bytes': sum(difference.size_diff for difference in differences),
+            'peak_bytes': peak,
+            'top': [
+                {'line': str(difference.traceback[0]), 'bytes': difference.size_diff, 'blocks': difference.count_diff}
+                for difference in differences[:5]
+            ]
+        },
+        'delays': {
+            'pending': pending,
+            'families': delays
+        }
+    }
+
+
+def print_report(result):
+    """Print the measurements of one simulation."""
+    cost = result['tick_cost_us']
+    allocations = result['allocations']
+
+    print(
+        f'{result["players"]} players, {result["ticks"]} ticks, {result["deaths"]} deaths, '
+        f'{result["exceptions"]} exceptions'
+    )
+    print(
+        f'  Per tick: mean {cost["mean"]:.1f}us, p50 {cost["p50"]:.1f}us, p99 {cost["p99"]:.1f}us, '
+        f'max {cost["max"]:.1f}us'
+    )
+    print(
+        f'  Allocations: {allocations["blocks"]} blocks still allocated, {allocations["retained_bytes"]} bytes '
+        f'retained, {allocations["peak_bytes"]} bytes peak'
+    )
+
+    for top in allocations['top']:
+        print(f'    {top["line"]}: {top["bytes"]} bytes in {top["blocks"]} blocks')
+
+    print(f'  Delays: {result["delays"]["pending"]} pending')
+
+    for family, counts in result['delays']['families'].items():
+        print(
+            f'    {family}: {counts["scheduled"]} scheduled, {counts["fired"]} fired, '
+            f'{counts["cancelled"]} cancelled'
+        )
+
+
+# =============================================================================
+# >> MAIN
+# =============================================================================
+def main(argv=None):
+    """Simulate each player count and print or store the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, nargs='+', default=DEFAULT_PLAYER_COUNTS)
+    parser.add_argument('--seconds', type=int, default=60, help='simulated seconds to measure per player count')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='write the results to this file')
+    arguments = parser.parse_args(argv)
+
+    results = list()
+
+    for players in arguments.players:
+        result = simulate(players, arguments.seconds, arguments.seed)
+        results.append(result)
+        print_report(result)
+
+    if arguments.json is not None:
+        with open(arguments.json, 'w') as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
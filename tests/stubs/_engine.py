@@ -0,0 +1,243 @@
+# ../tests/stubs/_engine.py
+
+"""Provides the engine side of the stand-ins: connecting players, firing events, running commands and ticks.
+
+Tests, the simulator and the replay drive the plugin through these functions, which call the plugin's callbacks the
+way the game server calls them.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Colors
+from colors import WHITE
+#   Commands
+from commands import Command
+from commands.client import filter_client_command
+#   Engines
+from engines.server import global_vars
+#   Entities
+from entities.hooks import call_pre_hooks
+#   Events
+from events import GameEvent
+from events.manager import event_registry
+#   Listeners
+from listeners import on_level_end_listener_manager
+from listeners import on_level_init_listener_manager
+from listeners import on_player_run_command_listener_manager
+from listeners import on_server_activate_listener_manager
+from listeners import on_tick_listener_manager
+#   Mathlib
+from mathlib import QAngle
+from mathlib import Vector
+#   Memory
+from memory import Pointer
+#   Players
+from players import UserCmd
+from players.constants import PlayerButtons
+from players.entity import Player
+#   Weapons
+from weapons.manager import weapon_manager
+#   World
+from _world import virtual_time
+from _world import world
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Store the names of the weapons whose silencer can be toggled
+SILENCER_WEAPON_NAMES = frozenset(('weapon_usp_silencer', 'weapon_m4a1_silencer', 'weapon_usp', 'weapon_m4a1'))
+
+# Time (in seconds) attaching or detaching a silencer takes
+SILENCER_SWITCH_TIME = 0.5
+
+
+# =============================================================================
+# >> SERVER
+# =============================================================================
+def reset():
+    """Forget all entities & players and restart the clock."""
+    world.reset()
+    world.time = 0.0
+
+    global_vars.tick_count = 0
+
+
+def activate_server(max_clients=None):
+    """Notify the `OnServerActivate` listeners."""
+    if max_clients is not None:
+        world.max_clients = max_clients
+        world.next_index = max(world.next_index, max_clients + 1)
+
+    on_server_activate_listener_manager.notify(None, 0, world.max_clients)
+
+
+def change_level(map_name):
+    """End the current map and start `map_name`, restarting the tick count."""
+    on_level_end_listener_manager.notify()
+
+    # Remove all non-player entities and the players' weapons
+    for index in [index for index, data in world.entities.items() if data.classname != 'player']:
+        world.remove_entity(index)
+
+    global_vars.map_name = map_name
+    global_vars.tick_count = 0
+
+    on_level_init_listener_manager.notify(map_name)
+
+
+def tick():
+    """Advance the clock by one tick and notify the `OnTick` listeners."""
+    global_vars.tick_count += 1
+    world.time += global_vars.interval_per_tick
+
+    on_tick_listener_manager.notify()
+
+
+def fire_event(event_name, **variables):
+    """Fire the game event."""
+    event_registry.fire(GameEvent(event_name, **variables))
+
+
+# =============================================================================
+# >> PLAYERS
+# =============================================================================
+def connect_player(name=None, is_bot=False, team=2, index=None, userid=None):
+    """Connect a dead player to the slot at `index` or the first free slot and return their index."""
+    if index is None:
+        index = next(
+            (index for index in range(1, world.max_clients + 1) if index not in world.entities), None
+        )
+
+    if index is None or index in world.entities:
+        raise ValueError('All player slots are taken.' if index is None else f'Slot {index} is taken.')
+
+    if userid is None:
+        userid = world.next_userid
+
+    world.next_userid = max(world.next_userid, userid + 1)
+
+    return world.create_player(
+        index, userid, uniqueid='BOT' if is_bot else f'STEAM_1:0:{userid}', name=name or f'Player {userid}',
+        is_bot=is_bot, dead=True, team=team, health=0, armor=0, origin=Vector(), view_angle=QAngle(), godmode=False,
+        color=WHITE, noblock=False, weapons=list(), active_weapon=None, last_weapon=None, commands=list(), buttons=0
+    )
+
+
+def disconnect_player(index):
+    """Fire `player_disconnect` and remove the player and their weapons."""
+    data = world.entities[index]
+
+    fire_event('player_disconnect', userid=data.userid)
+
+    for weapon in tuple(Player(index).weapons()):
+        weapon.remove()
+
+    world.remove_entity(index)
+
+
+def spawn_player(index):
+    """Spawn the player, which fires `player_spawn`."""
+    Player(index).spawn(True)
+
+
+def kill_player(index, attacker_index=None, headshot=False):
+    """Kill the player with the attacker's active weapon, removing the victim's weapons, and fire `player_death`."""
+    player = Player(index)
+    player.dead = True
+    player.health = 0
+
+    for weapon in tuple(player.weapons()):
+        weapon.remove()
+
+    attacker = Player(attacker_index) if attacker_index is not None else None
+    weapon = attacker.active_weapon if attacker is not None else None
+
+    fire_event(
+        'player_death', userid=player.userid, attacker=attacker.userid if attacker is not None else 0,
+        headshot=headshot, weapon=weapon_manager[weapon.weapon_name].basename if weapon is not None else 'world'
+    )
+
+
+def drop_weapon(index):
+    """Drop the player's active weapon, unless a `drop_weapon` pre-hook blocks it."""
+    player = Player(index)
+    weapon = player.active_weapon
+
+    if weapon is None or call_pre_hooks('drop_weapon', [Pointer(index), Pointer(weapon.index)]) is False:
+        return
+
+    data = world.entities[index]
+    data.weapons.remove(weapon.index)
+    data.active_weapon = data.weapons[-1] if data.weapons else None
+
+    world.entities[weapon.index].owner = None
+
+
+def bump_weapon(index, weapon_index):
+    """Let the player pick up the weapon, unless a `bump_weapon` pre-hook blocks it, and return whether they did."""
+    if call_pre_hooks('bump_weapon', [Pointer(index), Pointer(weapon_index)]) is False:
+        return False
+
+    world.entities[weapon_index].owner = index
+    world.entities[index].weapons.append(weapon_index)
+    return True
+
+
+def fire_weapon(index):
+    """Fire the player's active weapon, which fires `weapon_fire`."""
+    weapon = Player(index).active_weapon
+
+    if weapon is None:
+        return
+
+    fire_event('weapon_fire', userid=world.entities[index].userid, weapon=weapon.weapon_name)
+
+    if weapon.clip > 0:
+        weapon.clip -= 1
+
+
+def reload_weapon(index):
+    """Reload the player's active weapon, which fires `weapon_reload`, unless it has no clip like knives."""
+    weapon = Player(index).active_weapon
+
+    if weapon is None or weapon_manager[weapon.weapon_name].clip <= 0:
+        return
+
+    fire_event('weapon_reload', userid=world.entities[index].userid)
+    weapon.clip = weapon_manager[weapon.weapon_name].clip
+
+
+def client_command(index, command_string):
+    """Pass the client command through the client command filters and return whether it is allowed."""
+    return filter_client_command(Command(command_string), index)
+
+
+def run_command(index, buttons):
+    """Notify the `OnPlayerRunCommand` listeners and process the command's silencer toggle."""
+    player = Player(index)
+    previous_buttons, player.buttons = player.buttons, buttons
+
+    on_player_run_command_listener_manager.notify(player, UserCmd(buttons))
+
+    # Toggle the silencer on the press of secondary attack, which takes effect once the animation is done
+    weapon = player.active_weapon
+
+    if (
+        buttons & ~previous_buttons & PlayerButtons.ATTACK2 and not player.dead and weapon is not None and
+        weapon.weapon_name in SILENCER_WEAPON_NAMES and
+        weapon.get_property_float('m_flDoneSwitchingSilencer') <= world.time
+    ):
+        weapon.set_property_bool('m_bSilencerOn', not weapon.get_property_bool('m_bSilencerOn'))
+        weapon.set_property_float('m_flDoneSwitchingSilencer', world.time + SILENCER_SWITCH_TIME)
+
+
+# =============================================================================
+# >> VIRTUAL TIME
+# =============================================================================
+def use_virtual_time(*modules):
+    """Let the modules' `time.monotonic()` follow the simulated ticks rather than the wall clock."""
+    for module in modules:
+        module.time = virtual_time
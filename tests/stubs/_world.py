@@ -0,0 +1,125 @@
+# ../tests/stubs/_world.py
+
+"""Stores the simulated server state shared by the Source.Python stand-ins."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Time
+import time
+
+
+# =============================================================================
+# >> ENTITY DATA
+# =============================================================================
+class EntityData(object):
+    """Class used to store the state of one simulated entity, shared by all wrappers of its index."""
+
+    def __init__(self, index, classname, **attributes):
+        """Object initialization."""
+        self.index = index
+        self.classname = classname
+
+        # Store the networked properties set through get/set_property_*
+        self.properties = dict()
+
+        # Store the inputs which have been called on the entity
+        self.inputs = list()
+
+        # Store any further attributes (origin, owner, clip, ...)
+        self.__dict__.update(attributes)
+
+
+# =============================================================================
+# >> WORLD
+# =============================================================================
+class World(object):
+    """Class used to store all simulated entities, players and the simulated clock."""
+
+    def __init__(self):
+        """Object initialization."""
+        # Store the amount of player slots
+        self.max_clients = 64
+
+        # Store the entities by index
+        self.entities = dict()
+
+        # Store the player indexes by userid
+        self.userids = dict()
+
+        # Store the next userid & the next non-player entity index
+        self.next_userid = 2
+        self.next_index = self.max_clients + 1
+
+        # Store the simulated time (in seconds) which `VirtualTime` reports
+        self.time = 0.0
+
+    def reset(self):
+        """Forget all entities and players."""
+        self.entities.clear()
+        self.userids.clear()
+        self.next_userid = 2
+        self.next_index = self.max_clients + 1
+
+    def create_entity(self, classname, **attributes):
+        """Add a non-player entity and return its index."""
+        index = self.next_index
+        self.next_index += 1
+
+        self.entities[index] = EntityData(index, classname, **attributes)
+        return index
+
+    def create_player(self, index, userid, **attributes):
+        """Add a player entity at `index` and return its index."""
+        self.entities[index] = EntityData(index, 'player', userid=userid, **attributes)
+        self.userids[userid] = index
+        return index
+
+    def remove_entity(self, index):
+        """Remove the entity and detach it from its owner."""
+        data = self.entities.pop(index, None)
+
+        if data is None:
+            return None
+
+        owner = self.entities.get(getattr(data, 'owner', None))
+
+        if owner is not None:
+            owner.weapons.remove(index)
+
+            if owner.active_weapon == index:
+                owner.active_weapon = owner.weapons[-1] if owner.weapons else None
+
+        if getattr(data, 'userid', None) is not None:
+            del self.userids[data.userid]
+
+        return data
+
+    def players(self):
+        """Return the data of all player entities."""
+        return [data for data in self.entities.values() if data.classname == 'player']
+
+
+# Store a global instance of `World`
+world = World()
+
+
+# =============================================================================
+# >> VIRTUAL TIME
+# =============================================================================
+class VirtualTime(object):
+    """Class used to replace a module's `time` import, so its clock follows the simulated ticks."""
+
+    @staticmethod
+    def monotonic():
+        """Return the simulated time."""
+        return world.time
+
+    def __getattr__(self, name):
+        """Return all other functions of the `time` module."""
+        return getattr(time, name)
+
+
+# Store a global instance of `VirtualTime`
+virtual_time = VirtualTime()
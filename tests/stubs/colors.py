@@ -0,0 +1,26 @@
+# ../tests/stubs/colors.py
+
+"""Stand-in for Source.Python's colors module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Typing
+from typing import NamedTuple
+
+
+# =============================================================================
+# >> COLOR
+# =============================================================================
+class Color(NamedTuple):
+    """Class used to store an RGBA color."""
+
+    r: int = 0
+    g: int = 0
+    b: int = 0
+    a: int = 255
+
+
+# Store the colors in use
+WHITE = Color(255, 255, 255)
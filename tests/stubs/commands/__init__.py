@@ -0,0 +1,27 @@
+# ../tests/stubs/commands/__init__.py
+
+"""Stand-in for Source.Python's commands module."""
+
+# =============================================================================
+# >> COMMAND
+# =============================================================================
+class Command(object):
+    """Class used to store the arguments of an entered command."""
+
+    def __init__(self, command_string):
+        """Object initialization."""
+        self.command_string = command_string
+        self._arguments = command_string.split()
+
+    def __getitem__(self, index):
+        """Return the argument at `index`, the command name being at index 0."""
+        return self._arguments[index]
+
+    def __len__(self):
+        """Return the amount of arguments including the command name."""
+        return len(self._arguments)
+
+    @property
+    def arg_string(self):
+        """Return the arguments following the command name."""
+        return self.command_string.partition(' ')[2]
@@ -0,0 +1,33 @@
+# ../tests/stubs/commands/client.py
+
+"""Stand-in for Source.Python's commands.client module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Listeners
+from listeners import ListenerManager
+from listeners import ListenerManagerDecorator
+
+
+# =============================================================================
+# >> CLIENT COMMAND FILTER
+# =============================================================================
+# Store the client command filters
+client_command_filter_manager = ListenerManager()
+
+
+class ClientCommandFilter(ListenerManagerDecorator):
+    """Register a callback for all client commands."""
+
+    manager = client_command_filter_manager
+
+
+def filter_client_command(command, index):
+    """Return False if any client command filter blocks the command."""
+    for callback in tuple(client_command_filter_manager):
+        if callback(command, index) is False:
+            return False
+
+    return True
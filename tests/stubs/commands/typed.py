@@ -0,0 +1,75 @@
+# ../tests/stubs/commands/typed.py
+
+"""Stand-in for Source.Python's commands.typed module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Core
+from core import AutoUnload
+
+
+# =============================================================================
+# >> COMMAND INFO
+# =============================================================================
+class CommandInfo(object):
+    """Class used to store who has entered a command."""
+
+    def __init__(self, command_string, index=None):
+        """Object initialization."""
+        self.command_string = command_string
+        self.index = index
+
+
+# =============================================================================
+# >> TYPED COMMANDS
+# =============================================================================
+class _TypedCommand(AutoUnload):
+    """Class used to register a callback for the command words."""
+
+    # Store the callbacks by command words
+    commands = None
+
+    def __init__(self, commands, permission=None):
+        """Object initialization."""
+        self.words = (commands, ) if isinstance(commands, str) else tuple(commands)
+        self.permission = permission
+        self.callback = None
+
+    def __call__(self, callback):
+        """Register the callback."""
+        if self.words in self.commands:
+            raise ValueError(f'Command "{" ".join(self.words)}" already registered.')
+
+        self.callback = self.commands[self.words] = callback
+        return self
+
+    def _unload_instance(self):
+        """Unregister the callback on unload."""
+        self.commands.pop(self.words, None)
+
+    @classmethod
+    def execute(cls, command_string, index=None):
+        """Call the callback of the longest registered command words the command string starts with."""
+        words = command_string.split()
+
+        for length in range(len(words), 0, -1):
+            callback = cls.commands.get(tuple(words[:length]))
+
+            if callback is not None:
+                return callback(CommandInfo(command_string, index), *words[length:])
+
+        raise KeyError(command_string)
+
+
+class TypedServerCommand(_TypedCommand):
+    """Register a callback for a server command."""
+
+    commands = dict()
+
+
+class TypedSayCommand(_TypedCommand):
+    """Register a callback for a say command."""
+
+    commands = dict()
@@ -0,0 +1,52 @@
+# ../tests/stubs/config/manager.py
+
+"""Stand-in for Source.Python's config.manager module, which registers cvars without writing a .cfg file."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Cvars
+from cvars import ConVar
+from cvars import cvar
+
+
+# =============================================================================
+# >> CONFIG MANAGER
+# =============================================================================
+class _CvarManager(ConVar):
+    """Class used to store a plugin's cvar and the lines describing its options."""
+
+    def __init__(self, name, default, description):
+        """Object initialization."""
+        super().__init__(name, default, description)
+
+        # Store the lines describing the options
+        self.Options = list()
+
+
+class ConfigManager(object):
+    """Class used to register the cvars of a configuration file."""
+
+    def __init__(self, filepath, cvar_prefix=''):
+        """Object initialization."""
+        self.filepath = filepath
+        self.cvar_prefix = cvar_prefix
+
+        # Store the text lines of the configuration file
+        self.lines = list()
+
+    def __enter__(self):
+        """Return the config manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Don't write the configuration file."""
+
+    def text(self, text):
+        """Add a text line."""
+        self.lines.append(text)
+
+    def cvar(self, name, default=0, description=''):
+        """Register and return the cvar, keeping its value if it has been registered before."""
+        return cvar.register(_CvarManager(f'{self.cvar_prefix}{name}', default, description))
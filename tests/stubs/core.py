@@ -0,0 +1,47 @@
+# ../tests/stubs/core.py
+
+"""Stand-in for Source.Python's core module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Enum
+from enum import IntEnum
+#   Os
+import os
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Store the simulated game
+GAME_NAME = os.environ.get('UDM_GAME_NAME', 'csgo')
+
+# Store every line printed to the server console
+console_output = list()
+
+
+class OutputReturn(IntEnum):
+    """Return values of `OnServerOutput` listeners."""
+
+    BLOCK = 0
+    CONTINUE = 1
+
+
+# =============================================================================
+# >> AUTO UNLOAD
+# =============================================================================
+class AutoUnload(object):
+    """Class used to mark objects which get cleaned up when their plugin is unloaded."""
+
+    def _unload_instance(self):
+        """Clean up the object on unload."""
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def echo_console(text):
+    """Store the text as server console output."""
+    console_output.append(text)
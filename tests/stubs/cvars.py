@@ -0,0 +1,110 @@
+# ../tests/stubs/cvars.py
+
+"""Stand-in for Source.Python's cvars module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Listeners
+from listeners import on_convar_changed_listener_manager
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Store the game's convars the plugin manipulates, with their default values
+GAME_CONVARS = {
+    'mp_buytime': 20,
+    'mp_startmoney': 800,
+    'mp_buy_anywhere': 0,
+    'mp_solid_teammates': 1,
+    'mp_respawn_on_death_t': 0,
+    'mp_respawn_on_death_ct': 0,
+    'mp_randomspawn': 0,
+    'mp_randomspawn_los': 1,
+    'mp_buy_during_immunity': 0,
+    'mp_respawn_immunitytime': 4,
+    'sv_infinite_ammo': 0,
+    'mp_friendlyfire': 0,
+    'mp_freezetime': 15,
+    'mp_dm_bonus_length_max': 30,
+    'mp_dm_bonus_length_min': 30,
+    'mp_dm_time_between_bonus_max': 40,
+    'mp_dm_time_between_bonus_min': 30,
+    'mp_do_warmup_period': 1,
+    'mp_restartgame': 0,
+}
+
+
+# =============================================================================
+# >> CONVAR
+# =============================================================================
+class ConVar(object):
+    """Class used to store the value of a console variable as a string."""
+
+    def __init__(self, name, value='0', description=''):
+        """Object initialization."""
+        self.name = name
+        self.description = description
+        self._value = str(value)
+
+    def get_string(self):
+        """Return the value as a string."""
+        return self._value
+
+    def get_float(self):
+        """Return the value as a float."""
+        try:
+            return float(self._value)
+        except ValueError:
+            return 0.0
+
+    def get_int(self):
+        """Return the value as an integer."""
+        return int(self.get_float())
+
+    def get_bool(self):
+        """Return the value as a boolean."""
+        return self.get_int() != 0
+
+    def set_string(self, value):
+        """Set the value and notify the `OnConVarChanged` listeners if it has changed."""
+        old_value, self._value = self._value, str(value)
+
+        if old_value != self._value:
+            on_convar_changed_listener_manager.notify(self, old_value)
+
+    def set_float(self, value):
+        """Set the value from a float."""
+        self.set_string(value)
+
+    def set_int(self, value):
+        """Set the value from an integer."""
+        self.set_string(int(value))
+
+    def set_bool(self, value):
+        """Set the value from a boolean."""
+        self.set_string(int(bool(value)))
+
+
+# =============================================================================
+# >> CVAR
+# =============================================================================
+class _Cvar(dict):
+    """Class used to store all console variables by name."""
+
+    def find_var(self, name):
+        """Return the console variable, or None if it doesn't exist."""
+        return self.get(name)
+
+    def register(self, convar):
+        """Add the console variable, or return the existing one with the same name."""
+        return self.setdefault(convar.name, convar)
+
+
+# Store a global instance of `_Cvar`
+cvar = _Cvar()
+
+for _name, _value in GAME_CONVARS.items():
+    cvar.register(ConVar(_name, _value))
@@ -0,0 +1,42 @@
+# ../tests/stubs/engines/server.py
+
+"""Stand-in for Source.Python's engines.server module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Os
+import os
+
+# Stand-In Imports
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> GLOBAL VARS
+# =============================================================================
+class _GlobalVars(object):
+    """Class used to store the engine's global variables."""
+
+    def __init__(self):
+        """Object initialization."""
+        self.tick_count = 0
+        self.frame_count = 0
+        self.interval_per_tick = 1 / 64
+        self.map_name = os.environ.get('UDM_MAP_NAME', 'de_dust2')
+
+    @property
+    def max_clients(self):
+        """Return the amount of player slots."""
+        return world.max_clients
+
+    @property
+    def current_time(self):
+        """Return the simulated time."""
+        return world.time
+
+
+# Store a global instance of `_GlobalVars`
+global_vars = _GlobalVars()
@@ -0,0 +1,109 @@
+# ../tests/stubs/entities/entity.py
+
+"""Stand-in for Source.Python's entities.entity module.
+
+Wrappers are created per call like Source.Python's, all wrappers of an index share the state stored in the world.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Listeners
+from listeners import on_entity_deleted_listener_manager
+#   Memory
+from memory import Pointer
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> BASE ENTITY
+# =============================================================================
+class BaseEntity(object):
+    """Class used to wrap the state of the entity at `index`."""
+
+    def __init__(self, index):
+        """Object initialization."""
+        data = world.entities.get(index)
+
+        if data is None:
+            raise ValueError(f'Conversion from "Index" ({index}) to "BaseEntity" failed.')
+
+        object.__setattr__(self, '_data', data)
+
+    def __getattr__(self, name):
+        """Return the attribute from the shared state."""
+        try:
+            return getattr(object.__getattribute__(self, '_data'), name)
+        except AttributeError:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}') from None
+
+    def __setattr__(self, name, value):
+        """Set properties on the wrapper and everything else on the shared state."""
+        if hasattr(type(self), name):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._data, name, value)
+
+    def __eq__(self, other):
+        """Return whether both wrap the same entity."""
+        return isinstance(other, BaseEntity) and other.index == self.index
+
+    def __hash__(self):
+        """Return the hash of the index."""
+        return hash(self.index)
+
+    @property
+    def index(self):
+        """Return the entity's index."""
+        return self._data.index
+
+    @property
+    def pointer(self):
+        """Return a pointer to the entity."""
+        return Pointer(self._data.index)
+
+    def remove(self):
+        """Remove the entity and notify the `OnEntityDeleted` listeners."""
+        data = world.remove_entity(self.index)
+
+        if data is not None:
+            on_entity_deleted_listener_manager.notify(BaseEntity.__new__(BaseEntity)._wrap(data))
+
+    def _wrap(self, data):
+        """Wrap `data`, which needn't be in the world anymore, and return the wrapper."""
+        object.__setattr__(self, '_data', data)
+        return self
+
+    def call_input(self, name, *args):
+        """Store the input call."""
+        self._data.inputs.append((name, args))
+
+    def get_property_bool(self, name):
+        """Return the networked property as a boolean."""
+        return bool(self._data.properties.get(name, False))
+
+    def get_property_float(self, name):
+        """Return the networked property as a float."""
+        return float(self._data.properties.get(name, 0.0))
+
+    def get_property_int(self, name):
+        """Return the networked property as an integer."""
+        return int(self._data.properties.get(name, 0))
+
+    def set_property_bool(self, name, value):
+        """Set the networked property."""
+        self._data.properties[name] = bool(value)
+
+    def set_property_float(self, name, value):
+        """Set the networked property."""
+        self._data.properties[name] = float(value)
+
+    def set_property_int(self, name, value):
+        """Set the networked property."""
+        self._data.properties[name] = int(value)
+
+
+class Entity(BaseEntity):
+    """Class used to wrap any entity."""
@@ -0,0 +1,13 @@
+# ../tests/stubs/entities/helpers.py
+
+"""Stand-in for Source.Python's entities.helpers module."""
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def index_from_pointer(pointer):
+    """Return the index of the entity the pointer points to."""
+    if not pointer:
+        raise ValueError('Conversion from "Pointer" to "Index" failed.')
+
+    return pointer.index
@@ -0,0 +1,81 @@
+# ../tests/stubs/entities/hooks.py
+
+"""Stand-in for Source.Python's entities.hooks module.
+
+`call_pre_hooks` stands in for the engine calling a hooked entity function.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Core
+from core import AutoUnload
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> ENTITY CONDITION
+# =============================================================================
+class EntityCondition(object):
+    """Class used to store the conditions an entity has to meet to get its functions hooked."""
+
+    @staticmethod
+    def is_player(entity):
+        """Return whether the entity is a player."""
+        return entity.classname == 'player'
+
+    @staticmethod
+    def is_bot_player(entity):
+        """Return whether the entity is a bot."""
+        return entity.classname == 'player' and entity.is_bot
+
+    @staticmethod
+    def is_human_player(entity):
+        """Return whether the entity is a human player."""
+        return entity.classname == 'player' and not entity.is_bot
+
+
+# =============================================================================
+# >> ENTITY PRE HOOK
+# =============================================================================
+# Store the (condition, callback) pairs by hooked function name
+entity_pre_hooks = dict()
+
+
+class EntityPreHook(AutoUnload):
+    """Class used to register a callback which is called before the entity function."""
+
+    def __init__(self, condition, function):
+        """Object initialization."""
+        self.condition = condition
+        self.function = function
+        self.callback = None
+
+    def __call__(self, callback):
+        """Register the callback."""
+        self.callback = callback
+        entity_pre_hooks.setdefault(self.function, list()).append((self.condition, callback))
+        return callback
+
+    def _unload_instance(self):
+        """Unregister the callback on unload."""
+        entity_pre_hooks[self.function].remove((self.condition, self.callback))
+
+
+def call_pre_hooks(function, stack_data):
+    """Call the pre-hooks for `function` of the entity `stack_data[0]` points to, return False if one blocks it."""
+    entity = world.entities[stack_data[0].index]
+    result = None
+
+    for condition, callback in tuple(entity_pre_hooks.get(function, ())):
+        if not condition(entity):
+            continue
+
+        return_value = callback(stack_data)
+
+        if return_value is not None and result is None:
+            result = return_value
+
+    return result
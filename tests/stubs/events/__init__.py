@@ -0,0 +1,74 @@
+# ../tests/stubs/events/__init__.py
+
+"""Stand-in for Source.Python's events module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Core
+from core import AutoUnload
+#   Events
+from events.manager import event_registry
+
+
+# =============================================================================
+# >> GAME EVENT
+# =============================================================================
+class _KeyValues(dict):
+    """Class used to store the variables of a game event."""
+
+    def as_dict(self):
+        """Return the variables as a dictionary."""
+        return dict(self)
+
+
+class GameEvent(object):
+    """Class used to store the name and variables of a fired game event."""
+
+    def __init__(self, name, **variables):
+        """Object initialization."""
+        self.name = name
+        self.variables = _KeyValues(variables)
+
+    def __getitem__(self, key):
+        """Return the variable, or 0 if it isn't set, as the engine does."""
+        return self.variables.get(key, 0)
+
+    def get_int(self, key, default=0):
+        """Return the variable as an integer."""
+        return int(self.variables.get(key, default))
+
+    def get_bool(self, key, default=False):
+        """Return the variable as a boolean."""
+        return bool(self.variables.get(key, default))
+
+    def get_string(self, key, default=''):
+        """Return the variable as a string."""
+        return str(self.variables.get(key, default))
+
+
+# =============================================================================
+# >> EVENT DECORATOR
+# =============================================================================
+class Event(AutoUnload):
+    """Class used to register a callback for game events."""
+
+    def __init__(self, *event_names):
+        """Object initialization."""
+        self.event_names = event_names
+        self.callback = None
+
+    def __call__(self, callback):
+        """Register the callback for all event names."""
+        self.callback = callback
+
+        for event_name in self.event_names:
+            event_registry.register_for_event(event_name, callback)
+
+        return self
+
+    def _unload_instance(self):
+        """Unregister the callback on unload."""
+        for event_name in self.event_names:
+            event_registry.unregister_for_event(event_name, self.callback)
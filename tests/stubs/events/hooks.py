@@ -0,0 +1,36 @@
+# ../tests/stubs/events/hooks.py
+
+"""Stand-in for Source.Python's events.hooks module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Events
+from events import Event
+from events.manager import _EventRegistry
+
+
+# =============================================================================
+# >> PRE EVENT
+# =============================================================================
+# Store the pre-event callbacks by event name
+pre_event_registry = _EventRegistry()
+
+
+class PreEvent(Event):
+    """Class used to register a callback which is called before the game event's callbacks."""
+
+    def __call__(self, callback):
+        """Register the callback for all event names."""
+        self.callback = callback
+
+        for event_name in self.event_names:
+            pre_event_registry.register_for_event(event_name, callback)
+
+        return self
+
+    def _unload_instance(self):
+        """Unregister the callback on unload."""
+        for event_name in self.event_names:
+            pre_event_registry.unregister_for_event(event_name, self.callback)
@@ -0,0 +1,54 @@
+# ../tests/stubs/events/manager.py
+
+"""Stand-in for Source.Python's events.manager module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Hooks
+from hooks.exceptions import except_hooks
+
+# =============================================================================
+# >> EVENT REGISTRY
+# =============================================================================
+class _EventRegistry(dict):
+    """Class used to store the callbacks of each game event by event name."""
+
+    def register_for_event(self, event_name, callback):
+        """Register the callback for the game event."""
+        callbacks = self.setdefault(event_name, list())
+
+        if callback in callbacks:
+            raise ValueError(f'Event "{event_name}" already registered to callback "{callback}".')
+
+        callbacks.append(callback)
+
+    def unregister_for_event(self, event_name, callback):
+        """Unregister the callback from the game event."""
+        callbacks = self.get(event_name, ())
+
+        if callback not in callbacks:
+            raise ValueError(f'Event "{event_name}" is not registered to callback "{callback}".')
+
+        callbacks.remove(callback)
+
+    def fire(self, game_event):
+        """Call the pre-event callbacks and, unless one of them blocks the event, the event callbacks."""
+        # Avoid a circular import
+        from events.hooks import pre_event_registry
+
+        for callback in tuple(pre_event_registry.get(game_event.name, ())):
+            if callback(game_event) is False:
+                return
+
+        # Print the exceptions of event callbacks rather than raising them, as Source.Python does
+        for callback in tuple(self.get(game_event.name, ())):
+            try:
+                callback(game_event)
+            except Exception:
+                except_hooks.print_exception()
+
+
+# Store a global instance of `_EventRegistry`
+event_registry = _EventRegistry()
@@ -0,0 +1,3 @@
+# ../tests/stubs/filters/__init__.py
+
+"""Stand-in for Source.Python's filters package."""
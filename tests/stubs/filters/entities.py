@@ -0,0 +1,22 @@
+# ../tests/stubs/filters/entities.py
+
+"""Stand-in for Source.Python's filters.entities module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Entities
+from entities.entity import Entity
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> ENTITY ITER
+# =============================================================================
+def EntityIter(classname=None):
+    """Yield an `Entity` for each entity, or each entity of `classname`."""
+    for index, data in tuple(world.entities.items()):
+        if classname is None or data.classname == classname:
+            yield Entity(index)
@@ -0,0 +1,37 @@
+# ../tests/stubs/filters/players.py
+
+"""Stand-in for Source.Python's filters.players module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Players
+from players.entity import Player
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> PLAYER ITER
+# =============================================================================
+# Store the filter functions by name
+_FILTERS = {
+    'all': lambda data: True,
+    'alive': lambda data: not data.dead,
+    'dead': lambda data: data.dead,
+    'bot': lambda data: data.is_bot,
+    'human': lambda data: not data.is_bot,
+    't': lambda data: data.team == 2,
+    'ct': lambda data: data.team == 3,
+}
+
+
+def PlayerIter(is_filters=(), not_filters=()):
+    """Yield a `Player` for each player matching all `is_filters` and none of the `not_filters`."""
+    is_filters = (is_filters, ) if isinstance(is_filters, str) else is_filters
+    not_filters = (not_filters, ) if isinstance(not_filters, str) else not_filters
+
+    for data in world.players():
+        if all(_FILTERS[name](data) for name in is_filters) and not any(_FILTERS[name](data) for name in not_filters):
+            yield Player(data.index)
@@ -0,0 +1,23 @@
+# ../tests/stubs/filters/weapons.py
+
+"""Stand-in for Source.Python's filters.weapons module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Weapons
+from weapons.manager import weapon_manager
+
+
+# =============================================================================
+# >> WEAPON CLASS ITER
+# =============================================================================
+def WeaponClassIter(is_filters=(), not_filters=()):
+    """Yield each weapon class which has any of the `is_filters` tags and none of the `not_filters` tags."""
+    is_filters = {is_filters} if isinstance(is_filters, str) else set(is_filters)
+    not_filters = {not_filters} if isinstance(not_filters, str) else set(not_filters)
+
+    for weapon_class in dict.values(weapon_manager):
+        if (not is_filters or weapon_class.tags & is_filters) and not weapon_class.tags & not_filters:
+            yield weapon_class
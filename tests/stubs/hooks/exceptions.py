@@ -0,0 +1,34 @@
+# ../tests/stubs/hooks/exceptions.py
+
+"""Stand-in for Source.Python's hooks.exceptions module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Sys
+import sys
+#   Traceback
+import traceback
+
+
+# =============================================================================
+# >> EXCEPT HOOKS
+# =============================================================================
+class _ExceptHooks(object):
+    """Class used to store the exceptions which have been printed."""
+
+    def __init__(self):
+        """Object initialization."""
+        self.exceptions = list()
+
+    def print_exception(self, *exc_info):
+        """Store and print the exception which is being handled."""
+        exc_info = exc_info or sys.exc_info()
+        self.exceptions.append(exc_info[1])
+
+        traceback.print_exception(*exc_info)
+
+
+# Store a global instance of `_ExceptHooks`
+except_hooks = _ExceptHooks()
@@ -0,0 +1,138 @@
+# ../tests/stubs/listeners/__init__.py
+
+"""Stand-in for Source.Python's listeners module.
+
+Each decorator registers its callback with the listener manager of its kind, `notify` calls them all.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Core
+from core import AutoUnload
+#   Hooks
+from hooks.exceptions import except_hooks
+
+
+# =============================================================================
+# >> LISTENER MANAGER
+# =============================================================================
+class ListenerManager(list):
+    """Class used to store the callbacks of one kind of listener."""
+
+    def register_listener(self, callback):
+        """Register the callback."""
+        if callback in self:
+            raise ValueError('Callback already registered.')
+
+        self.append(callback)
+
+    def unregister_listener(self, callback):
+        """Unregister the callback."""
+        self.remove(callback)
+
+    def notify(self, *args):
+        """Call all callbacks and return the first result which is not None."""
+        result = None
+
+        # Print the exceptions of listeners rather than raising them, as Source.Python does
+        for callback in tuple(self):
+            try:
+                return_value = callback(*args)
+            except Exception:
+                except_hooks.print_exception()
+                continue
+
+            if result is None:
+                result = return_value
+
+        return result
+
+
+class ListenerManagerDecorator(AutoUnload):
+    """Class used to register a callback with the listener manager of the decorator class."""
+
+    manager = None
+
+    def __init__(self, callback):
+        """Register the callback."""
+        self.callback = callback
+        self.manager.register_listener(callback)
+
+    def __call__(self, *args):
+        """Call the callback."""
+        return self.callback(*args)
+
+    def _unload_instance(self):
+        """Unregister the callback on unload."""
+        self.manager.unregister_listener(self.callback)
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+# Store a listener manager for each kind of listener
+on_convar_changed_listener_manager = ListenerManager()
+on_entity_deleted_listener_manager = ListenerManager()
+on_entity_spawned_listener_manager = ListenerManager()
+on_level_end_listener_manager = ListenerManager()
+on_level_init_listener_manager = ListenerManager()
+on_player_run_command_listener_manager = ListenerManager()
+on_server_activate_listener_manager = ListenerManager()
+on_server_output_listener_manager = ListenerManager()
+on_tick_listener_manager = ListenerManager()
+
+
+class OnConVarChanged(ListenerManagerDecorator):
+    """Register a callback for convar changes."""
+
+    manager = on_convar_changed_listener_manager
+
+
+class OnEntityDeleted(ListenerManagerDecorator):
+    """Register a callback for deleted entities."""
+
+    manager = on_entity_deleted_listener_manager
+
+
+class OnEntitySpawned(ListenerManagerDecorator):
+    """Register a callback for spawned entities."""
+
+    manager = on_entity_spawned_listener_manager
+
+
+class OnLevelEnd(ListenerManagerDecorator):
+    """Register a callback for the end of a map."""
+
+    manager = on_level_end_listener_manager
+
+
+class OnLevelInit(ListenerManagerDecorator):
+    """Register a callback for the start of a map."""
+
+    manager = on_level_init_listener_manager
+
+
+class OnPlayerRunCommand(ListenerManagerDecorator):
+    """Register a callback for player commands."""
+
+    manager = on_player_run_command_listener_manager
+
+
+class OnServerActivate(ListenerManagerDecorator):
+    """Register a callback for server activation."""
+
+    manager = on_server_activate_listener_manager
+
+
+class OnServerOutput(ListenerManagerDecorator):
+    """Register a callback for server console output."""
+
+    manager = on_server_output_listener_manager
+
+
+class OnTick(ListenerManagerDecorator):
+    """Register a callback for every server tick."""
+
+    manager = on_tick_listener_manager
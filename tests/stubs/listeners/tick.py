@@ -0,0 +1,22 @@
+# ../tests/stubs/listeners/tick.py
+
+"""Stand-in for Source.Python's listeners.tick module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Threading
+from threading import Thread
+
+
+# =============================================================================
+# >> GAME THREAD
+# =============================================================================
+class GameThread(Thread):
+    """Class used to run a daemon thread which doesn't keep the server from shutting down."""
+
+    def __init__(self, *args, **kwargs):
+        """Object initialization."""
+        super().__init__(*args, **kwargs)
+        self.daemon = True
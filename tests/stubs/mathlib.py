@@ -0,0 +1,58 @@
+# ../tests/stubs/mathlib.py
+
+"""Stand-in for Source.Python's mathlib module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Math
+import math
+
+
+# =============================================================================
+# >> VECTOR
+# =============================================================================
+class Vector(object):
+    """Class used to store xyz-coordinates."""
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        """Object initialization."""
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __eq__(self, other):
+        """Return whether both vectors have the same coordinates."""
+        if not isinstance(other, Vector):
+            return NotImplemented
+
+        return (self.x, self.y, self.z) == (other.x, other.y, other.z)
+
+    # Keep vectors unhashable, as they are mutable
+    __hash__ = None
+
+    def __iter__(self):
+        """Yield the coordinates."""
+        yield self.x
+        yield self.y
+        yield self.z
+
+    def __repr__(self):
+        """Return the coordinates."""
+        return f'{type(self).__name__}({self.x}, {self.y}, {self.z})'
+
+    def get_distance(self, other):
+        """Return the distance to `other`."""
+        return math.sqrt(self.get_distance_sqr(other))
+
+    def get_distance_sqr(self, other):
+        """Return the squared distance to `other`."""
+        return (self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2
+
+
+# =============================================================================
+# >> QANGLE
+# =============================================================================
+class QAngle(Vector):
+    """Class used to store pitch, yaw & roll angles."""
@@ -0,0 +1,27 @@
+# ../tests/stubs/memory/__init__.py
+
+"""Stand-in for Source.Python's memory module, where a pointer refers to an entity index."""
+
+# =============================================================================
+# >> POINTER
+# =============================================================================
+class Pointer(object):
+    """Class used to point to the entity at `index`, 0 being the null pointer."""
+
+    __slots__ = ('index', )
+
+    def __init__(self, index=0):
+        """Object initialization."""
+        self.index = index
+
+    def __bool__(self):
+        """Return whether the pointer is valid."""
+        return self.index != 0
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def make_object(cls, pointer):
+    """Return a `cls` wrapper of the entity the pointer points to."""
+    return cls(pointer.index)
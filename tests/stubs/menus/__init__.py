@@ -0,0 +1,83 @@
+# ../tests/stubs/menus/__init__.py
+
+"""Stand-in for Source.Python's menus module, which stores the menus sent instead of drawing them."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Core
+from core import AutoUnload
+
+
+# =============================================================================
+# >> PAGED OPTION
+# =============================================================================
+class PagedOption(object):
+    """Class used to store the text & value of a menu option."""
+
+    def __init__(self, text, value=None, highlight=True, selectable=True):
+        """Object initialization."""
+        self.text = text
+        self.value = value
+        self.highlight = highlight
+        self.selectable = selectable
+
+
+# =============================================================================
+# >> PAGED MENU
+# =============================================================================
+class PagedMenu(list, AutoUnload):
+    """Class used to store menu options and the callbacks of a menu."""
+
+    def __init__(
+            self, data=None, select_callback=None, build_callback=None, close_callback=None, description=None,
+            title=None):
+        """Object initialization."""
+        super().__init__(list() if data is None else data)
+
+        self.select_callback = select_callback
+        self.build_callback = build_callback
+        self.close_callback = close_callback
+        self.description = description
+        self.title = title
+
+        # Store the indexes of the players the menu has been sent to, in order
+        self.sent_to = list()
+
+    def register_select_callback(self, callback):
+        """Register the select callback."""
+        self.select_callback = callback
+        return callback
+
+    def register_build_callback(self, callback):
+        """Register the build callback."""
+        self.build_callback = callback
+        return callback
+
+    def register_close_callback(self, callback):
+        """Register the close callback."""
+        self.close_callback = callback
+        return callback
+
+    def send(self, *player_indexes):
+        """Build the menu for and store each player index."""
+        for player_index in player_indexes:
+            if self.build_callback is not None:
+                self.build_callback(self, player_index)
+
+            self.sent_to.append(player_index)
+
+    def select(self, player_index, option):
+        """Call the select callback, as if the player had chosen the option."""
+        if self.select_callback is not None:
+            return self.select_callback(self, player_index, option)
+
+    def close(self, player_index):
+        """Call the close callback, as if the player had closed the menu."""
+        if self.close_callback is not None:
+            return self.close_callback(self, player_index)
+
+    def _unload_instance(self):
+        """Forget the players on unload."""
+        self.sent_to.clear()
@@ -0,0 +1,25 @@
+# ../tests/stubs/messages/__init__.py
+
+"""Stand-in for Source.Python's messages module, which stores the messages sent."""
+
+# =============================================================================
+# >> SAY TEXT
+# =============================================================================
+# Store the (player indexes, message) pairs sent
+sent_messages = list()
+
+
+class SayText(object):
+    """Class used to send a chat message."""
+
+    def __init__(self, message):
+        """Object initialization."""
+        self.message = message
+
+    def send(self, *player_indexes):
+        """Store the message for the player indexes."""
+        sent_messages.append((player_indexes, self.message))
+
+
+class SayText2(SayText):
+    """Class used to send a colored chat message."""
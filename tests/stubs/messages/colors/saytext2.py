@@ -0,0 +1,9 @@
+# ../tests/stubs/messages/colors/saytext2.py
+
+"""Stand-in for Source.Python's messages.colors.saytext2 module."""
+
+# =============================================================================
+# >> COLORS
+# =============================================================================
+WHITE = '\x01'
+ORANGE = '\x10'
@@ -0,0 +1,48 @@
+# ../tests/stubs/paths.py
+
+"""Stand-in for Source.Python's paths module.
+
+The shipped plugin data is copied to a temporary directory, so loading & saving never touches the repository.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Atexit
+import atexit
+#   Os
+import os
+#   Shutil
+import shutil
+#   Tempfile
+import tempfile
+
+# Site-Package Imports
+#   Path
+from path import Path
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Store the shipped data path of the plugins
+SHIPPED_PLUGIN_DATA_PATH = Path(os.path.abspath(__file__)).parent.parent.parent.joinpath(
+    'addons', 'source-python', 'data', 'plugins'
+)
+
+
+def _copy_plugin_data():
+    """Return a temporary copy of the shipped plugin data, which is removed on exit."""
+    temp_path = tempfile.mkdtemp(prefix='udm-data-')
+    atexit.register(shutil.rmtree, temp_path, ignore_errors=True)
+
+    plugin_data_path = Path(temp_path).joinpath('plugins')
+    shutil.copytree(SHIPPED_PLUGIN_DATA_PATH, plugin_data_path)
+    return plugin_data_path
+
+
+# Store the plugin data path, `UDM_PLUGIN_DATA_PATH` overrides the temporary copy
+PLUGIN_DATA_PATH = (
+    Path(os.environ['UDM_PLUGIN_DATA_PATH']) if 'UDM_PLUGIN_DATA_PATH' in os.environ else _copy_plugin_data()
+)
@@ -0,0 +1,17 @@
+# ../tests/stubs/players/__init__.py
+
+"""Stand-in for Source.Python's players package."""
+
+
+# =============================================================================
+# >> USER CMD
+# =============================================================================
+class UserCmd(object):
+    """Class used to store a player's command for one tick."""
+
+    __slots__ = ('buttons', 'weapon_select')
+
+    def __init__(self, buttons=0, weapon_select=0):
+        """Object initialization."""
+        self.buttons = buttons
+        self.weapon_select = weapon_select
@@ -0,0 +1,28 @@
+# ../tests/stubs/players/constants.py
+
+"""Stand-in for Source.Python's players.constants module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Enum
+from enum import IntFlag
+
+
+# =============================================================================
+# >> PLAYER BUTTONS
+# =============================================================================
+class PlayerButtons(IntFlag):
+    """Player button flags."""
+
+    ATTACK = 1 << 0
+    JUMP = 1 << 1
+    DUCK = 1 << 2
+    FORWARD = 1 << 3
+    BACK = 1 << 4
+    USE = 1 << 5
+    MOVELEFT = 1 << 9
+    MOVERIGHT = 1 << 10
+    ATTACK2 = 1 << 11
+    RELOAD = 1 << 13
@@ -0,0 +1,152 @@
+# ../tests/stubs/players/entity.py
+
+"""Stand-in for Source.Python's players.entity module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Entities
+from entities.entity import BaseEntity
+from entities.entity import Entity
+from entities.hooks import call_pre_hooks
+#   Events
+from events import GameEvent
+from events.manager import event_registry
+#   Listeners
+from listeners import on_entity_spawned_listener_manager
+#   Memory
+from memory import Pointer
+#   Players
+from players.helpers import index_from_userid
+#   Weapons
+from weapons.entity import Weapon
+from weapons.manager import weapon_manager
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _matches(tags, is_filters, not_filters):
+    """Return whether the weapon tags contain any of `is_filters` and none of `not_filters`."""
+    if is_filters is not None:
+        is_filters = {is_filters} if isinstance(is_filters, str) else set(is_filters)
+
+        if not tags & is_filters:
+            return False
+
+    if not_filters is not None:
+        not_filters = {not_filters} if isinstance(not_filters, str) else set(not_filters)
+
+        if tags & not_filters:
+            return False
+
+    return True
+
+
+# =============================================================================
+# >> PLAYER
+# =============================================================================
+class Player(Entity):
+    """Class used to wrap a player entity."""
+
+    def __init__(self, index, caching=True):
+        """Object initialization."""
+        super().__init__(index)
+
+        if self._data.classname != 'player':
+            raise ValueError(f'Conversion from "Index" ({index}) to "Player" failed.')
+
+    @classmethod
+    def from_userid(cls, userid):
+        """Return the wrapper of the player for `userid`."""
+        return cls(index_from_userid(userid))
+
+    def is_bot(self):
+        """Return whether the player is a bot."""
+        return self._data.is_bot
+
+    def get_team_index(self):
+        """Return the player's team."""
+        return self._data.team
+
+    def set_team_index(self, value):
+        """Set the player's team."""
+        self._data.team = value
+
+    # Set the `team_index` property for `Player`
+    team_index = property(get_team_index, set_team_index)
+
+    @property
+    def active_weapon(self):
+        """Return the player's active weapon, or None if they have none."""
+        index = self._data.active_weapon
+        return Weapon(index) if index is not None else None
+
+    def give_named_item(self, name):
+        """Give the player the weapon or item and return a pointer to the weapon, or a null pointer for items."""
+        if name not in weapon_manager:
+            if name == 'item_assaultsuit':
+                self._data.armor = 100
+
+            return Pointer()
+
+        weapon_class = weapon_manager[name]
+        index = world.create_entity(
+            weapon_class.classname, weapon_name=weapon_class.name, owner=None, clip=weapon_class.clip,
+            ammo=weapon_class.maxammo
+        )
+
+        on_entity_spawned_listener_manager.notify(BaseEntity(index))
+
+        # The weapon spawns at the player's feet, which makes them bump into it, unless a pre-hook blocks it
+        if call_pre_hooks('bump_weapon', [Pointer(self.index), Pointer(index)]) is not False:
+            world.entities[index].owner = self.index
+            self._data.weapons.append(index)
+
+            if self._data.active_weapon is None:
+                self._data.active_weapon = index
+
+        return Pointer(index)
+
+    def weapons(self, is_filters=None, not_filters=None):
+        """Yield the player's weapons with any of the `is_filters` tags and none of the `not_filters` tags."""
+        for index in tuple(self._data.weapons):
+            weapon = Weapon(index)
+
+            if _matches(weapon_manager[weapon.weapon_name].tags, is_filters, not_filters):
+                yield weapon
+
+    def get_weapon(self, is_filters=None, not_filters=None):
+        """Return the player's first weapon matching the filters, or None."""
+        return next(self.weapons(is_filters, not_filters), None)
+
+    def client_command(self, command, server_side=False):
+        """Store the command and switch weapons on `use`."""
+        self._data.commands.append(command)
+
+        name, _, argument = command.partition(' ')
+
+        if name == 'use':
+            for weapon in self.weapons():
+                if weapon.classname == argument:
+                    self._data.active_weapon = weapon.index
+                    break
+
+    def spawn(self, force=False):
+        """Spawn the player and fire `player_spawn`, if they are dead or `force` is True."""
+        data = self._data
+
+        if not (data.dead or force) or data.team < 2:
+            return
+
+        data.dead = False
+        data.health = 100
+
+        # Give the default knife
+        if self.get_weapon(is_filters='melee') is None:
+            self.give_named_item('weapon_knife')
+
+        event_registry.fire(GameEvent('player_spawn', userid=data.userid))
@@ -0,0 +1,31 @@
+# ../tests/stubs/players/helpers.py
+
+"""Stand-in for Source.Python's players.helpers module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def index_from_userid(userid):
+    """Return the index of the player for `userid`."""
+    try:
+        return world.userids[userid]
+    except KeyError:
+        raise ValueError(f'Conversion from "Userid" ({userid}) to "Index" failed.') from None
+
+
+def userid_from_index(index):
+    """Return the userid of the player at `index`."""
+    data = world.entities.get(index)
+
+    if data is None or data.classname != 'player':
+        raise ValueError(f'Conversion from "Index" ({index}) to "Userid" failed.')
+
+    return data.userid
@@ -0,0 +1,3 @@
+# ../tests/stubs/plugins/__init__.py
+
+"""Stand-in for Source.Python's plugins package."""
@@ -0,0 +1,102 @@
+# ../tests/stubs/plugins/manager.py
+
+"""Stand-in for Source.Python's plugins.manager module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Importlib
+import importlib
+#   Sys
+import sys
+
+# Site-Package Imports
+#   ConfigObj
+from configobj import ConfigObj
+#   Path
+from path import Path
+
+# Stand-In Imports
+#   Core
+from core import AutoUnload
+#   Entities
+from entities.hooks import entity_pre_hooks
+
+
+# =============================================================================
+# >> PLUGIN INFO
+# =============================================================================
+class PluginInfo(object):
+    """Class used to store the values of a plugin's info.ini."""
+
+    def __init__(self, name, path):
+        """Object initialization."""
+        self.name = name
+
+        ini = ConfigObj(path.joinpath('info.ini'))
+        self.verbose_name = ini.get('verbose_name', name)
+        self.author = ini.get('author')
+        self.description = ini.get('description')
+        self.version = ini.get('version')
+        self.url = ini.get('url')
+
+
+# =============================================================================
+# >> PLUGIN MANAGER
+# =============================================================================
+class _PluginManager(dict):
+    """Class used to store loaded plugins by name."""
+
+    def get_plugin_info(self, name):
+        """Return the info of the plugin module `name` belongs to."""
+        plugin_name = name.split('.', 1)[0]
+        package = importlib.import_module(plugin_name)
+
+        return PluginInfo(plugin_name, Path(package.__file__).parent)
+
+    def load(self, plugin_name):
+        """Import the plugin's main module, call its load() and return the module."""
+        module = self[plugin_name] = importlib.import_module(f'{plugin_name}.{plugin_name}')
+
+        if hasattr(module, 'load'):
+            module.load()
+
+        return module
+
+    def unload(self, plugin_name):
+        """Call the plugin's unload(), clean up all `AutoUnload` objects and forget its modules."""
+        module = self.pop(plugin_name)
+
+        if hasattr(module, 'unload'):
+            module.unload()
+
+        modules = [
+            sys.modules[name] for name in tuple(sys.modules)
+            if name == plugin_name or name.startswith(f'{plugin_name}.')
+        ]
+
+        # Clean up each instance once, even if several modules import it
+        instances = dict()
+
+        for plugin_module in modules:
+            for value in vars(plugin_module).values():
+                if isinstance(value, AutoUnload):
+                    instances[id(value)] = value
+
+        for instance in instances.values():
+            instance._unload_instance()
+
+        # Unregister entity hooks, as their decorators aren't stored in the modules
+        for hooks in entity_pre_hooks.values():
+            hooks[:] = [
+                (condition, callback) for condition, callback in hooks
+                if not callback.__module__.startswith(plugin_name)
+            ]
+
+        for plugin_module in modules:
+            del sys.modules[plugin_module.__name__]
+
+
+# Store a global instance of `_PluginManager`
+plugin_manager = _PluginManager()
@@ -0,0 +1,3 @@
+# ../tests/stubs/weapons/__init__.py
+
+"""Stand-in for Source.Python's weapons package."""
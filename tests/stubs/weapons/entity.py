@@ -0,0 +1,33 @@
+# ../tests/stubs/weapons/entity.py
+
+"""Stand-in for Source.Python's weapons.entity module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-In Imports
+#   Entities
+from entities.entity import Entity
+#   World
+from _world import world
+
+
+# =============================================================================
+# >> WEAPON
+# =============================================================================
+class Weapon(Entity):
+    """Class used to wrap a weapon entity."""
+
+    @property
+    def owner(self):
+        """Return the owning player's entity, or None if the weapon is lying on the ground."""
+        owner = self._data.owner
+        return Entity(owner) if owner in world.entities else None
+
+    def set_clip(self, value):
+        """Set the weapon's clip."""
+        self._data.clip = value
+
+    def get_clip(self):
+        """Return the weapon's clip."""
+        return self._data.clip
@@ -0,0 +1,113 @@
+# ../tests/stubs/weapons/manager.py
+
+"""Stand-in for Source.Python's weapons.manager module, holding the CS:GO weapons the plugin uses."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   Typing
+from typing import NamedTuple
+
+
+# =============================================================================
+# >> WEAPON CLASS
+# =============================================================================
+class WeaponClass(NamedTuple):
+    """Class used to store the data of a weapon."""
+
+    name: str
+    basename: str
+    classname: str
+    clip: int
+    maxammo: int
+    tags: frozenset
+
+
+# Store the (basename, clip, maxammo, tags) of each weapon
+_WEAPONS = (
+    ('glock', 20, 120, 'secondary pistol'),
+    ('usp_silencer', 12, 24, 'secondary pistol'),
+    ('p250', 13, 26, 'secondary pistol'),
+    ('hkp2000', 13, 52, 'secondary pistol'),
+    ('deagle', 7, 35, 'secondary pistol'),
+    ('fiveseven', 20, 100, 'secondary pistol'),
+    ('elite', 30, 120, 'secondary pistol'),
+    ('tec9', 18, 90, 'secondary pistol'),
+    ('cz75a', 12, 12, 'secondary pistol'),
+    ('revolver', 8, 8, 'secondary pistol'),
+    ('m4a1', 30, 90, 'primary rifle'),
+    ('m4a1_silencer', 20, 80, 'primary rifle'),
+    ('ak47', 30, 90, 'primary rifle'),
+    ('awp', 10, 30, 'primary sniper'),
+    ('ssg08', 10, 90, 'primary sniper'),
+    ('sg556', 30, 90, 'primary rifle'),
+    ('aug', 30, 90, 'primary rifle'),
+    ('mag7', 5, 32, 'primary shotgun'),
+    ('mac10', 30, 100, 'primary smg'),
+    ('mp9', 30, 120, 'primary smg'),
+    ('mp5sd', 30, 120, 'primary smg'),
+    ('mp7', 30, 120, 'primary smg'),
+    ('ump45', 25, 100, 'primary smg'),
+    ('bizon', 64, 120, 'primary smg'),
+    ('p90', 50, 100, 'primary smg'),
+    ('galilar', 35, 90, 'primary rifle'),
+    ('famas', 25, 90, 'primary rifle'),
+    ('nova', 8, 32, 'primary shotgun'),
+    ('xm1014', 7, 32, 'primary shotgun'),
+    ('sawedoff', 7, 32, 'primary shotgun'),
+    ('scar20', 20, 90, 'primary sniper'),
+    ('g3sg1', 20, 90, 'primary sniper'),
+    ('negev', 150, 200, 'primary machinegun'),
+    ('m249', 100, 200, 'primary machinegun'),
+    ('knife', -1, 0, 'melee'),
+    ('hegrenade', -1, 1, 'grenade explosive'),
+    ('flashbang', -1, 2, 'grenade'),
+    ('smokegrenade', -1, 1, 'grenade'),
+    ('c4', -1, 0, 'objective'),
+)
+
+# Store the entity classnames of weapons which share the classname of another weapon
+_SHARED_CLASSNAMES = {
+    'usp_silencer': 'hkp2000',
+    'm4a1_silencer': 'm4a1',
+    'revolver': 'deagle',
+    'cz75a': 'p250',
+    'mp5sd': 'mp7',
+}
+
+
+# =============================================================================
+# >> WEAPON MANAGER
+# =============================================================================
+class _WeaponManager(dict):
+    """Class used to store the weapon classes by full weapon name."""
+
+    prefix = 'weapon_'
+
+    def __init__(self):
+        """Object initialization."""
+        super().__init__()
+
+        for basename, clip, maxammo, tags in _WEAPONS:
+            self[f'{self.prefix}{basename}'] = WeaponClass(
+                f'{self.prefix}{basename}', basename,
+                f'{self.prefix}{_SHARED_CLASSNAMES.get(basename, basename)}',
+                clip, maxammo, frozenset(tags.split()) | {'all'}
+            )
+
+    def _format_name(self, item):
+        """Return the full weapon name for a basename or full weapon name."""
+        return item if item.startswith(self.prefix) else f'{self.prefix}{item}'
+
+    def __contains__(self, item):
+        """Return whether the weapon exists."""
+        return super().__contains__(self._format_name(item))
+
+    def __getitem__(self, item):
+        """Return the weapon class."""
+        return super().__getitem__(self._format_name(item))
+
+
+# Store a global instance of `_WeaponManager`
+weapon_manager = _WeaponManager()
@@ -0,0 +1,24 @@
+# ../tests/test_benchmarks.py
+
+"""Tests for comparing benchmark results in tests/benchmarks.py."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Test Imports
+#   Benchmarks
+from benchmarks import compare
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_compare_flags_results_slower_than_the_threshold():
+    baseline = {'a': {'ns': 100.0}, 'b': {'ns': 100.0}, 'c': {'ns': 100.0}}
+    results = {'a': {'ns': 125.0}, 'b': {'ns': 105.0}, 'c': {'ns': 50.0}}
+
+    assert compare(results, baseline, threshold=0.1) == ['a']
+
+
+def test_compare_skips_results_missing_from_the_baseline():
+    assert compare({'a': {'ns': 500.0}}, {'b': {'ns': 100.0}}) == []
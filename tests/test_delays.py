@@ -0,0 +1,165 @@
+# ../tests/test_delays.py
+
+"""Tests for udm.delays."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package Imports
+#   Pytest
+import pytest
+
+# Stand-In Imports
+#   World
+from _world import world
+
+# Script Imports
+#   Delays
+from udm.delays import _DelayManager
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def delay_manager(engine):
+    """Return a new delay manager on the simulated clock."""
+    return _DelayManager()
+
+
+def noop():
+    """Do nothing."""
+
+
+def advance(delay_manager, seconds):
+    """Advance the simulated clock and process the due delays."""
+    world.time += seconds
+    delay_manager.tick()
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_delays_are_called_in_deadline_order(delay_manager):
+    calls = list()
+
+    delay_manager(('b', ), 2, calls.append, ('b', ))
+    delay_manager(('a', ), 1, calls.append, ('a', ))
+    delay_manager(('c', ), 1, calls.append, ('c', ))
+
+    advance(delay_manager, 0.5)
+    assert calls == []
+
+    advance(delay_manager, 0.5)
+    assert calls == ['a', 'c']
+
+    advance(delay_manager, 1)
+    assert calls == ['a', 'c', 'b']
+    assert len(delay_manager) == 0
+
+
+def test_scheduling_a_key_again_replaces_the_delay(delay_manager):
+    calls = list()
+
+    delay_manager(('respawn', 2), 1, calls.append, ('first', ))
+    delay_manager(('respawn', 2), 2, calls.append, ('second', ))
+
+    advance(delay_manager, 1)
+    assert calls == []
+
+    advance(delay_manager, 1)
+    assert calls == ['second']
+
+
+def test_cancel(delay_manager):
+    calls = list()
+
+    delay_manager(('protect', 2), 1, calls.append, ('protect', ))
+    delay_manager(('respawn', 2), 1, calls.append, ('respawn', ), call_on_cancel=True)
+
+    delay_manager.cancel(('protect', 2))
+    delay_manager.cancel(('respawn', 2))
+    assert calls == ['respawn']
+
+    advance(delay_manager, 1)
+    assert calls == ['respawn']
+
+
+def test_cancel_unknown_key(delay_manager):
+    delay_manager.cancel(('respawn', 2))
+
+    assert delay_manager.statistics.get('respawn') is None
+
+
+def test_clear_disables_delays(delay_manager):
+    calls = list()
+
+    delay_manager(('a', ), 1, calls.append, ('a', ))
+    delay_manager.clear()
+    delay_manager(('b', ), 1, calls.append, ('b', ))
+
+    advance(delay_manager, 1)
+
+    assert calls == []
+    assert not delay_manager.delays_enabled
+    assert delay_manager._heap == []
+
+
+def test_delays_scheduled_by_callbacks_run_on_a_later_tick(delay_manager):
+    calls = list()
+
+    def reschedule():
+        calls.append('first')
+        delay_manager(('second', ), 0, calls.append, ('second', ))
+
+    delay_manager(('first', ), 0, reschedule)
+
+    advance(delay_manager, 0)
+    assert calls == ['first']
+
+    advance(delay_manager, 0)
+    assert calls == ['first', 'second']
+
+
+def test_failing_callbacks_do_not_stop_other_delays(delay_manager, printed_exceptions):
+    calls = list()
+
+    delay_manager(('fail', ), 1, lambda: 1 / 0)
+    delay_manager(('ok', ), 1, calls.append, ('ok', ))
+
+    advance(delay_manager, 1)
+
+    assert calls == ['ok']
+    assert isinstance(printed_exceptions.pop(), ZeroDivisionError)
+
+
+def test_cancelled_entries_get_compacted(delay_manager):
+    for _ in range(200):
+        delay_manager(('refill_clip', 1), 10, noop)
+
+    assert len(delay_manager) == 1
+    assert len(delay_manager._heap) <= 2 * len(delay_manager) + 64
+
+
+def test_statistics_by_key_family(delay_manager):
+    for userid in range(3):
+        delay_manager(('respawn', userid), 1, noop)
+
+    delay_manager.cancel(('respawn', 0))
+    advance(delay_manager, 1.5)
+
+    statistics = delay_manager.statistics['respawn']
+
+    assert (statistics.scheduled, statistics.fired, statistics.cancelled) == (3, 2, 1)
+    assert statistics.durations.count == 2
+    assert delay_manager.statistics.fire_lag.count == 2
+    assert delay_manager.statistics.fire_lag.maximum == 500_000
+
+
+def test_pending(delay_manager):
+    delay_manager(('respawn', 1), 1, noop)
+    delay_manager(('respawn', 2), 1, noop)
+    delay_manager(('protect', 1), 1, noop)
+
+    assert delay_manager.pending('respawn') == 2
+    assert delay_manager.pending('protect') == 1
@@ -0,0 +1,133 @@
+# ../tests/test_drops.py
+
+"""Tests for udm.drops."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package Imports
+#   Pytest
+import pytest
+
+# Stand-In Imports
+#   Cvars
+from cvars import cvar
+#   World
+from _world import world
+
+# Script Imports
+#   Drops
+from udm.drops import _DroppedWeaponRegistry
+from udm.drops import DROPPED_WEAPON_LIFETIME
+from udm.drops import SWEEP_INTERVAL
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def registry(engine):
+    """Return a new dropped weapon registry."""
+    return _DroppedWeaponRegistry()
+
+
+@pytest.fixture
+def max_dropped_weapons():
+    """Return a function setting `udm_max_dropped_weapons`, which is restored afterwards."""
+    convar = cvar.find_var('udm_max_dropped_weapons')
+    default = convar.get_int()
+
+    yield convar.set_int
+
+    convar.set_int(default)
+
+
+def drop(owner=None):
+    """Create a weapon lying on the ground and return its index."""
+    return world.create_entity('weapon_ak47', weapon_name='weapon_ak47', owner=owner, clip=30, ammo=90)
+
+
+def run_seconds(engine, seconds):
+    """Run the ticks of `seconds` simulated seconds."""
+    for _ in range(round(seconds / engine.global_vars.interval_per_tick)):
+        engine.tick()
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_dropped_weapons_are_removed_after_their_lifetime(engine, registry):
+    index = drop()
+    registry.add(index)
+
+    run_seconds(engine, DROPPED_WEAPON_LIFETIME - SWEEP_INTERVAL)
+    assert index in world.entities
+
+    run_seconds(engine, 2 * SWEEP_INTERVAL)
+    assert index not in world.entities
+    assert index not in registry
+
+
+def test_picked_up_weapons_are_kept(engine, registry):
+    player_index = engine.connect_player()
+    index = drop()
+    registry.add(index)
+
+    world.entities[index].owner = player_index
+    run_seconds(engine, DROPPED_WEAPON_LIFETIME + SWEEP_INTERVAL)
+
+    assert index in world.entities
+    assert index not in registry
+
+
+def test_dropping_again_restarts_the_lifetime(engine, registry):
+    index = drop()
+    registry.add(index)
+
+    run_seconds(engine, DROPPED_WEAPON_LIFETIME / 2)
+    registry.add(index)
+    run_seconds(engine, DROPPED_WEAPON_LIFETIME / 2 + SWEEP_INTERVAL / 2)
+
+    assert index in world.entities
+
+    run_seconds(engine, DROPPED_WEAPON_LIFETIME / 2 + SWEEP_INTERVAL)
+    assert index not in world.entities
+
+
+def test_discarded_weapons_are_forgotten(engine, registry):
+    index = drop()
+    registry.add(index)
+    registry.discard(index)
+
+    run_seconds(engine, DROPPED_WEAPON_LIFETIME + SWEEP_INTERVAL)
+
+    assert index in world.entities
+
+
+def test_oldest_weapons_are_removed_over_the_limit(engine, registry, max_dropped_weapons):
+    max_dropped_weapons(2)
+    indexes = [drop() for _ in range(3)]
+
+    for index in indexes:
+        registry.add(index)
+
+    assert indexes[0] not in world.entities
+    assert list(registry) == indexes[1:]
+
+
+def test_no_limit(engine, registry, max_dropped_weapons):
+    max_dropped_weapons(0)
+    indexes = [drop() for _ in range(50)]
+
+    for index in indexes:
+        registry.add(index)
+
+    assert len(registry) == 50
+
+
+def test_clear(engine, registry):
+    registry.add(drop())
+    registry.clear()
+
+    assert not registry
+    assert not registry._drops
@@ -0,0 +1,196 @@
+# ../tests/test_inventories.py
+
+"""Tests for udm.inventories."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   JSON
+import json
+#   SQLite
+import sqlite3
+
+# Site-Package Imports
+#   Pytest
+import pytest
+
+# Script Imports
+#   Inventories
+from udm.inventories import Inventories
+from udm.inventories import Inventory
+from udm.inventories import inventory_store
+from udm.inventories import _InventoryStore
+#   Players
+from udm.players import PlayerEntity
+#   Weapons
+from udm.weapons import weapon_manager
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+def add(inventory, basename):
+    """Add the weapon to the inventory."""
+    inventory.add_inventory_item(basename, weapon_manager[basename])
+
+
+# =============================================================================
+# >> INVENTORY
+# =============================================================================
+def test_empty_inventory():
+    inventory = Inventory()
+
+    assert not inventory
+    assert len(inventory) == 0
+    assert 'primary' not in inventory
+    assert list(inventory.keys()) == []
+
+
+def test_one_weapon_per_tag():
+    inventory = Inventory()
+
+    add(inventory, 'ak47')
+    add(inventory, 'deagle')
+    add(inventory, 'awp')
+
+    assert len(inventory) == 2
+    assert inventory['primary'].basename == 'awp'
+    assert inventory['secondary'].data is weapon_manager['deagle']
+
+
+def test_keys_are_in_equip_order():
+    inventory = Inventory()
+
+    add(inventory, 'deagle')
+    add(inventory, 'ak47')
+
+    assert list(inventory.keys()) == list(weapon_manager.equip_order)
+    assert [tag for tag, item in inventory.items()] == list(inventory.keys())
+    assert [item.basename for item in inventory.values()] == [
+        inventory[tag].basename for tag in weapon_manager.equip_order
+    ]
+
+
+def test_delete():
+    inventory = Inventory()
+
+    add(inventory, 'm4a1_silencer')
+    del inventory['primary']
+
+    assert not inventory
+    assert not inventory.get_silencer_option(weapon_manager.tag_slots['primary'])
+
+
+def test_missing_tag():
+    inventory = Inventory()
+
+    with pytest.raises(KeyError):
+        inventory['primary']
+
+    with pytest.raises(KeyError):
+        del inventory['primary']
+
+
+def test_silencer_options_are_kept_per_slot():
+    inventory = Inventory()
+
+    add(inventory, 'm4a1_silencer')
+    add(inventory, 'usp_silencer')
+
+    # Silenced weapons start silenced on CS:GO
+    assert inventory['primary'].silencer_option
+    assert inventory['secondary'].silencer_option
+
+    inventory['primary'].silencer_option = False
+
+    assert not inventory['primary'].silencer_option
+    assert inventory['secondary'].silencer_option
+
+
+def test_weapons_without_silencer_are_not_silenced():
+    inventory = Inventory()
+    add(inventory, 'ak47')
+
+    assert not inventory['primary'].silencer_option
+
+
+# =============================================================================
+# >> INVENTORIES
+# =============================================================================
+def test_inventories_are_empty_until_a_weapon_is_chosen():
+    inventories = Inventories()
+
+    assert inventories.is_empty
+
+    inventories[0]
+    assert inventories.is_empty
+
+    inventories.selection = 1
+    assert not inventories.is_empty
+
+
+def test_inventories_round_trip():
+    inventories = Inventories()
+    inventories.selection = 2
+
+    add(inventories[0], 'ak47')
+    add(inventories[2], 'm4a1_silencer')
+    add(inventories[2], 'deagle')
+    inventories[2]['primary'].silencer_option = False
+
+    data = json.loads(json.dumps(inventories.to_dict()))
+
+    restored = Inventories()
+    restored.update_from_dict(data)
+
+    assert restored.selection == 2
+    assert restored.to_dict() == inventories.to_dict()
+    assert not restored[2]['primary'].silencer_option
+
+
+def test_removed_weapons_are_skipped_when_restoring():
+    restored = Inventories()
+    restored.update_from_dict({
+        'selection': 0,
+        'inventories': {'0': {'primary': ['scar20', False], 'secondary': ['glock', False]}}
+    })
+
+    assert list(restored[0].keys()) == ['secondary']
+
+
+# =============================================================================
+# >> INVENTORY STORE
+# =============================================================================
+def test_store_stops_queueing_once_the_database_cannot_be_opened(tmp_path, printed_exceptions):
+    store = _InventoryStore()
+
+    # A directory can't be opened as a database
+    store.database_file = str(tmp_path)
+
+    store.save('STEAM_1:0:1', Inventories())
+    store._thread.join()
+
+    assert not store.available
+    assert store._requests.empty()
+    assert isinstance(printed_exceptions.pop(), sqlite3.Error)
+
+    store.save('STEAM_1:0:1', Inventories())
+
+    assert store._requests.empty()
+    assert not printed_exceptions
+
+
+def test_restored_weapons_may_be_picked_up(engine):
+    index = engine.connect_player()
+    engine.spawn_player(index)
+
+    state = PlayerEntity.get_state(index)
+    PlayerEntity.get_allowed_weapons(index)
+
+    data = {'selection': 0, 'inventories': {'0': {'primary': ['ak47', False]}}}
+    inventory_store._loaded.append((state.uniqueid, json.dumps(data)))
+    engine.tick()
+
+    assert state.inventories[0]['primary'].basename == 'ak47'
+    assert state.allowed_weapons is None
@@ -0,0 +1,73 @@
+# ../tests/test_replay.py
+
+"""Tests for recording traces with udm.recorder and replaying them with tests/replay.py."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Test Imports
+#   Replay
+from replay import replay
+
+# Stand-In Imports
+#   Players
+from players.constants import PlayerButtons
+#   World
+from _world import world
+
+# Script Imports
+#   Recorder
+from udm.recorder import read_trace
+from udm.recorder import RECORD_BUTTONS
+from udm.recorder import RECORD_CLIENT_COMMAND
+from udm.recorder import RECORD_EVENT
+from udm.recorder import recorder
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_replay_reproduces_a_recorded_game(engine):
+    recorder.start()
+    engine.fire_event('round_start')
+
+    indexes = [engine.connect_player(team=2 + number % 2) for number in range(4)]
+    userids = {index: world.entities[index].userid for index in indexes}
+
+    for index in indexes:
+        engine.spawn_player(index)
+
+    engine.run_command(indexes[0], PlayerButtons.ATTACK)
+    engine.client_command(indexes[1], 'buy ak47')
+    engine.tick()
+    engine.kill_player(indexes[2], indexes[3])
+
+    for _ in range(256):
+        engine.tick()
+
+    recorder.stop()
+    recorder._join()
+
+    records = list(read_trace(recorder.trace_file))
+
+    assert {record.kind for record in records} == {RECORD_EVENT, RECORD_CLIENT_COMMAND, RECORD_BUTTONS}
+    assert all(
+        record.index == world.userids[record.data[1]['userid']]
+        for record in records if record.kind == RECORD_EVENT and 'userid' in record.data[1]
+    )
+
+    # Start over on an empty server
+    for index in indexes:
+        engine.disconnect_player(index)
+
+    engine.change_level(engine.global_vars.map_name)
+    engine.reset()
+    engine.activate_server(64)
+
+    result = replay(recorder.trace_file)
+
+    assert result['records'] == len(records)
+    assert result['skipped'] == 0
+    assert result['exceptions'] == 0
+    assert {index: world.entities[index].userid for index in indexes} == userids
+    assert not any(world.entities[index].dead for index in indexes)
@@ -0,0 +1,139 @@
+# ../tests/test_respawns.py
+
+"""Tests for udm.respawns."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package Imports
+#   Pytest
+import pytest
+
+# Stand-In Imports
+#   Cvars
+from cvars import cvar
+#   Engines
+from engines.server import global_vars
+#   World
+from _world import world
+
+# Script Imports
+#   Respawns
+from udm.respawns import _RespawnQueue
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def respawn_queue(engine):
+    """Return a new respawn queue."""
+    return _RespawnQueue()
+
+
+@pytest.fixture
+def max_respawns_per_tick():
+    """Return a function setting `udm_max_respawns_per_tick`, which is restored afterwards."""
+    convar = cvar.find_var('udm_max_respawns_per_tick')
+    default = convar.get_int()
+
+    yield convar.set_int
+
+    convar.set_int(default)
+
+
+def connect_dead_players(engine, count):
+    """Connect `count` dead players and return their (userid, index) pairs."""
+    indexes = [engine.connect_player() for _ in range(count)]
+    return [(world.entities[index].userid, index) for index in indexes]
+
+
+def alive(players):
+    """Return the userids of the alive players."""
+    return [userid for userid, index in players if not world.entities[index].dead]
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_players_respawn_in_queue_order_up_to_the_limit(engine, respawn_queue, max_respawns_per_tick):
+    max_respawns_per_tick(2)
+    players = connect_dead_players(engine, 5)
+
+    for userid, index in players:
+        respawn_queue.add(userid, index)
+
+    respawn_queue.tick()
+    assert alive(players) == [players[0][0], players[1][0]]
+
+    respawn_queue.tick()
+    respawn_queue.tick()
+    assert len(alive(players)) == 5
+    assert not respawn_queue
+
+    assert respawn_queue.spikes.count == 3
+    assert respawn_queue.spikes.maximum == 2
+
+
+def test_no_limit(engine, respawn_queue, max_respawns_per_tick):
+    max_respawns_per_tick(0)
+    players = connect_dead_players(engine, 20)
+
+    for userid, index in players:
+        respawn_queue.add(userid, index)
+
+    respawn_queue.tick()
+    assert len(alive(players)) == 20
+
+
+def test_queueing_again_keeps_the_position(engine, respawn_queue, max_respawns_per_tick):
+    max_respawns_per_tick(1)
+    players = connect_dead_players(engine, 2)
+
+    for userid, index in players + players[:1]:
+        respawn_queue.add(userid, index)
+
+    assert list(respawn_queue) == [players[0][0], players[1][0]]
+
+
+def test_discard(engine, respawn_queue):
+    players = connect_dead_players(engine, 2)
+
+    for userid, index in players:
+        respawn_queue.add(userid, index)
+
+    respawn_queue.discard(players[0][0])
+    respawn_queue.discard(12345)
+    respawn_queue.tick()
+
+    assert alive(players) == [players[1][0]]
+
+
+def test_disconnected_players_are_skipped(engine, respawn_queue):
+    players = connect_dead_players(engine, 2)
+
+    for userid, index in players:
+        respawn_queue.add(userid, index)
+
+    world.remove_entity(players[0][1])
+    respawn_queue.tick()
+
+    assert alive(players[1:]) == [players[1][0]]
+
+
+def test_ticks_waited_are_counted(engine, respawn_queue, max_respawns_per_tick):
+    max_respawns_per_tick(1)
+    players = connect_dead_players(engine, 2)
+
+    for userid, index in players:
+        respawn_queue.add(userid, index)
+
+    for _ in range(2):
+        global_vars.tick_count += 1
+        respawn_queue.tick()
+
+    assert respawn_queue.waits.count == 2
+    assert respawn_queue.waits.total == 1 + 2
+
+    respawn_queue.reset_statistics()
+    assert respawn_queue.waits.count == 0
@@ -0,0 +1,273 @@
+# ../tests/test_spawn_locations.py
+
+"""Tests for udm.spawn_locations."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+#   JSON
+import json
+#   Os
+import os
+#   Random
+import random
+
+# Site-Package Imports
+#   Path
+from path import Path
+#   Pytest
+import pytest
+
+# Stand-In Imports
+#   Mathlib
+from mathlib import QAngle
+
+# Script Imports
+#   Spawn Locations
+import udm.spawn_locations
+from udm.spawn_locations import _CACHE_HEADER
+from udm.spawn_locations import _VECTORIZED_MAX_SPAWN_LOCATIONS
+from udm.spawn_locations import SAFE_SPAWN_DISTANCE
+from udm.spawn_locations import SpawnLocation
+from udm.spawn_locations import SpawnLocationCursor
+from udm.spawn_locations import SpawnLocationManager
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+def random_manager(size, extent=4_000.0, seed=0):
+    """Return a spawn location manager with `size` random spawn locations."""
+    rng = random.Random(seed)
+    manager = SpawnLocationManager()
+
+    manager.extend(
+        SpawnLocation(rng.uniform(-extent, extent), rng.uniform(-extent, extent), rng.uniform(-200, 200), QAngle())
+        for _ in range(size)
+    )
+
+    return manager
+
+
+def brute_force_unsafe_indexes(manager, origins):
+    """Return the unsafe indexes by comparing every spawn location with every origin."""
+    return {
+        index for index, spawn_location in enumerate(manager) for x, y, z in origins
+        if (spawn_location.x - x) ** 2 + (spawn_location.y - y) ** 2 + (spawn_location.z - z) ** 2 <
+        SAFE_SPAWN_DISTANCE ** 2
+    }
+
+
+def random_origins(manager, count, seed=1):
+    """Return origins close to random spawn locations, so some of them are unsafe."""
+    rng = random.Random(seed)
+
+    return [
+        (spawn_location.x + rng.uniform(-200, 200), spawn_location.y + rng.uniform(-200, 200), spawn_location.z)
+        for spawn_location in rng.sample(list(manager), count)
+    ]
+
+
+def write_json(json_file, records):
+    """Write the (x, y, z, pitch, yaw, roll) records as a spawn locations data file."""
+    with open(json_file, 'w') as f:
+        json.dump([{'vector': list(record[:3]), 'angle': list(record[3:])} for record in records], f)
+
+
+# =============================================================================
+# >> SPAWN LOCATION CURSOR
+# =============================================================================
+def test_cursor_takes_every_index_once_per_round():
+    cursor = SpawnLocationCursor(20)
+
+    first_round = [cursor.take() for _ in range(20)]
+    second_round = [cursor.take() for _ in range(20)]
+
+    assert sorted(first_round) == list(range(20))
+    assert sorted(second_round) == list(range(20))
+
+
+def test_cursor_skips_unsafe_indexes():
+    cursor = SpawnLocationCursor(10)
+    unsafe_indexes = {0, 1, 2, 3, 4}
+
+    taken = [cursor.take(unsafe_indexes) for _ in range(5)]
+
+    assert sorted(taken) == [5, 6, 7, 8, 9]
+    assert cursor.take(unsafe_indexes) is None
+
+
+def test_cursor_keeps_skipped_indexes_for_later():
+    cursor = SpawnLocationCursor(3)
+
+    taken = [cursor.take({0}), cursor.take({0}), cursor.take()]
+
+    assert sorted(taken) == [0, 1, 2]
+
+
+def test_cursor_returns_none_if_all_indexes_are_unsafe():
+    cursor = SpawnLocationCursor(4)
+
+    assert cursor.take({0, 1, 2, 3}) is None
+    assert len(cursor) == 4
+
+
+def test_empty_cursor():
+    assert SpawnLocationCursor(0).take() is None
+
+
+# =============================================================================
+# >> UNSAFE INDEX LOOKUPS
+# =============================================================================
+@pytest.mark.parametrize('players', (1, 8, 64))
+def test_grid_lookup_matches_brute_force(players):
+    manager = random_manager(300)
+    origins = random_origins(manager, players)
+
+    assert manager._get_unsafe_indexes_grid(origins) == brute_force_unsafe_indexes(manager, origins)
+
+
+@pytest.mark.parametrize('players', (1, 8, 64))
+def test_vectorized_lookup_matches_brute_force(players):
+    pytest.importorskip('numpy')
+
+    manager = random_manager(300)
+    origins = random_origins(manager, players)
+
+    assert manager._get_unsafe_indexes_vectorized(origins) == brute_force_unsafe_indexes(manager, origins)
+
+
+def test_grid_lookup_tests_neighbouring_cells():
+    manager = SpawnLocationManager()
+    manager.append(SpawnLocation(SAFE_SPAWN_DISTANCE - 1, 0.0, 0.0, QAngle()))
+
+    # The origin lies in the next cell, but within the safe distance
+    assert manager._get_unsafe_indexes_grid([(SAFE_SPAWN_DISTANCE + 1, 0.0, 0.0)]) == {0}
+    assert manager._get_unsafe_indexes_grid([(3 * SAFE_SPAWN_DISTANCE, 0.0, 0.0)]) == set()
+
+
+def test_lookups_follow_changes():
+    manager = random_manager(10)
+    spawn_location = manager[3]
+    origin = (spawn_location.x, spawn_location.y, spawn_location.z)
+
+    assert 3 in manager.get_unsafe_indexes([origin])
+
+    manager.remove(spawn_location)
+
+    assert manager._get_unsafe_indexes_grid([origin]) == brute_force_unsafe_indexes(manager, [origin])
+
+
+def test_lookup_without_numpy_uses_the_grid(monkeypatch):
+    monkeypatch.setattr(udm.spawn_locations, 'numpy', None)
+
+    manager = random_manager(50)
+    origins = random_origins(manager, 5)
+
+    assert manager.get_unsafe_indexes(origins) == brute_force_unsafe_indexes(manager, origins)
+
+
+@pytest.mark.parametrize('size, method_name', (
+    (_VECTORIZED_MAX_SPAWN_LOCATIONS, '_get_unsafe_indexes_vectorized'),
+    (_VECTORIZED_MAX_SPAWN_LOCATIONS + 1, '_get_unsafe_indexes_grid')
+))
+def test_lookup_uses_numpy_for_few_spawn_locations_only(size, method_name, monkeypatch):
+    pytest.importorskip('numpy')
+
+    manager = random_manager(size)
+    origins = random_origins(manager, 5)
+    calls = list()
+
+    method = getattr(SpawnLocationManager, method_name)
+    monkeypatch.setattr(
+        SpawnLocationManager, method_name, lambda self, origins: calls.append(origins) or method(self, origins)
+    )
+
+    assert manager.get_unsafe_indexes(origins) == brute_force_unsafe_indexes(manager, origins)
+    assert calls == [origins]
+
+
+# =============================================================================
+# >> BINARY CACHE
+# =============================================================================
+@pytest.fixture
+def spawn_files(tmp_path):
+    """Return a spawn locations data file and the path of its binary cache."""
+    json_file = Path(tmp_path).joinpath('de_test.json')
+    write_json(json_file, [(1.0, 2.0, 3.0, 0.0, 90.0, 0.0), (4.0, 5.0, 6.0, 10.0, 180.0, 0.0)])
+
+    return json_file, Path(tmp_path).joinpath('de_test.bin')
+
+
+def test_compile_and_read_cache(spawn_files):
+    json_file, cache_file = spawn_files
+
+    records = SpawnLocationManager.compile(json_file, cache_file)
+
+    assert records == [(1.0, 2.0, 3.0, 0.0, 90.0, 0.0), (4.0, 5.0, 6.0, 10.0, 180.0, 0.0)]
+    assert SpawnLocationManager.read_cache(json_file, cache_file) == records
+
+
+def test_missing_cache(spawn_files):
+    json_file, cache_file = spawn_files
+
+    assert SpawnLocationManager.read_cache(json_file, cache_file) is None
+
+
+def test_zero_length_cache(spawn_files):
+    json_file, cache_file = spawn_files
+    cache_file.write_bytes(b'')
+
+    assert SpawnLocationManager.read_cache(json_file, cache_file) is None
+
+
+def test_truncated_cache(spawn_files):
+    json_file, cache_file = spawn_files
+    SpawnLocationManager.compile(json_file, cache_file)
+
+    cache_file.write_bytes(cache_file.read_bytes()[:-4])
+
+    assert SpawnLocationManager.read_cache(json_file, cache_file) is None
+
+
+def test_cache_header_only(spawn_files):
+    json_file, cache_file = spawn_files
+    SpawnLocationManager.compile(json_file, cache_file)
+
+    cache_file.write_bytes(cache_file.read_bytes()[:_CACHE_HEADER.size])
+
+    assert SpawnLocationManager.read_cache(json_file, cache_file) is None
+
+
+def test_stale_cache(spawn_files):
+    json_file, cache_file = spawn_files
+    SpawnLocationManager.compile(json_file, cache_file)
+
+    # Change the data file's modification time
+    os.utime(json_file, (json_file.mtime + 10, json_file.mtime + 10))
+
+    assert SpawnLocationManager.read_cache(json_file, cache_file) is None
+
+
+def test_load_compiles_the_cache_once(spawn_files, monkeypatch):
+    json_file, cache_file = spawn_files
+    monkeypatch.setattr(SpawnLocationManager, 'path', json_file.parent)
+    monkeypatch.setattr(udm.spawn_locations.global_vars, 'map_name', 'de_test')
+
+    manager = SpawnLocationManager()
+    manager.load()
+
+    assert cache_file.exists()
+    assert [(spawn_location.x, spawn_location.angle.y) for spawn_location in manager] == [(1.0, 90.0), (4.0, 180.0)]
+
+    # Load again, which must not parse the data file
+    def compile_again(json_file, cache_file):
+        raise AssertionError('The data file has been parsed again.')
+
+    monkeypatch.setattr(SpawnLocationManager, 'compile', staticmethod(compile_again))
+
+    manager.clear()
+    manager.load()
+
+    assert len(manager) == 2
@@ -0,0 +1,70 @@
+# ../tests/test_statistics.py
+
+"""Tests for udm.statistics."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Script Imports
+#   Statistics
+from udm.statistics import Histogram
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_histogram_counts_values_in_their_buckets():
+    histogram = Histogram((1, 10, 100))
+
+    for value in (0, 1, 2, 10, 11, 100, 1_000):
+        histogram.add(value)
+
+    assert list(histogram.buckets) == [(1, 2), (10, 2), (100, 2), (None, 1)]
+    assert histogram.count == 7
+    assert histogram.total == 1_124
+    assert histogram.maximum == 1_000
+
+
+def test_histogram_percentile_returns_the_bucket_bound():
+    histogram = Histogram((1, 10, 100))
+
+    for value in [1] * 90 + [5] * 9 + [50]:
+        histogram.add(value)
+
+    assert histogram.percentile(0.5) == 1
+    assert histogram.percentile(0.95) == 10
+    assert histogram.percentile(1.0) == 100
+
+
+def test_histogram_percentile_of_the_overflow_bucket_is_the_maximum():
+    histogram = Histogram((1, 10))
+    histogram.add(500)
+
+    assert histogram.percentile(0.99) == 500
+
+
+def test_empty_histogram():
+    histogram = Histogram((1, 10))
+
+    assert histogram.percentile(0.99) == 0
+    assert histogram.mean == 0
+    assert list(histogram.buckets) == []
+
+
+def test_histogram_reset():
+    histogram = Histogram((1, 10))
+
+    histogram.add(5)
+    histogram.reset()
+
+    assert (histogram.count, histogram.total, histogram.maximum) == (0, 0, 0)
+    assert list(histogram.buckets) == []
+
+
+def test_histogram_mean():
+    histogram = Histogram((1, 10))
+
+    for value in (2, 4, 9):
+        histogram.add(value)
+
+    assert histogram.mean == 5
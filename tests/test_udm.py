@@ -0,0 +1,176 @@
+# ../tests/test_udm.py
+
+"""Tests for the game flow handled by udm.udm, driven through the stand-in engine."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package Imports
+#   Pytest
+import pytest
+
+# Test Imports
+#   Benchmarks
+from benchmarks import game_thread_io
+
+# Stand-In Imports
+#   Players
+from players.constants import PlayerButtons
+from players.entity import Player
+#   World
+from _world import world
+
+# Script Imports
+#   Config
+from udm.config import settings
+#   Delays
+from udm.delays import delay_manager
+#   Loadouts
+from udm.loadouts import LoadoutPlan
+#   Players
+from udm.players import PlayerEntity
+#   Respawns
+from udm.respawns import respawn_queue
+#   Spawn Locations
+from udm.spawn_locations import spawn_location_manager
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+def run_seconds(engine, seconds):
+    """Run the ticks of `seconds` simulated seconds."""
+    for _ in range(round(seconds / engine.global_vars.interval_per_tick)):
+        engine.tick()
+
+
+@pytest.fixture
+def players(engine):
+    """Connect and spawn four players on both teams and return their indexes."""
+    indexes = [engine.connect_player(team=2 + number % 2) for number in range(4)]
+
+    for index in indexes:
+        engine.spawn_player(index)
+
+    engine.tick()
+    return indexes
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_spawned_players_are_placed_apart_and_protected(engine, players):
+    origins = [tuple(Player(index).origin) for index in players]
+    spawn_origins = [tuple(spawn_location) for spawn_location in spawn_location_manager]
+
+    assert len(set(origins)) == len(players)
+    assert all(origin in spawn_origins for origin in origins)
+    assert all(Player(index).godmode for index in players)
+
+    run_seconds(engine, settings.snapshot.spawn_protection_delay + 0.1)
+
+    assert not any(Player(index).godmode for index in players)
+
+
+def test_spawned_players_are_equipped(engine, players):
+    weapons = [weapon.weapon_name for weapon in Player(players[0]).weapons(not_filters='melee')]
+
+    assert 'weapon_hegrenade' in weapons
+    assert len(weapons) == 3
+
+
+def test_spawning_does_no_io_on_the_game_thread(engine):
+    indexes = [engine.connect_player(team=2 + number % 2) for number in range(8)]
+
+    with game_thread_io:
+        for index in indexes:
+            engine.spawn_player(index)
+
+        engine.tick()
+
+    assert game_thread_io.count == 0, game_thread_io.events
+
+
+def test_killed_players_respawn_after_the_respawn_delay(engine, players):
+    engine.kill_player(players[0], players[1])
+
+    run_seconds(engine, settings.snapshot.respawn_delay - 0.1)
+    assert world.entities[players[0]].dead
+
+    run_seconds(engine, 0.2)
+    assert not world.entities[players[0]].dead
+
+
+def test_headshots_with_weapons_without_data_are_not_rewarded(engine, players):
+    Player(players[1]).client_command('use weapon_knife')
+    engine.kill_player(players[0], players[1], headshot=True)
+
+    assert Player(players[1]).active_weapon.weapon_name == 'weapon_knife'
+
+
+def test_disconnecting_cancels_the_respawn(engine, players, monkeypatch):
+    index = players[0]
+    userid = world.entities[index].userid
+
+    spawned = list()
+    monkeypatch.setattr(Player, 'spawn', lambda self, force=False: spawned.append(self.index))
+
+    engine.kill_player(index, players[1])
+
+    assert ('respawn', userid) in delay_manager
+
+    engine.disconnect_player(index)
+
+    assert PlayerEntity.states[index] is None
+    assert ('respawn', userid) not in delay_manager
+
+    # Run past the respawn delay and the tick respawning the queued players
+    run_seconds(engine, settings.snapshot.respawn_delay + 0.1)
+
+    assert userid not in respawn_queue
+    assert ('respawn', userid) not in delay_manager
+    assert not spawned
+
+
+def test_silencer_option_is_stored_once_the_toggle_is_done(engine, players):
+    index = players[0]
+
+    assert engine.client_command(index, 'buy m4a1_silencer') is False
+
+    inventory = PlayerEntity(index).inventory
+    weapon = Player(index).get_weapon(is_filters='primary')
+    Player(index).client_command(f'use {weapon.classname}')
+
+    assert inventory['primary'].silencer_option
+    assert weapon.get_property_bool('m_bSilencerOn')
+
+    # Detach the silencer
+    engine.run_command(index, PlayerButtons.ATTACK2)
+    engine.run_command(index, 0)
+
+    assert not weapon.get_property_bool('m_bSilencerOn')
+    assert inventory['primary'].silencer_option
+
+    run_seconds(engine, 0.6)
+    engine.run_command(index, 0)
+
+    assert not inventory['primary'].silencer_option
+
+
+def test_loadout_plans_change_weapons_only_when_applied(engine, players):
+    index = players[0]
+    player = PlayerEntity(index)
+
+    engine.client_command(index, 'buy m4a1_silencer')
+    weapon = player.get_weapon(is_filters='primary')
+    weapon.set_property_bool('m_bSilencerOn', False)
+
+    plan = LoadoutPlan(player, player.inventory)
+
+    assert not weapon.get_property_bool('m_bSilencerOn')
+    assert plan.silencer_fixes and not plan.removals
+
+    plan.apply(player)
+
+    assert weapon.get_property_bool('m_bSilencerOn')
+    assert player.get_weapon(is_filters='primary').index == weapon.index